@@ -107,6 +107,7 @@ def define(filename_mesh=None,
         "tss": ('ts.tvd_runge_kutta_3',
                 {"t0"     : t0,
                  "t1"     : t1,
+                 'mass_inverse': True,
                  'limiters': {"f": MomentLimiter1D} if limit else {}
                  }),
         'nls': ('nls.newton', {}),
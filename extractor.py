@@ -15,6 +15,7 @@ $ ./extractor.py -e "p e 0 1999" bone.h5
 $ ./extractor.py -e "p e 0 1999" bone.h5 -a
 $ ./extractor.py -e "p e 0 1999" bone.h5 -o extracted.h5
 $ ./extractor.py -e "p e 0 1999" bone.h5 -o extracted.h5 -a
+$ ./extractor.py --to-series bone_series.h5 bone.h5
 """
 from __future__ import print_function
 from __future__ import absolute_import
@@ -76,7 +77,10 @@ helps = {
     " Example: 'u n 10 15, p e 0' means variable 'u' in nodes 10, 15"
     " and variable 'p' in element 0",
     'average' :
-    'average vertex variable into cells ("e" extraction mode)'
+    'average vertex variable into cells ("e" extraction mode)',
+    'to_series' :
+    'convert the results file into the time series layout allowing fast'
+    ' time history extraction, and store it in the given file',
 }
 
 def main():
@@ -113,6 +117,9 @@ def main():
                         default=None, help=helps['extract'])
     parser.add_argument('-a', '--average', action='store_true',
                         dest='average', default=False, help=helps['average'])
+    parser.add_argument('--to-series', metavar='filename',
+                        action='store', dest='to_series',
+                        default=None, help=helps['to_series'])
     parser.add_argument('input_file', nargs='?', default=None)
     parser.add_argument('results_file')
     options = parser.parse_args()
@@ -168,6 +175,9 @@ def main():
 
         th.dump_to_vtk(filename_results, output_filename_trunk=trunk, **args)
 
+    if options.to_series:
+        th.convert_to_series(filename_results, options.to_series)
+
     if options.extract:
         ths, ts = th.extract_time_history(filename_results, options.extract)
 
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""
+Generate the class index of the lazily loaded term or solver table.
+
+Usage::
+
+  python3 script/gen_lazy_index.py terms > sfepy/terms/_term_index.py
+  python3 script/gen_lazy_index.py solvers > sfepy/solvers/_solver_index.py
+"""
+from __future__ import absolute_import, print_function
+import sys
+sys.path.append('.')
+
+from argparse import ArgumentParser, RawDescriptionHelpFormatter
+
+def main():
+    parser = ArgumentParser(description=__doc__,
+                            formatter_class=RawDescriptionHelpFormatter)
+    parser.add_argument('kind', choices=['terms', 'solvers'],
+                        help='the table kind')
+    options = parser.parse_args()
+
+    if options.kind == 'terms':
+        from sfepy.discrete import Problem # Avoid circular imports.
+        from sfepy.terms import term_table as table
+        name = 'term_index'
+
+    else:
+        from sfepy.solvers import solver_table as table
+        name = 'solver_index'
+
+    index = table.create_index()
+
+    print('"""')
+    print('Generated by script/gen_lazy_index.py, do not edit.')
+    print('"""')
+    print('%s = {' % name)
+    for key in sorted(index.keys()):
+        print('    %r : %r,' % (key, index[key]))
+    print('}')
+
+if __name__ == '__main__':
+    main()
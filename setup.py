@@ -74,6 +74,7 @@ def configuration(parent_package='', top_path=None):
         'extract_surface.py',
         'gen_gallery.py',
         'gen_iga_patch.py',
+        'gen_lazy_index.py',
         'gen_lobatto1d_c.py',
         'gen_mesh_prev.py',
         'gen_release_notes.py',
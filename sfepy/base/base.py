@@ -754,6 +754,13 @@ class Output(Struct):
     Factory class providing output (print) functions. All SfePy
     printing should be accomplished by this class.
 
+    When a log file is used, it is kept open. By default, each message is
+    flushed to the file immediately. With a positive `flush_interval`, the
+    messages are buffered and the buffer is flushed at most every
+    `flush_interval` seconds, by :func:`Output.flush()`, and when the file is
+    closed by :func:`Output.close()`, by a new :func:`Output.set_output()`
+    call or at the interpreter exit.
+
     Examples
     --------
     >>> from sfepy.base.base import Output
@@ -766,13 +773,15 @@ class Output(Struct):
     """
 
     def __init__(self, prefix, filename=None, quiet=False, combined=False,
-                 append=False, **kwargs):
+                 append=False, flush_interval=0, threaded=False, **kwargs):
         Struct.__init__(self, **kwargs)
 
         self.prefix = prefix
+        self._fd = None
 
         self.set_output(filename=filename, quiet=quiet,
-                        combined=combined, append=append)
+                        combined=combined, append=append,
+                        flush_interval=flush_interval, threaded=threaded)
 
     def __call__(self, *argc, **argv):
         """Call self.output_function.
@@ -792,7 +801,7 @@ class Output(Struct):
             self.output_function(*argc, **argv)
 
     def set_output(self, filename=None, quiet=False, combined=False,
-                   append=False):
+                   append=False, flush_interval=0, threaded=False):
         """
         Set the output mode.
 
@@ -805,6 +814,8 @@ class Output(Struct):
         to the specified file. Moreover, if `combined` is `True`, both
         the ways are used.
 
+        A previously used log file is flushed and closed.
+
         Parameters
         ----------
         filename : str or file object
@@ -816,7 +827,23 @@ class Output(Struct):
         append : bool
             Append to an existing file instead of overwriting it. Use with
             `filename`.
+        flush_interval : float or None
+            The minimum time in seconds between flushes of the log file
+            buffer. If 0, the buffer is flushed after each message. If None,
+            the buffer is flushed only explicitly and when the file is
+            closed. Without `threaded`, the buffered messages are written
+            only when a later message arrives, so they can be lost in a
+            crash. A file object passed as `filename` is always flushed
+            after each message.
+        threaded : bool
+            If True, the messages are written into the log file by a
+            background thread, that also flushes the buffered messages when
+            no new messages arrive within `flush_interval`. This helps when
+            writing or flushing the file is slow, for example on network
+            file systems.
         """
+        self.close()
+
         if not isinstance(filename, basestr):
             # filename is a file descriptor.
             append = True
@@ -838,21 +865,6 @@ class Output(Struct):
             if msg.endswith('...'):
                 self.level += 1
 
-        def print_to_file(filename, msg):
-            if isinstance(filename, basestr):
-                fd = open(filename, 'a')
-
-            else:
-                fd = filename
-
-            print(self._prefix + ('  ' * self.level) + msg, file=fd)
-
-            if isinstance(filename, basestr):
-                fd.close()
-
-            else:
-                fd.flush()
-
         def output_file(*argc, **argv):
             format = '%s' + ' %s' * (len(argc) - 1)
             msg = format % argc
@@ -860,7 +872,7 @@ class Output(Struct):
             if msg.startswith('...'):
                 self.level -= 1
 
-            print_to_file(filename, msg)
+            self._write(self._prefix + ('  ' * self.level) + msg + '\n')
 
             if msg.endswith('...'):
                 self.level += 1
@@ -872,30 +884,17 @@ class Output(Struct):
             if msg.startswith('...'):
                 self.level -= 1
 
-            print(self._prefix + ('  ' * self.level) + msg)
+            line = self._prefix + ('  ' * self.level) + msg
+            print(line)
 
-            print_to_file(filename, msg)
+            self._write(line + '\n')
 
             if msg.endswith('...'):
                 self.level += 1
 
-        def reset_file(filename):
-            if isinstance(filename, basestr):
-                output_dir = os.path.dirname(filename)
-                if output_dir and not os.path.exists(output_dir):
-                    os.makedirs(output_dir)
-
-                fd = open(filename, 'w')
-                fd.close()
-
-            else:
-                raise ValueError('cannot reset a file object!')
-
         if quiet is True:
             if filename is not None:
-                if not append:
-                    reset_file(filename)
-
+                self._open_file(filename, append, flush_interval, threaded)
                 self.output_function = output_file
 
             else:
@@ -906,8 +905,7 @@ class Output(Struct):
                 self.output_function = output_screen
 
             else:
-                if not append:
-                    reset_file(filename)
+                self._open_file(filename, append, flush_interval, threaded)
 
                 if combined:
                     self.output_function = output_combined
@@ -915,6 +913,149 @@ class Output(Struct):
                 else:
                     self.output_function = output_file
 
+    def _open_file(self, filename, append, flush_interval, threaded):
+        import time
+
+        if isinstance(filename, basestr):
+            output_dir = os.path.dirname(filename)
+            if output_dir and not os.path.exists(output_dir):
+                os.makedirs(output_dir)
+
+            self._fd = open(filename, 'a' if append else 'w')
+            self._own_fd = True
+
+        else:
+            self._fd = filename
+            self._own_fd = False
+            flush_interval = 0
+
+        self.flush_interval = flush_interval
+        self._time = time.time
+        self._last_flush = self._time()
+        self._is_dirty = False
+        self._queue = None
+        self._thread = None
+        self._error = None
+
+        if threaded:
+            import threading
+            from six.moves.queue import Queue
+
+            self._lock = threading.Lock()
+            self._queue = Queue()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+        _output_files.add(self)
+
+    def _flush_file(self):
+        self._fd.flush()
+        self._last_flush = self._time()
+        self._is_dirty = False
+
+    def _write_line(self, line):
+        self._fd.write(line)
+        self._is_dirty = True
+
+        if ((self.flush_interval is not None)
+            and ((self._time() - self._last_flush) >= self.flush_interval)):
+            self._flush_file()
+
+    def _write(self, line):
+        if self._queue is not None:
+            if self._error is not None:
+                self._raise_error()
+
+            self._queue.put(line)
+
+        else:
+            self._write_line(line)
+
+    def _run(self):
+        from six.moves.queue import Empty
+
+        while 1:
+            timeout = self.flush_interval if self._is_dirty else None
+            try:
+                line = self._queue.get(timeout=timeout)
+
+            except Empty:
+                # Flush the buffered messages when idle.
+                with self._lock:
+                    try:
+                        if self._error is None:
+                            self._flush_file()
+
+                    except Exception as exc:
+                        self._error = exc
+
+                    self._is_dirty = False
+
+                continue
+
+            try:
+                if line is None:
+                    break
+
+                elif self._error is None:
+                    with self._lock:
+                        self._write_line(line)
+
+            except Exception as exc:
+                self._error = exc
+
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        raise error
+
+    def _after_fork(self):
+        # The writer thread does not exist in a forked child process.
+        if self._thread is not None:
+            self._queue = None
+            self._thread = None
+
+    def flush(self):
+        """
+        Write all buffered messages into the log file, if any.
+        """
+        if self._fd is None: return
+
+        if self._queue is not None:
+            self._queue.join()
+            if self._error is not None:
+                self._raise_error()
+
+            with self._lock:
+                self._flush_file()
+
+        else:
+            self._flush_file()
+
+    def close(self):
+        """
+        Flush and close the log file, if any. A file object passed as
+        `filename` is flushed but not closed.
+        """
+        if self._fd is None: return
+
+        try:
+            self.flush()
+
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+
+            if self._own_fd:
+                self._fd.close()
+
+            self._fd = self._queue = self._thread = None
+            _output_files.discard(self)
+
     def get_output_function(self):
         return self.output_function
 
@@ -928,6 +1069,28 @@ class Output(Struct):
         return self._prefix[:-1]
     prefix = property(get_output_prefix, set_output_prefix)
 
+import weakref
+_output_files = weakref.WeakSet()
+
+def _close_output_files():
+    for out in list(_output_files):
+        out.close()
+
+def _flush_output_files():
+    for out in list(_output_files):
+        out.flush()
+
+def _reset_output_files():
+    for out in list(_output_files):
+        out._after_fork()
+
+import atexit
+atexit.register(_close_output_files)
+if hasattr(os, 'register_at_fork'):
+    # Do not write the buffered messages of the parent process in children.
+    os.register_at_fork(before=_flush_output_files,
+                        after_in_child=_reset_output_files)
+
 output = Output('sfepy:')
 
 def configure_output(options):
@@ -1141,6 +1304,134 @@ def load_classes(filenames, classes, package_name=None, ignore_errors=False,
 
     return table
 
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+class LazyClassTable(MutableMapping):
+    """
+    A dictionary of classes, as returned by :func:`load_classes()`, that
+    imports the module defining a class only on the first access to the
+    class.
+
+    The modules are located using a class index - a dictionary of (module
+    name, class name) tuples with class names (values of `name_attr`) as
+    keys, see :func:`LazyClassTable.create_index()`.
+
+    Parameters
+    ----------
+    index : dict
+        The class index.
+    filenames : list
+        The files with classes. All of them are loaded when a key that is not
+        in the index is accessed, for example when the index is outdated.
+        Membership tests (`key in table`) check only the index and the loaded
+        classes and do not load anything.
+    classes : list
+        The base classes of the loaded classes.
+    package_name : str, optional
+        The package name, see :func:`load_classes()`.
+    ignore_errors : bool
+        If True, ignore modules that cannot be imported.
+    name_attr : str
+        The class attribute with the class name.
+    """
+
+    def __init__(self, index, filenames, classes, package_name=None,
+                 ignore_errors=False, name_attr='name'):
+        self.index = dict(index)
+        self.filenames = filenames
+        self.classes = classes
+        self.package_name = package_name
+        self.ignore_errors = ignore_errors
+        self.name_attr = name_attr
+
+        self.table = {}
+        self.all_loaded = False
+
+    def create_index(self):
+        """
+        Create the class index by importing all modules in `filenames`.
+        """
+        table = load_classes(self.filenames, self.classes,
+                             package_name=self.package_name,
+                             ignore_errors=self.ignore_errors,
+                             name_attr=self.name_attr)
+        index = {key : (cls.__module__, cls.__name__)
+                 for key, cls in six.iteritems(table)}
+        return index
+
+    def load_all(self):
+        """
+        Load all classes from `filenames`. The classes added to the table
+        directly are preserved.
+        """
+        if self.all_loaded: return
+
+        table = load_classes(self.filenames, self.classes,
+                             package_name=self.package_name,
+                             ignore_errors=self.ignore_errors,
+                             name_attr=self.name_attr)
+        table.update(self.table)
+        self.table = table
+        self.index = {}
+        self.all_loaded = True
+
+    def _load(self, key):
+        import importlib
+
+        mod_name, cls_name = self.index[key]
+        try:
+            mod = importlib.import_module(mod_name)
+
+        except Exception:
+            if not self.ignore_errors:
+                raise
+
+            output('WARNING: module %s cannot be imported!' % mod_name)
+            output('reason:\n', sys.exc_info()[1])
+            self.index = {name : val for name, val in six.iteritems(self.index)
+                          if val[0] != mod_name}
+            raise KeyError(key)
+
+        cls = getattr(mod, cls_name)
+        self.table[key] = cls
+        return cls
+
+    def __getitem__(self, key):
+        if key in self.table:
+            return self.table[key]
+
+        elif key in self.index:
+            return self._load(key)
+
+        self.load_all()
+        return self.table[key]
+
+    def __contains__(self, key):
+        return (key in self.table) or (key in self.index)
+
+    def __setitem__(self, key, cls):
+        self.table[key] = cls
+
+    def __delitem__(self, key):
+        if (key not in self.table) and (key not in self.index):
+            raise KeyError(key)
+
+        self.table.pop(key, None)
+        self.index.pop(key, None)
+
+    def _get_keys(self):
+        return (list(self.index)
+                + [key for key in self.table if key not in self.index])
+
+    def __iter__(self):
+        return iter(self._get_keys())
+
+    def __len__(self):
+        return len(self._get_keys())
+
 def update_dict_recursively(dst, src, tuples_too=False,
                             overwrite_by_none=True):
     """
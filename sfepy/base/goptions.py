@@ -24,9 +24,33 @@ def validate_bool(val):
     else:
         raise ValueError('Could not convert "%s" to boolean!' % val)
 
+def validate_positive_int(val):
+    """
+    Convert val to a positive integer or raise a ValueError.
+    """
+    ival = int(val)
+    if (not isinstance(val, str) and (float(val) != ival)) or (ival < 1):
+        raise ValueError('Could not convert "%s" to positive integer!' % val)
+
+    return ival
+
+def validate_str_or_none(val):
+    """
+    Check that val is a string or None or raise a ValueError.
+    """
+    if not ((val is None) or isinstance(val, str)):
+        raise ValueError('"%s" is not a string or None!' % (val,))
+
+    return val
+
 default_goptions = {
     'verbose' : [True, validate_bool],
     'check_term_finiteness' : [False, validate_bool],
+    'assemble_by_maps' : [False, validate_bool],
+    'assemble_num_threads' : [1, validate_positive_int],
+    'cache_einsum_paths' : [False, validate_bool],
+    'setup_cache_dir' : [None, validate_str_or_none],
+    'sum_factorization' : [False, validate_bool],
 }
 
 class ValidatedDict(dict):
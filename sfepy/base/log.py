@@ -169,6 +169,7 @@ def write_log(output, log, info):
         offset += len(names)
 
     output('# ended: %s' % time.asctime())
+    output.flush()
 
 def _write_header(output, xlabels, ylabels, yscales, data_names, plot_kwargs):
     _fmt = lambda x: '%s' % x if x is not None else ''
@@ -552,6 +553,7 @@ class Log(Struct):
     def terminate(self):
         if self.output is not None:
             self.output('# ended: %s' % time.asctime())
+            self.output.close()
             self.output = None
 
         if self.is_plot and self.can_plot:
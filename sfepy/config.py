@@ -73,6 +73,15 @@ class Config(object):
 
         return flags.split()
 
+    def openmp_flags(self):
+        if has_attr(site_cfg, 'openmp_flags'):
+            flags = site_cfg.openmp_flags
+
+        else:
+            flags = ''
+
+        return flags.split()
+
     def debug_flags(self):
         if has_attr(site_cfg, 'debug_flags'):
             return site_cfg.debug_flags
@@ -1,4 +1,5 @@
 from __future__ import print_function
+import re
 
 import numpy as nm
 
@@ -7,6 +8,9 @@ from sfepy.base.timing import Timer
 from sfepy.discrete.common.region import (Region, get_dependency_graph,
                                           sort_by_dependency, get_parents)
 from sfepy.discrete.parse_regions import create_bnf, visit_stack, ParseException
+from sfepy.discrete.setup_cache import get_setup_cache, get_mesh_digest
+
+_uses_function = re.compile(r'\bby\b').search
 
 def region_leaf(domain, regions, rdef, functions):
     """
@@ -150,6 +154,65 @@ def region_op(level, op_code, item1, item2):
     else:
         raise ValueError('unknown region operator token! (%s)' % token)
 
+def get_region_leaf_key(op):
+    """
+    Get the key identifying the result of a region selector leaf `op`, or
+    None, if the result cannot be reused, i.e. for selections by functions.
+    """
+    if op['token'] in ('E_VBF', 'E_CBF'):
+        return None
+
+    return op['token'] + '<' + ' '.join(op['orig']) + '>'
+
+def cached_region_visitors(domain, rdef, leaf_visitor, op_visitor, cache):
+    """
+    Wrap the region selector visitors so that the results of the selector
+    sub-expressions are stored in `cache` and each distinct sub-expression is
+    evaluated only once. The wrapped visitors return ``(key, region)`` pairs.
+
+    The region references (``r.<name>``) are not stored, as they are
+    available directly, but the operations with them are. The cache is valid
+    only as long as the referenced regions and the mesh do not change.
+    """
+    def _get(key, name):
+        kind, parse_def, entities = cache[key]
+        region = Region(name, rdef, domain, parse_def, kind=kind)
+        region.entities = list(entities)
+        return region
+
+    def _set(key, region):
+        cache[key] = (region.kind, region.parse_def, list(region.entities))
+
+    def _region_leaf(level, op):
+        key = get_region_leaf_key(op)
+        if key is None:
+            return key, leaf_visitor(level, op)
+
+        if key in cache:
+            return key, _get(key, 'leaf')
+
+        region = leaf_visitor(level, op)
+        if op['token'] != 'KW_Region':
+            _set(key, region)
+
+        return key, region
+
+    def _region_op(level, op_code, item1, item2):
+        (key1, region1), (key2, region2) = item1, item2
+        if (key1 is None) or (key2 is None):
+            return None, op_visitor(level, op_code, region1, region2)
+
+        key = '(' + key1 + ' ' + op_code['token'] + ' ' + key2 + ')'
+        if key in cache:
+            return key, _get(key, 'op')
+
+        region = op_visitor(level, op_code, region1, region2)
+        _set(key, region)
+
+        return key, region
+
+    return _region_leaf, _region_op
+
 class Domain(Struct):
 
     def __init__(self, name, mesh=None, nurbs=None, bmesh=None, regions=None,
@@ -174,6 +237,7 @@ class Domain(Struct):
         self.regions = OneTypeList(Region)
         self._region_stack = []
         self._bnf = create_bnf(self._region_stack)
+        self._region_cache = None
 
     def create_region(self, name, select, kind='cell', parent=None,
                       check_parents=True, extra_options=None, functions=None,
@@ -196,8 +260,16 @@ class Domain(Struct):
             print('parsing failed:', select)
             raise
 
-        region = visit_stack(stack, region_op,
-                             region_leaf(self, self.regions, select, functions))
+        leaf_visitor = region_leaf(self, self.regions, select, functions)
+        if self._region_cache is None:
+            region = visit_stack(stack, region_op, leaf_visitor)
+
+        else:
+            leaf_visitor, op_visitor = cached_region_visitors(
+                self, select, leaf_visitor, region_op, self._region_cache
+            )
+            region = visit_stack(stack, op_visitor, leaf_visitor)[1]
+
         region.name = name
         region.definition = select
         region.set_kind(kind)
@@ -212,10 +284,38 @@ class Domain(Struct):
         return region
 
     def create_regions(self, region_defs, functions=None, allow_empty=False):
+        """
+        Create regions given by `region_defs`.
+
+        All region selectors are evaluated in a single pass, in which the
+        results of sub-expressions shared by several selectors, e.g. the same
+        coordinate conditions, are computed only once, see
+        :func:`cached_region_visitors()`.
+
+        If the setup cache is enabled, see :mod:`sfepy.discrete.setup_cache`,
+        the region entities are taken from or stored to the cache. Regions
+        selected by functions, and regions depending on them, are not cached.
+        """
         output('creating regions...')
         timer = Timer(start=True)
 
         self.reset_regions()
+        self._region_cache = {}
+        try:
+            self._create_regions(region_defs, functions, allow_empty)
+
+        finally:
+            self._region_cache = None
+
+        output('...done in %.2f s' % timer.stop())
+
+        return self.regions
+
+    def _create_regions(self, region_defs, functions, allow_empty):
+        cache = get_setup_cache()
+        if cache is not None:
+            mesh_digest = get_mesh_digest(self)
+            keys = {}
 
         ##
         # Sort region definitions by dependencies.
@@ -227,21 +327,47 @@ class Domain(Struct):
         for name in sorted_regions:
             sort_name = name_to_sort_name[name]
             rdef = region_defs[sort_name]
+            kind = rdef.get('kind', 'cell')
+            parent = rdef.get('parent', None)
+            extra_options = rdef.get('extra_options', None)
+
+            key = data = None
+            if cache is not None:
+                parents = get_parents(rdef.select)
+                if parent is not None:
+                    parents.append(parent)
+                pkeys = [keys.get(pname) for pname in parents]
+                if not (_uses_function(rdef.select) or (None in pkeys)):
+                    key = cache.get_key('region', mesh_digest, rdef.select,
+                                        kind, allow_empty, pkeys)
+                    data = cache.get('region', key)
+
+                keys[name] = key
+
+            if data is not None:
+                region = Region(name, rdef.select, self, data['parse_def'],
+                                kind=kind, parent=parent)
+                region.entities = data['entities']
+                region.is_empty = data['is_empty']
+                region.extra_options = extra_options
+                region.update_shape()
+                self.regions.append(region)
+                output(' ', region.name, '(cached)')
+                continue
 
             region = self.create_region(name, rdef.select,
-                                        kind=rdef.get('kind', 'cell'),
-                                        parent=rdef.get('parent', None),
+                                        kind=kind,
+                                        parent=parent,
                                         check_parents=False,
-                                        extra_options=rdef.get('extra_options',
-                                                               None),
+                                        extra_options=extra_options,
                                         functions=functions,
                                         allow_empty=allow_empty)
+            if key is not None:
+                cache.set('region', key, {'parse_def' : region.parse_def,
+                                          'entities' : region.entities,
+                                          'is_empty' : region.is_empty})
             output(' ', region.name)
 
-        output('...done in %.2f s' % timer.stop())
-
-        return self.regions
-
     def save_regions(self, filename, region_names=None):
         """
         Save regions as individual meshes.
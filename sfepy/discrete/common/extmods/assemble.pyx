@@ -3,6 +3,7 @@
 Low level finite element assembling functions.
 """
 cimport cython
+from cython.parallel cimport prange
 
 import numpy as np
 cimport numpy as np
@@ -186,3 +187,403 @@ def assemble_matrix_complex(np.ndarray[complex128, mode='c', ndim=1]
                 else:
                     msg = 'matrix item (%d, %d) does not exist!' % (irg, icg)
                     raise IndexError(msg)
+
+@cython.boundscheck(False)
+def create_assembling_map(np.ndarray[int32, mode='c', ndim=1] prows not None,
+                          np.ndarray[int32, mode='c', ndim=1] cols not None,
+                          np.ndarray[int32, mode='c', ndim=1] iels not None,
+                          np.ndarray[int32, mode='c', ndim=2]
+                          row_conn not None,
+                          np.ndarray[int32, mode='c', ndim=2]
+                          col_conn not None):
+    """
+    Create the map of local cell matrix entries to positions in the data
+    array of a CSR matrix given by `prows` and `cols`.
+
+    The returned array has shape `(n_cell, n_epr, n_epc)`, where `n_cell` is
+    the length of `iels`. Entries corresponding to negative (inactive) DOFs
+    are set to -1. The map can be used with :func:`assemble_matrix_by_map()`
+    as long as the matrix graph and the connectivities do not change.
+    """
+    cdef int32 ii, iel, ir, ic, irg, icg, ik
+    cdef int32 num = iels.shape[0]
+    cdef int32 n_epr = row_conn.shape[1]
+    cdef int32 n_epc = col_conn.shape[1]
+    cdef (int32 *) prow_conn0, pcol_conn0, prow_conn, pcol_conn
+    cdef int32 *piels
+    cdef int32 *_prows = &prows[0]
+    cdef int32 *_cols = &cols[0]
+    cdef int32 *pmap
+
+    cdef np.ndarray[int32, mode='c', ndim=3] imap \
+         = np.empty((num, n_epr, n_epc), dtype=np.int32)
+    if num == 0:
+        return imap
+
+    piels = &iels[0]
+    pmap = &imap[0, 0, 0]
+    prow_conn0 = &row_conn[0, 0]
+    pcol_conn0 = &col_conn[0, 0]
+
+    for ii in range(0, num):
+        iel = piels[ii]
+
+        prow_conn = prow_conn0 + iel * n_epr
+        pcol_conn = pcol_conn0 + iel * n_epc
+
+        for ir in range(0, n_epr):
+            irg = prow_conn[ir]
+            if irg < 0:
+                for ic in range(0, n_epc):
+                    pmap[ic] = -1
+                pmap += n_epc
+                continue
+
+            for ic in range(0, n_epc):
+                icg = pcol_conn[ic]
+                if icg < 0:
+                    pmap[ic] = -1
+                    continue
+
+                for ik in range(_prows[irg], _prows[irg + 1]):
+                    if _cols[ik] == icg:
+                        pmap[ic] = ik
+                        break
+
+                else:
+                    msg = 'matrix item (%d, %d) does not exist!' % (irg, icg)
+                    raise IndexError(msg)
+
+            pmap += n_epc
+
+    return imap
+
+@cython.boundscheck(False)
+def assemble_matrix_by_map(np.ndarray[float64, mode='c', ndim=1]
+                           mtx not None,
+                           np.ndarray[float64, mode='c', ndim=4]
+                           mtx_in_els not None,
+                           np.ndarray[int32, mode='c', ndim=3] imap not None,
+                           float64 sign):
+    """
+    Assemble cell matrices into the CSR matrix data array `mtx` using the
+    assembling map `imap` created by :func:`create_assembling_map()`.
+    """
+    cdef Py_ssize_t ii
+    cdef int32 ik
+    cdef int32 num = imap.shape[0]
+    cdef int32 cell_size = imap.shape[1] * imap.shape[2]
+    cdef float64 *val = &mtx[0]
+    cdef float64 *mtx_in_el
+    cdef int32 *pmap
+
+    assert num == mtx_in_els.shape[0]
+    assert cell_size == mtx_in_els.shape[2] * mtx_in_els.shape[3]
+    if num == 0:
+        return
+
+    mtx_in_el = &mtx_in_els[0, 0, 0, 0]
+    pmap = &imap[0, 0, 0]
+
+    for ii in range(0, <Py_ssize_t> num * cell_size):
+        ik = pmap[ii]
+        if ik < 0: continue
+
+        val[ik] += sign * mtx_in_el[ii]
+
+@cython.boundscheck(False)
+def assemble_matrix_complex_by_map(np.ndarray[complex128, mode='c', ndim=1]
+                                   mtx not None,
+                                   np.ndarray[complex128, mode='c', ndim=4]
+                                   mtx_in_els not None,
+                                   np.ndarray[int32, mode='c', ndim=3]
+                                   imap not None,
+                                   complex128 sign):
+    """
+    Complex version of :func:`assemble_matrix_by_map()`.
+    """
+    cdef Py_ssize_t ii
+    cdef int32 ik
+    cdef int32 num = imap.shape[0]
+    cdef int32 cell_size = imap.shape[1] * imap.shape[2]
+    cdef complex128 *val = &mtx[0]
+    cdef complex128 *mtx_in_el
+    cdef int32 *pmap
+
+    assert num == mtx_in_els.shape[0]
+    assert cell_size == mtx_in_els.shape[2] * mtx_in_els.shape[3]
+    if num == 0:
+        return
+
+    mtx_in_el = &mtx_in_els[0, 0, 0, 0]
+    pmap = &imap[0, 0, 0]
+
+    for ii in range(0, <Py_ssize_t> num * cell_size):
+        ik = pmap[ii]
+        if ik < 0: continue
+
+        val[ik] += sign * mtx_in_el[ii]
+
+@cython.boundscheck(False)
+def create_cell_coloring(np.ndarray[int32, mode='c', ndim=1] iels not None,
+                         np.ndarray[int32, mode='c', ndim=2] conn not None,
+                         int32 n_dof):
+    """
+    Color the assembling cells so that no two cells of the same color share
+    a (non-negative) DOF of the connectivity `conn`.
+
+    The cells of a single color can be assembled in parallel without write
+    conflicts. The assembling order is given by the colors only, so the
+    results do not depend on the number of threads.
+
+    Returns
+    -------
+    color_ptr : array
+        The offsets of the colors in `cells`, length `n_color + 1`.
+    cells : array
+        The positions in `iels` (i.e. in the cell values array) ordered by
+        colors.
+    """
+    cdef int32 ii, ir, irg, ic, n_colored, is_free
+    cdef int32 num = iels.shape[0]
+    cdef int32 n_ep = conn.shape[1]
+    cdef int32 *pconn0 = NULL
+    cdef int32 *pconn
+    cdef int32 *piels = NULL
+    cdef np.ndarray[int32, mode='c', ndim=1] colors \
+         = np.empty(num, dtype=np.int32)
+    cdef np.ndarray[int32, mode='c', ndim=1] marks \
+         = np.empty(n_dof, dtype=np.int32)
+
+    colors.fill(-1)
+    marks.fill(-1)
+
+    if num > 0:
+        pconn0 = &conn[0, 0]
+        piels = &iels[0]
+
+    ic = 0
+    n_colored = 0
+    while n_colored < num:
+        for ii in range(0, num):
+            if colors[ii] >= 0: continue
+
+            pconn = pconn0 + piels[ii] * n_ep
+
+            is_free = 1
+            for ir in range(0, n_ep):
+                irg = pconn[ir]
+                if (irg >= 0) and (marks[irg] == ic):
+                    is_free = 0
+                    break
+
+            if not is_free: continue
+
+            for ir in range(0, n_ep):
+                irg = pconn[ir]
+                if irg >= 0:
+                    marks[irg] = ic
+
+            colors[ii] = ic
+            n_colored += 1
+
+        ic += 1
+
+    cells = np.argsort(colors, kind='stable').astype(np.int32)
+    color_ptr = np.zeros(ic + 1, dtype=np.int32)
+    color_ptr[1:] = np.cumsum(np.bincount(colors, minlength=ic))
+
+    return color_ptr, cells
+
+@cython.boundscheck(False)
+def assemble_vector_colored(np.ndarray[float64, mode='c', ndim=1]
+                            vec not None,
+                            np.ndarray[float64, mode='c', ndim=4]
+                            vec_in_els not None,
+                            np.ndarray[int32, mode='c', ndim=1] iels not None,
+                            float64 sign,
+                            np.ndarray[int32, mode='c', ndim=2]
+                            conn not None,
+                            np.ndarray[int32, mode='c', ndim=1]
+                            color_ptr not None,
+                            np.ndarray[int32, mode='c', ndim=1]
+                            cells not None,
+                            int num_threads=1):
+    """
+    Parallel version of :func:`assemble_vector()` using the cell coloring
+    from :func:`create_cell_coloring()`.
+    """
+    cdef int32 ic, ik, ii, ir, irg
+    cdef int32 num = iels.shape[0]
+    cdef int32 n_color = color_ptr.shape[0] - 1
+    cdef int32 n_ep = conn.shape[1]
+    cdef int32 cell_size = vec_in_els.shape[2] * vec_in_els.shape[3]
+    cdef int32 *pconn0
+    cdef int32 *pconn
+    cdef int32 *piels
+    cdef int32 *pcolor_ptr = &color_ptr[0]
+    cdef int32 *pcells
+    cdef float64 *val = &vec[0]
+    cdef float64 *vec_in_el0
+    cdef float64 *vec_in_el
+
+    assert num == vec_in_els.shape[0]
+    assert num == cells.shape[0]
+    if num == 0:
+        return
+
+    pconn0 = &conn[0, 0]
+    piels = &iels[0]
+    pcells = &cells[0]
+    vec_in_el0 = &vec_in_els[0, 0, 0, 0]
+
+    for ic in range(0, n_color):
+        for ik in prange(pcolor_ptr[ic], pcolor_ptr[ic + 1], nogil=True,
+                         schedule='static', num_threads=num_threads):
+            ii = pcells[ik]
+            pconn = pconn0 + piels[ii] * n_ep
+            vec_in_el = vec_in_el0 + <Py_ssize_t> ii * cell_size
+
+            for ir in range(0, n_ep):
+                irg = pconn[ir]
+                if irg < 0: continue
+
+                val[irg] = val[irg] + sign * vec_in_el[ir]
+
+@cython.boundscheck(False)
+def assemble_matrix_colored(np.ndarray[float64, mode='c', ndim=1]
+                            mtx not None,
+                            np.ndarray[int32, mode='c', ndim=1]
+                            prows not None,
+                            np.ndarray[int32, mode='c', ndim=1] cols not None,
+                            np.ndarray[float64, mode='c', ndim=4]
+                            mtx_in_els not None,
+                            np.ndarray[int32, mode='c', ndim=1] iels not None,
+                            float64 sign,
+                            np.ndarray[int32, mode='c', ndim=2]
+                            row_conn not None,
+                            np.ndarray[int32, mode='c', ndim=2]
+                            col_conn not None,
+                            np.ndarray[int32, mode='c', ndim=1]
+                            color_ptr not None,
+                            np.ndarray[int32, mode='c', ndim=1]
+                            cells not None,
+                            int num_threads=1):
+    """
+    Parallel version of :func:`assemble_matrix()` using the cell coloring
+    of `row_conn` from :func:`create_cell_coloring()`.
+    """
+    cdef int32 ic, ik, ii, ir, jc, irg, icg, ij, iloc, found
+    cdef int32 n_missing = 0
+    cdef int32 num = iels.shape[0]
+    cdef int32 n_color = color_ptr.shape[0] - 1
+    cdef int32 n_epr = row_conn.shape[1]
+    cdef int32 n_epc = col_conn.shape[1]
+    cdef int32 cell_size = mtx_in_els.shape[2] * mtx_in_els.shape[3]
+    cdef int32 *prow_conn0
+    cdef int32 *pcol_conn0
+    cdef int32 *prow_conn
+    cdef int32 *pcol_conn
+    cdef int32 *piels
+    cdef int32 *pcolor_ptr = &color_ptr[0]
+    cdef int32 *pcells
+    cdef int32 *_prows = &prows[0]
+    cdef int32 *_cols = &cols[0]
+    cdef float64 *val = &mtx[0]
+    cdef float64 *mtx_in_el0
+    cdef float64 *mtx_in_el
+
+    assert num == mtx_in_els.shape[0]
+    assert num == cells.shape[0]
+    if num == 0:
+        return
+
+    prow_conn0 = &row_conn[0, 0]
+    pcol_conn0 = &col_conn[0, 0]
+    piels = &iels[0]
+    pcells = &cells[0]
+    mtx_in_el0 = &mtx_in_els[0, 0, 0, 0]
+
+    for ic in range(0, n_color):
+        for ik in prange(pcolor_ptr[ic], pcolor_ptr[ic + 1], nogil=True,
+                         schedule='static', num_threads=num_threads):
+            ii = pcells[ik]
+            prow_conn = prow_conn0 + piels[ii] * n_epr
+            pcol_conn = pcol_conn0 + piels[ii] * n_epc
+            mtx_in_el = mtx_in_el0 + <Py_ssize_t> ii * cell_size
+
+            for ir in range(0, n_epr):
+                irg = prow_conn[ir]
+                if irg < 0: continue
+
+                for jc in range(0, n_epc):
+                    icg = pcol_conn[jc]
+                    if icg < 0: continue
+
+                    iloc = n_epc * ir + jc
+
+                    found = 0
+                    for ij in range(_prows[irg], _prows[irg + 1]):
+                        if _cols[ij] == icg:
+                            val[ij] = val[ij] + sign * mtx_in_el[iloc]
+                            found = 1
+                            break
+
+                    if not found:
+                        n_missing += 1
+
+    if n_missing:
+        msg = '%d matrix items do not exist!' % n_missing
+        raise IndexError(msg)
+
+@cython.boundscheck(False)
+def assemble_matrix_by_map_colored(np.ndarray[float64, mode='c', ndim=1]
+                                   mtx not None,
+                                   np.ndarray[float64, mode='c', ndim=4]
+                                   mtx_in_els not None,
+                                   np.ndarray[int32, mode='c', ndim=3]
+                                   imap not None,
+                                   float64 sign,
+                                   np.ndarray[int32, mode='c', ndim=1]
+                                   color_ptr not None,
+                                   np.ndarray[int32, mode='c', ndim=1]
+                                   cells not None,
+                                   int num_threads=1):
+    """
+    Parallel version of :func:`assemble_matrix_by_map()` using the cell
+    coloring of the row connectivity from :func:`create_cell_coloring()`.
+    """
+    cdef int32 ic, ik, ii, iloc, ij
+    cdef int32 num = imap.shape[0]
+    cdef int32 n_color = color_ptr.shape[0] - 1
+    cdef int32 cell_size = imap.shape[1] * imap.shape[2]
+    cdef int32 *pcolor_ptr = &color_ptr[0]
+    cdef int32 *pcells
+    cdef int32 *pmap0
+    cdef int32 *pmap
+    cdef float64 *val = &mtx[0]
+    cdef float64 *mtx_in_el0
+    cdef float64 *mtx_in_el
+
+    assert num == mtx_in_els.shape[0]
+    assert num == cells.shape[0]
+    assert cell_size == mtx_in_els.shape[2] * mtx_in_els.shape[3]
+    if num == 0:
+        return
+
+    pcells = &cells[0]
+    pmap0 = &imap[0, 0, 0]
+    mtx_in_el0 = &mtx_in_els[0, 0, 0, 0]
+
+    for ic in range(0, n_color):
+        for ik in prange(pcolor_ptr[ic], pcolor_ptr[ic + 1], nogil=True,
+                         schedule='static', num_threads=num_threads):
+            ii = pcells[ik]
+            pmap = pmap0 + <Py_ssize_t> ii * cell_size
+            mtx_in_el = mtx_in_el0 + <Py_ssize_t> ii * cell_size
+
+            for iloc in range(0, cell_size):
+                ij = pmap[iloc]
+                if ij < 0: continue
+
+                val[ij] = val[ij] + sign * mtx_in_el[iloc]
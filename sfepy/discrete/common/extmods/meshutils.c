@@ -160,6 +160,7 @@ int32 mesh_nod_in_el_count(int32 *p_niec_max, int32 *niec,
     for (iel = 0; iel < n_el[ig]; iel++) {
       pconn = conn[ig] + n_ep[ig] * iel;
       for (iep = 0; iep < n_ep[ig]; iep++) {
+        if (pconn[iep] < 0) continue;
         niec[1+pconn[iep]]++;
         /* output("%d %d %d\n", iep, niec[1+pconn[iep]], pconn[iep]); */
       }
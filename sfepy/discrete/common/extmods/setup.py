@@ -55,8 +55,10 @@ def configuration(parent_package='', top_path=None):
     src = ['assemble.pyx']
     config.add_extension('assemble',
                          sources=src,
-                         extra_compile_args=site_config.compile_flags(),
-                         extra_link_args=site_config.link_flags(),
+                         extra_compile_args=(site_config.compile_flags()
+                                             + site_config.openmp_flags()),
+                         extra_link_args=(site_config.link_flags()
+                                          + site_config.openmp_flags()),
                          include_dirs=[auto_dir],
                          define_macros=defines)
 
@@ -119,6 +119,83 @@ def get_ref_coors_convex(field, coors, close_limit=0.1, cache=None,
 
     return ref_coors, cells, status
 
+def _expand_ranges(starts, counts):
+    """
+    Return the concatenation of ``arange(starts[i], starts[i] + counts[i])``
+    for all ``i``, without a Python loop.
+    """
+    offsets = nm.cumsum(counts) - counts
+    return (nm.repeat(starts - offsets, counts)
+            + nm.arange(counts.sum(), dtype=nm.int64))
+
+def _get_cell_point_pairs(coors, centroids, radii, max_pairs=10000000):
+    """
+    Find all (cell, point) pairs such that the point lies in the
+    axis-aligned box of the cell given by its centroid and the max-norm
+    radius. The points are sorted into the buckets of a uniform grid, so
+    that only the points in the buckets overlapping a cell box are tested.
+
+    The pairs are returned sorted by cells.
+    """
+    n_point, dim = coors.shape
+    n_cell = centroids.shape[0]
+    if not (n_point and n_cell):
+        return nm.zeros(0, dtype=nm.int64), nm.zeros(0, dtype=nm.int64)
+
+    cmin, cmax = coors.min(axis=0), coors.max(axis=0)
+    extent = cmax - cmin
+
+    # Bucket size ~ the mean cell box size, with the number of buckets
+    # limited by the number of points.
+    size = max(2.0 * radii.mean(), 1e-300)
+    size = max(size, (nm.prod(extent[extent > 0.0])
+                      / (4.0 * n_point)) ** (1.0 / dim))
+    shape = (extent // size).astype(nm.int64) + 1
+    strides = nm.r_[nm.cumprod(shape[::-1])[::-1][1:], 1]
+
+    ib = nm.minimum(((coors - cmin) // size).astype(nm.int64), shape - 1)
+    bids = (ib * strides).sum(axis=1)
+    ips = nm.argsort(bids, kind='stable')
+    bptr = nm.r_[0, nm.cumsum(nm.bincount(bids, minlength=shape.prod()))]
+
+    lo = nm.floor((centroids - radii[:, None] - cmin) / size).astype(nm.int64)
+    hi = nm.floor((centroids + radii[:, None] - cmin) / size).astype(nm.int64)
+    is_in = ((hi >= 0) & (lo < shape)).all(axis=1)
+    lo = nm.clip(lo, 0, shape - 1)
+    hi = nm.clip(hi, 0, shape - 1)
+    nbs = nm.where(is_in[:, None], hi - lo + 1, 0)
+    nbc = nbs.prod(axis=1)
+
+    # Process the cells in chunks to bound the memory.
+    n_per_cell = max(nbc.mean(), 1.0) * max(n_point / shape.prod(), 1.0)
+    chunk_size = max(int(max_pairs / n_per_cell), 1)
+
+    cells, points = [], []
+    for ic0 in range(0, n_cell, chunk_size):
+        ics = nm.arange(ic0, min(ic0 + chunk_size, n_cell))
+        counts = nbc[ics]
+
+        # Buckets overlapping the cell boxes.
+        cb = nm.repeat(ics, counts)
+        ii = _expand_ranges(nm.zeros_like(counts), counts)
+        bid = nm.zeros_like(ii)
+        for idim in range(dim - 1, -1, -1):
+            nb = nbs[cb, idim]
+            bid += (lo[cb, idim] + ii % nb) * strides[idim]
+            ii //= nb
+
+        # Points in the buckets.
+        counts = bptr[bid + 1] - bptr[bid]
+        cp = nm.repeat(cb, counts)
+        pp = ips[_expand_ranges(bptr[bid], counts)]
+
+        dist = nm.abs(coors[pp] - centroids[cp]).max(axis=1)
+        ii = nm.where(dist <= radii[cp])[0]
+        cells.append(cp[ii])
+        points.append(pp[ii])
+
+    return nm.concatenate(cells), nm.concatenate(points)
+
 def get_potential_cells(coors, cmesh, centroids=None, extrapolate=True):
     """
     Get cells that potentially contain points with the given physical
@@ -144,12 +221,11 @@ def get_potential_cells(coors, cmesh, centroids=None, extrapolate=True):
         The offsets into `potential_cells` for each point: a point ``ip`` is
         potentially in cells ``potential_cells[offsets[ip]:offsets[ip+1]]``.
     """
-    from scipy.spatial import cKDTree as KDTree
-
     if centroids is None:
         centroids = cmesh.get_centroids(cmesh.tdim)
 
-    kdtree = KDTree(coors)
+    coors = nm.asarray(coors, dtype=nm.float64)
+    n_point = coors.shape[0]
 
     conn = cmesh.get_cell_conn()
     cc = conn.indices.reshape(cmesh.n_el, -1)
@@ -158,36 +234,31 @@ def get_potential_cells(coors, cmesh, centroids=None, extrapolate=True):
     rays = cell_coors - centroids[:, None]
     radii = nm.linalg.norm(rays, ord=nm.inf, axis=2).max(axis=1)
 
-    potential_cells = [[]] * coors.shape[0]
-    for ic, centroid in enumerate(centroids):
-        ips = kdtree.query_ball_point(centroid, radii[ic], p=nm.inf)
-        if len(ips):
-            for ip in ips:
-                if not len(potential_cells[ip]):
-                    potential_cells[ip] = []
-
-                potential_cells[ip].append(ic)
-
-    lens = nm.array([0] + [len(ii) for ii in potential_cells], dtype=nm.int32)
+    cells, points = _get_cell_point_pairs(coors, centroids, radii)
 
     if extrapolate:
         # Deal with the points outside of the field domain - insert elements
         # incident to the closest mesh vertex.
-        iin = nm.where(lens[1:] == 0)[0]
+        iin = nm.where(nm.bincount(points, minlength=n_point) == 0)[0]
         if len(iin):
+            from scipy.spatial import cKDTree as KDTree
+
             kdtree = KDTree(cmesh.coors)
             ics = kdtree.query(coors[iin])[1]
             cmesh.setup_connectivity(0, cmesh.tdim)
             conn = cmesh.get_conn(0, cmesh.tdim)
 
-            oo = conn.offsets
-            for ii, ip in enumerate(iin):
-                ik = ics[ii]
-                potential_cells[ip] = conn.indices[oo[ik]:oo[ik+1]]
-                lens[ip+1] = len(potential_cells[ip])
-
-    offsets = nm.cumsum(lens, dtype=nm.int32)
-    potential_cells = nm.concatenate(potential_cells).astype(nm.int32)
+            oo = conn.offsets.astype(nm.int64)
+            counts = oo[ics + 1] - oo[ics]
+            cells = nm.r_[cells,
+                          conn.indices[_expand_ranges(oo[ics], counts)]]
+            points = nm.r_[points, nm.repeat(iin, counts)]
+
+    # Stable sort keeps the cell order for each point.
+    ii = nm.argsort(points, kind='stable')
+    potential_cells = cells[ii].astype(nm.int32)
+    lens = nm.bincount(points, minlength=n_point)
+    offsets = nm.r_[0, nm.cumsum(lens)].astype(nm.int32)
 
     return potential_cells, offsets
 
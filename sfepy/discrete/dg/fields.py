@@ -220,6 +220,7 @@ class DGField(FEField):
         # neighbour facet mapping and data caches
         # TODO use lru cache or different method?
         self.clear_facet_neighbour_idx_cache()
+        self.clear_facet_base_vals_cache()
         self.clear_normals_cache()
         self.clear_facet_vols_cache()
         self.boundary_facet_local_idx = {}
@@ -476,8 +477,13 @@ class DGField(FEField):
         """
         if region is None:
             self.facet_neighbour_index = {}
+            self.facet_pairs_cache = {}
         else:
             self.facet_neighbour_index.pop(region.name)
+            self.facet_pairs_cache.pop(region.name, None)
+
+        # The outer facet base values depend on the neighbours.
+        self.clear_facet_base_vals_cache(region)
 
     def get_facet_neighbor_idx(self, region=None, eq_map=None):
         """
@@ -561,6 +567,86 @@ class DGField(FEField):
 
         return facet_neighbours
 
+    def get_facet_pairs(self, region, eq_map):
+        """
+        Returns the interior facet pairs of the region, i.e. the facets with
+        a neighbouring cell. Caches results, use
+        clear_facet_neighbour_idx_cache to clear the cache.
+
+        Parameters
+        ----------
+        region : sfepy.discrete.common.region.Region
+            Main region, must contain cells.
+        eq_map :
+            eq_map from state variable containing information on
+            EPBC and DG EPBC.
+
+        Returns
+        -------
+        pairs : Struct
+            The facet pairs with attributes: `cells`, `facets` - the inner
+            cells and their local facets, `nbr_cells`, `nbr_facets` - the
+            outer (neighbouring) cells and their local facets, `normals` -
+            the outward normals of the inner cell facets, `whs` - the
+            quadrature weights transformed to the facets, `iels` - the
+            inner and outer DOF indices of the facet flux matrix entries,
+            see :func:`DGField.get_facet_dof_indices()`.
+        """
+        if region.name in self.facet_pairs_cache:
+            return self.facet_pairs_cache[region.name]
+
+        nbrhd_idx = self.get_facet_neighbor_idx(region, eq_map)
+        cells, facets = nm.where(nbrhd_idx[:, :, 0] >= 0)
+
+        fc_n = self.get_cell_normals_per_facet(region)
+        _, whs = self.get_facet_base()
+        whs = self.get_facet_vols(region) * whs[None, :, :, 0]
+
+        pairs = Struct(name='facet_pairs_%s' % region.name,
+                       cells=cells, facets=facets,
+                       nbr_cells=nbrhd_idx[cells, facets, 0],
+                       nbr_facets=nbrhd_idx[cells, facets, 1],
+                       normals=fc_n[cells, facets],
+                       whs=whs[cells, facets])
+        pairs.iels = self.get_facet_dof_indices(cells, pairs.nbr_cells)
+
+        self.facet_pairs_cache[region.name] = pairs
+
+        return pairs
+
+    def get_facet_dof_indices(self, cells, nbr_cells):
+        """
+        Get indices of DOFs for all cells and for the given cells and their
+        neighbours.
+
+        Parameters
+        ----------
+        cells : array_like
+            The cell indices.
+        nbr_cells : array_like
+            The neighbouring cell indices.
+
+        Returns
+        -------
+        iels : ndarray
+            Inner and outer DOF indices, i.e. diagonal indices and then
+            their corresponding neighbour indices.
+        """
+        n_el_nod = self.n_el_nod
+        bubble_dofs = self.bubble_dofs
+
+        inner_iels = nm.stack((nm.repeat(bubble_dofs, n_el_nod),
+                               nm.tile(bubble_dofs, n_el_nod).flatten()),
+                              axis=-1)
+
+        outer_iels = nm.stack(
+            (nm.repeat(bubble_dofs[cells], n_el_nod),
+             nm.tile(bubble_dofs[nbr_cells], n_el_nod).flatten()),
+            axis=-1)
+
+        iels = nm.vstack((inner_iels, outer_iels))
+        return iels
+
     def _set_dg_periodic_facet_neighbours(self, facet_neighbours, eq_map):
         """
 
@@ -733,18 +819,14 @@ class DGField(FEField):
 
         per_facet_neighbours = self.get_facet_neighbor_idx(region, state.eq_map)
 
-        outer_facet_vals = nm.zeros(outputs_shape)
-        for facet_n in range(self.n_el_facets):
-            if unreduce_nod:
-                outer_facet_vals[:, facet_n, :] = \
-                    nm.einsum('id...,id...->id...',
-                              dofs[per_facet_neighbours[:, facet_n, 0]],
-                              outer_base_vals[:, :, facet_n])
-            else:
-                outer_facet_vals[:, facet_n, :] = \
-                    nm.einsum('id...,id...->i...',
-                              dofs[per_facet_neighbours[:, facet_n, 0]],
-                              outer_base_vals[:, :, facet_n])
+        # DOFs of the neighbours of all facets: (n_cell, n_el_facets, n_el_nod)
+        outer_dofs = dofs[per_facet_neighbours[:, :, 0], :, 0]
+        if unreduce_nod:
+            outer_facet_vals = nm.einsum('ifd,idf...->ifd...',
+                                         outer_dofs, outer_base_vals)
+        else:
+            outer_facet_vals = nm.einsum('ifd,idf...->if...',
+                                         outer_dofs, outer_base_vals)
 
         boundary_cells = nm.array(nm.where(per_facet_neighbours[:, :, 0] < 0)).T
         outer_facet_vals[boundary_cells[:, 0], boundary_cells[:, 1]] = 0.0
@@ -773,6 +855,9 @@ class DGField(FEField):
         
         Contains quick fix to flip facet QPs for right integration order.
 
+        Caches results, use clear_facet_base_vals_cache to clear the cache.
+        The returned arrays must not be modified.
+
         Parameters
         ----------
         state : used to get EPBC info
@@ -796,6 +881,10 @@ class DGField(FEField):
         else:
             diff = 0
 
+        key = (region.name, diff)
+        if key in self.facet_base_vals_cache:
+            return self.facet_base_vals_cache[key]
+
         facet_bf, whs = self.get_facet_base(derivative=derivative)
         n_qp = nm.shape(whs)[1]
         facet_vols = self.get_facet_vols(region)
@@ -827,7 +916,30 @@ class DGField(FEField):
                     .swapaxes(-2, -3)
 
         # fix to flip facet QPs for right integration order
-        return inner_facet_base_vals, outer_facet_base_vals[..., ::-1], whs
+        out = (inner_facet_base_vals, outer_facet_base_vals[..., ::-1], whs)
+        for val in out:
+            val.flags.writeable = False
+
+        # cache results
+        self.facet_base_vals_cache[key] = out
+
+        return out
+
+    def clear_facet_base_vals_cache(self, region=None):
+        """Clears facet base values cache for given region or all regions.
+
+        Parameters
+        ----------
+        region : sfepy.discrete.common.region.Region
+            If None clear all.
+        """
+        if region is None:
+            self.facet_base_vals_cache = {}
+        else:
+            for key in list(self.facet_base_vals_cache.keys()):
+                if key[0] == region.name:
+                    self.facet_base_vals_cache.pop(key)
+
 
     def clear_normals_cache(self, region=None):
         """Clears normals cache for given region or all regions.
@@ -12,10 +12,34 @@ from sfepy.base.base import OneTypeList, Container, Struct
 from sfepy.base.timing import Timer
 from sfepy.discrete import Materials, Variables, create_adof_conns
 from sfepy.discrete.common.extmods.cmesh import create_mesh_graph
+from sfepy.discrete.setup_cache import get_setup_cache
 from sfepy.terms import Terms, Term
 from sfepy.terms.terms_multilinear import ETermBase
+from sfepy.terms.terms_hyperelastic_base import HyperElasticBase
 import six
 
+def eval_term_group(group, diff_var=None, term_mode=None):
+    """
+    Evaluate a group of terms in the weak mode, see
+    :func:`Equation.get_term_groups()`.
+
+    Returns
+    -------
+    val : array
+        The element contributions of the group terms.
+    iels : array
+        The assembling cells.
+    status : int
+        The evaluation status.
+    """
+    if len(group) == 1:
+        return group[0].evaluate(mode='weak', term_mode=term_mode,
+                                 diff_var=diff_var, standalone=False,
+                                 ret_status=True)
+
+    else:
+        return HyperElasticBase.evaluate_fused(group, diff_var=diff_var)
+
 def parse_definition(equation_def):
     """
     Parse equation definition string to create term description list.
@@ -82,6 +106,7 @@ class Equations(Container):
         self.domain = self.get_domain()
 
         self.active_bcs = set()
+        self._block_adof_conns = None
 
         self.collect_conn_info()
 
@@ -345,7 +370,7 @@ class Equations(Container):
         self.variables.setup_initial_conditions(ics, functions)
 
     def get_graph_conns(self, any_dof_conn=False, rdcs=None, cdcs=None,
-                        active_only=True):
+                        active_only=True, by_blocks=False):
         """
         Get DOF connectivities needed for creating tangent matrix graph.
 
@@ -357,18 +382,30 @@ class Equations(Container):
             any kind of DOF connectivities is allowed.
         rdcs, cdcs : arrays, optional
             Additional row and column DOF connectivities, corresponding
-            to the variables used in the equations.
+            to the variables used in the equations. Not used if `by_blocks`
+            is True.
         active_only : bool
             If True, the active DOF connectivities have reduced size and are
             created with the reduced (active DOFs only) numbering.
+        by_blocks : bool
+            If True, return the DOF connectivities of the individual matrix
+            blocks, numbered locally within the blocks, see
+            :func:`Equations.get_block_adof_conns()`.
 
         Returns
         -------
         rdcs, cdcs : arrays
             The row and column DOF connectivities defining the matrix
-            graph blocks.
+            graph blocks. If `by_blocks` is True, dictionaries of lists of
+            the connectivities are returned instead, with keys ``(row
+            variable name, column variable name)``.
         """
-        if rdcs is None:
+        if by_blocks:
+            rdcs = {}
+            cdcs = {}
+            adcs = self.get_block_adof_conns()
+
+        elif rdcs is None:
             rdcs = []
             cdcs = []
 
@@ -380,7 +417,8 @@ class Equations(Container):
             if rdcs is cdcs: # Make sure the lists are not the same object.
                 rdcs = copy(rdcs)
 
-        adcs = self.variables.adof_conns
+        if not by_blocks:
+            adcs = self.variables.adof_conns
 
         # Only volume dof connectivities are used, with the exception of trace
         # surface dof connectivities.
@@ -411,16 +449,28 @@ class Equations(Container):
                 rdc = adcs[rkey]
                 cdc = adcs[ckey]
                 if not active_only:
+                    # The constrained DOFs have the global numbering also in
+                    # the block DOF connectivities.
+                    roff = coff = 0
+                    if by_blocks:
+                        roff = self.variables.adi.indx[rname].start
+                        coff = self.variables.adi.indx[cvar.name].start
+
                     ii = nm.where(rdc < 0)
                     rdc = rdc.copy()
-                    rdc[ii] = -1 - rdc[ii]
+                    rdc[ii] = -1 - rdc[ii] - roff
 
                     ii = nm.where(cdc < 0)
                     cdc = cdc.copy()
-                    cdc[ii] = -1 - cdc[ii]
+                    cdc[ii] = -1 - cdc[ii] - coff
 
-                rdcs.append(rdc)
-                cdcs.append(cdc)
+                if by_blocks:
+                    rdcs.setdefault((rname, cvar.name), []).append(rdc)
+                    cdcs.setdefault((rname, cvar.name), []).append(cdc)
+
+                else:
+                    rdcs.append(rdc)
+                    cdcs.append(cdc)
 
                 shared.add(dc_key)
 
@@ -433,6 +483,9 @@ class Equations(Container):
         sparse storage needed for the tangent matrix. Order of DOF
         connectivities is not important.
 
+        If the setup cache is enabled, see :mod:`sfepy.discrete.setup_cache`,
+        the graph is taken from or stored to the cache.
+
         Parameters
         ----------
         any_dof_conn : bool
@@ -478,11 +531,78 @@ class Equations(Container):
             output('no matrix (empty dof connectivities)!')
             return None
 
+        return self._create_matrix(shape, rdcs, cdcs, verbose=verbose)
+
+    def create_block_matrix_graphs(self, any_dof_conn=False, active_only=True,
+                                   verbose=True):
+        """
+        Create the matrix graphs of the nonzero blocks of the tangent matrix,
+        i.e. preallocate and initialize the sparse storage of each block
+        separately. A block corresponds to a pair of a test variable (given
+        by its primary variable name) and an unknown variable and uses the
+        block-local DOF numbering.
+
+        If the setup cache is enabled, see :mod:`sfepy.discrete.setup_cache`,
+        the graphs are taken from or stored to the cache.
+
+        Parameters
+        ----------
+        any_dof_conn : bool
+            By default, only volume DOF connectivities are used, with
+            the exception of trace surface DOF connectivities. If True,
+            any kind of DOF connectivities is allowed.
+        active_only : bool
+            If True, the matrix graphs have reduced size and are created with
+            the reduced (active DOFs only) numbering.
+        verbose : bool
+            If False, reduce verbosity.
+
+        Returns
+        -------
+        matrices : dict of csr_matrix
+            The block matrix graphs in the form of CSR matrices with
+            preallocated structure and zero data, with keys ``(row variable
+            name, column variable name)``.
+        """
+        if not self.variables.has_virtuals():
+            output('no matrix (no test variables)!')
+            return None
+
+        rdcs, cdcs = self.get_graph_conns(any_dof_conn=any_dof_conn,
+                                          active_only=active_only,
+                                          by_blocks=True)
+
+        indx = self.variables.adi.indx
+        matrices = {}
+        for key in sorted(rdcs.keys()):
+            rindx, cindx = indx[key[0]], indx[key[1]]
+            shape = (rindx.stop - rindx.start, cindx.stop - cindx.start)
+            output('matrix block %s shape:' % (key,), shape, verbose=verbose)
+
+            matrices[key] = self._create_matrix(shape, rdcs[key], cdcs[key],
+                                                verbose=verbose)
+
+        return matrices
+
+    def _create_matrix(self, shape, rdcs, cdcs, verbose=True):
+        size = nm.prod(shape, dtype=nm.int64)
+
         output('assembling matrix graph...', verbose=verbose)
         timer = Timer(start=True)
 
-        nnz, prow, icol = create_mesh_graph(shape[0], shape[1],
-                                            len(rdcs), rdcs, cdcs)
+        cache = get_setup_cache()
+        graph = key = None
+        if cache is not None:
+            key = cache.get_key('matrix_graph', shape, rdcs, cdcs)
+            graph = cache.get('matrix_graph', key)
+
+        if graph is None:
+            graph = create_mesh_graph(shape[0], shape[1],
+                                      len(rdcs), rdcs, cdcs)
+            if key is not None:
+                cache.set('matrix_graph', key, graph)
+
+        nnz, prow, icol = graph
 
         output('...done in %.2f s' % timer.stop(), verbose=verbose)
         output('matrix structural nonzeros: %d (%.2e%% fill)' \
@@ -493,6 +613,32 @@ class Equations(Container):
 
         return matrix
 
+    def get_block_adof_conns(self):
+        """
+        Get the active DOF connectivities of the variables with the
+        block-local DOF numbering, i.e. without the offsets of the variables
+        in the global state vector. The negative entries are kept.
+
+        The connectivities are created on the first call and cached until the
+        global active DOF connectivities change.
+        """
+        adcs = self.variables.adof_conns
+
+        item = self._block_adof_conns
+        if (item is None) or (item[0] is not adcs):
+            indx = self.variables.adi.indx
+
+            badcs = {}
+            for key, adc in six.iteritems(adcs):
+                offset = indx.get(key[0], slice(0, 0)).start
+                adc = adc.copy()
+                adc[adc >= 0] -= offset
+                badcs[key] = adc
+
+            item = self._block_adof_conns = (adcs, badcs)
+
+        return item[1]
+
     def init_time(self, ts):
         pass
 
@@ -733,6 +879,148 @@ class Equations(Container):
 
         return out
 
+    def eval_tangent_blocks(self, state, matrices):
+        """
+        Evaluate (assemble) the blocks of the tangent matrix into separate
+        matrices, without assembling the whole matrix.
+
+        Parameters
+        ----------
+        state : array
+            The vector of DOF values. Note that it is needed only in
+            nonlinear terms.
+        matrices : dict of csr_matrix
+            The preallocated block matrices with keys ``(row variable name,
+            column variable name)``, as returned by
+            :func:`Equations.create_block_matrix_graphs()`.
+
+        Returns
+        -------
+        out : dict of csr_matrix
+            The assembled block matrices. These are the `matrices`, unless
+            a term returns an extra matrix to be added to a block.
+        """
+        self.set_state(state, force=True)
+
+        for mtx in six.itervalues(matrices):
+            mtx.data[:] = 0.0
+
+        out = matrices.copy()
+
+        variables = self.variables
+        adcs = variables.adof_conns
+        variables.set_adof_conns(self.get_block_adof_conns())
+        try:
+            for eq in self:
+                for group in eq.get_term_groups():
+                    term = group[0]
+                    rname = term.get_virtual_variable().get_primary_name()
+                    svars = term.get_state_variables(unknown_only=True)
+
+                    for svar in svars:
+                        key = (rname, svar.name)
+                        if key not in matrices:
+                            raise ValueError('no matrix block %s for term %s!'
+                                             % (key, term.get_str()))
+
+                        val, iels, status = eval_term_group(group,
+                                                            diff_var=svar.name)
+                        extra = term.assemble_to(matrices[key], val, iels,
+                                                 mode='matrix', diff_var=svar)
+                        if extra is not None:
+                            out[key] = out[key] + extra
+
+        finally:
+            variables.set_adof_conns(adcs)
+
+        return out
+
+    def eval_unknown_residuals(self, state):
+        """
+        Evaluate (assemble) the residual vector contributions of the terms
+        depending on the unknown variables. The other terms, e.g. the
+        right-hand side terms, are skipped.
+
+        Parameters
+        ----------
+        state : array
+            The vector of DOF values.
+
+        Returns
+        -------
+        out : array
+            The assembled reduced residual vector.
+        """
+        self.set_state(state, force=True)
+
+        out = self.create_reduced_vec()
+        for eq in self:
+            for group in eq.get_term_groups():
+                term = group[0]
+                if not len(term.get_state_variables(unknown_only=True)):
+                    continue
+
+                val, iels, status = eval_term_group(group)
+                term.assemble_to(out, val, iels, mode='vector')
+
+        return out
+
+    def eval_tangent_diagonal(self, state):
+        """
+        Evaluate the diagonal of the tangent matrix without assembling the
+        matrix. The element matrices are evaluated term by term and only their
+        entries contributing to the matrix diagonal are assembled.
+
+        Parameters
+        ----------
+        state : array
+            The vector of DOF values. Note that it is needed only in
+            nonlinear terms.
+
+        Returns
+        -------
+        out : array
+            The diagonal of the reduced tangent matrix.
+        """
+        self.set_state(state, force=True)
+
+        out = self.create_reduced_vec()
+        for eq in self:
+            for group in eq.get_term_groups():
+                term = group[0]
+                vvar = term.get_virtual_variable()
+                dc_type = term.get_dof_conn_type()
+
+                svars = term.get_state_variables(unknown_only=True)
+                for svar in svars:
+                    if svar.name != vvar.get_primary_name():
+                        continue
+
+                    val, iels, status = eval_term_group(group,
+                                                        diff_var=svar.name)
+                    sign = term.get_assembling_sign(svar)
+
+                    if isinstance(val, tuple):
+                        vals, rows, cols, rvar, cvar = val
+                        if rvar.eq_map is not None:
+                            rows = rvar.eq_map.eq[rows]
+                            cols = cvar.eq_map.eq[cols]
+
+                        ii = (rows == cols) & (rows >= 0)
+                        nm.add.at(out, rows[ii], sign * vals[ii])
+                        continue
+
+                    rdc = vvar.get_dof_conn(dc_type)[iels]
+                    cdc = svar.get_dof_conn(dc_type, term.arg_traces[svar.name],
+                                            term.arg_trace_regions[svar.name])
+                    cdc = cdc[iels]
+
+                    ic, ir, jc = nm.where((rdc[:, :, None] == cdc[:, None, :])
+                                          & (rdc[:, :, None] >= 0))
+                    nm.add.at(out, rdc[ic, ir], sign * val[ic, 0, ir, jc])
+
+        return out
+
 class Equation(Struct):
 
     @staticmethod
@@ -764,6 +1052,40 @@ class Equation(Struct):
 
         self.terms.setup()
 
+    def get_term_groups(self):
+        """
+        Get the groups of the equation terms that are evaluated together in
+        the weak mode.
+
+        The hyperelastic terms with the same fusion key, see
+        :func:`HyperElasticBase.get_fusion_key()
+        <sfepy.terms.terms_hyperelastic_base.HyperElasticBase.get_fusion_key()>`,
+        form a group. Each other term forms a single term group.
+
+        Returns
+        -------
+        groups : list of lists of Term
+            The term groups, in the order of their first terms.
+        """
+        groups = []
+        keyed = {}
+        for term in self.terms:
+            key = None
+            if isinstance(term, HyperElasticBase):
+                key = term.get_fusion_key()
+
+            if key is None:
+                groups.append([term])
+
+            elif key in keyed:
+                keyed[key].append(term)
+
+            else:
+                keyed[key] = [term]
+                groups.append(keyed[key])
+
+        return groups
+
     def collect_materials(self):
         """
         Collect materials present in the terms of the equation.
@@ -825,11 +1147,10 @@ class Equation(Struct):
 
             if dw_mode == 'vector':
 
-                for term in self.terms:
-                    val, iels, status = term.evaluate(mode=mode,
-                                                      term_mode=term_mode,
-                                                      standalone=False,
-                                                      ret_status=True)
+                for group in self.get_term_groups():
+                    term = group[0]
+                    val, iels, status = eval_term_group(group,
+                                                        term_mode=term_mode)
                     term.assemble_to(asm_obj, val, iels, mode=dw_mode)
 
                 out = asm_obj
@@ -837,15 +1158,14 @@ class Equation(Struct):
             elif dw_mode == 'matrix':
 
                 extras = []
-                for term in self.terms:
+                for group in self.get_term_groups():
+                    term = group[0]
                     svars = term.get_state_variables(unknown_only=True)
 
                     for svar in svars:
-                        val, iels, status = term.evaluate(mode=mode,
-                                                          term_mode=term_mode,
-                                                          diff_var=svar.name,
-                                                          standalone=False,
-                                                          ret_status=True)
+                        val, iels, status = eval_term_group(
+                            group, diff_var=svar.name, term_mode=term_mode
+                        )
                         extra = term.assemble_to(asm_obj, val, iels,
                                                  mode=dw_mode, diff_var=svar)
                         if extra is not None: extras.append(extra)
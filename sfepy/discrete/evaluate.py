@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from copy import copy
 
 import numpy as nm
+from scipy.sparse.linalg import LinearOperator
 
 from sfepy.base.base import output, get_default, OneTypeList, Struct, basestr
 from sfepy.discrete import Equations, Variables, Region, Integral, Integrals
@@ -31,6 +32,102 @@ def apply_ebc_to_matrix(mtx, ebc_rows, epbc_rows=None):
         mtx[master, master] = 1.0
         mtx[master, slave] = -1.0
 
+class MatrixFreeOperator(LinearOperator):
+    r"""
+    The tangent matrix of the problem equations as a linear operator, whose
+    action on a vector is computed without assembling the matrix, by
+    evaluating the residual contributions of the terms depending on the
+    unknown variables cell by cell. The cached field mappings are reused in
+    the evaluations.
+
+    The operator acts on the reduced (active DOFs only) vectors. Its action
+    is the difference of the residuals
+
+    .. math::
+        A d = (r(x_0 + h d) - r(x_0)) / h \;,
+
+    which is exact for linear problems, where :math:`x_0 = 0` and :math:`h =
+    1` is used. For nonlinear problems, :math:`x_0` is the state, at which
+    the tangent matrix is evaluated, and the forward difference step is
+    :math:`h = \sqrt{\epsilon} (1 + |x_0|) / |d|`.
+
+    Parameters
+    ----------
+    problem : Problem instance
+        The problem.
+    vec0 : array, optional
+        The full DOF vector :math:`x_0` of a nonlinear problem. If not given,
+        the problem is assumed to be linear.
+
+    Notes
+    -----
+    The operator application changes the state of the problem variables.
+    LCBCs, the matrix hook and the `active_only` option set to False are not
+    supported.
+    """
+
+    def __init__(self, problem, vec0=None):
+        variables = problem.get_variables()
+        if not problem.active_only:
+            raise ValueError('matrix-free mode requires active_only option!')
+
+        if variables.has_lcbc:
+            raise ValueError('LCBCs are not supported in matrix-free mode!')
+
+        n_dof = variables.adi.ptr[-1]
+        LinearOperator.__init__(self, variables.dtype, (n_dof, n_dof))
+
+        self.problem = problem
+        self.is_linear = vec0 is None
+        if self.is_linear:
+            self.vec0 = variables.create_vec()
+            self.eps = 1.0
+
+        else:
+            self.vec0 = vec0
+            self.eps = nm.sqrt(nm.finfo(nm.float64).eps)
+
+        self.res0 = problem.equations.eval_unknown_residuals(self.vec0)
+        self._diag = None
+
+    def _matvec(self, vec):
+        vec = nm.ravel(vec)
+        norm = nm.linalg.norm(vec)
+        if norm == 0.0:
+            return nm.zeros_like(self.res0)
+
+        if self.is_linear:
+            step = 1.0
+
+        else:
+            step = self.eps * (1.0 + nm.linalg.norm(self.vec0)) / norm
+
+        eqs = self.problem.equations
+        dvec = eqs.make_full_vec(vec, force_value=0.0)
+        res = eqs.eval_unknown_residuals(self.vec0 + step * dvec)
+
+        return (res - self.res0) / step
+
+    def diagonal(self):
+        """
+        Return the diagonal of the operator matrix, e.g. for the Jacobi
+        preconditioner, see :func:`Equations.eval_tangent_diagonal()
+        <sfepy.discrete.equations.Equations.eval_tangent_diagonal()>`.
+
+        The residual at :math:`x_0` is evaluated again before the diagonal,
+        because some terms, e.g. the hyperelastic ones, reuse data cached in
+        the residual evaluation, that might have been done at another state in
+        the operator application.
+        """
+        if self._diag is None:
+            eqs = self.problem.equations
+            if not self.is_linear:
+                eqs.eval_unknown_residuals(self.vec0)
+
+            self._diag = eqs.eval_tangent_diagonal(self.vec0)
+
+        return self._diag
+
 ##
 # 02.10.2007, c
 class Evaluator(Struct):
@@ -86,6 +183,9 @@ class Evaluator(Struct):
         return vec_r
 
     def eval_tangent_matrix(self, vec, mtx=None, is_full=False):
+        if self.problem.is_matrix_free():
+            return self.get_tangent_operator(vec, is_full=is_full)
+
         if isinstance(vec, basestr) and vec == 'linear':
             return get_default(mtx, self.problem.mtx_a)
 
@@ -117,6 +217,55 @@ class Evaluator(Struct):
 
         return mtx
 
+    def get_tangent_operator(self, vec, is_full=False):
+        """
+        Get the tangent matrix at `vec` as a :class:`MatrixFreeOperator`
+        instance. If `vec` is 'linear', or the problem is linear, the operator
+        does not depend on `vec`.
+        """
+        pb = self.problem
+        if ((isinstance(vec, basestr) and vec == 'linear')
+            or ((pb.solver is not None) and pb.is_linear())):
+            return MatrixFreeOperator(pb)
+
+        if not is_full:
+            vec = self.make_full_vec(vec)
+
+        return MatrixFreeOperator(pb, vec0=vec)
+
+    def eval_tangent_blocks(self, vec, mtxs=None, is_full=False):
+        """
+        Evaluate the blocks of the tangent matrix corresponding to the pairs
+        of the test and unknown variables into separate matrices, see
+        :func:`Equations.eval_tangent_blocks()
+        <sfepy.discrete.equations.Equations.eval_tangent_blocks()>`.
+
+        The matrix hook and LCBCs are not supported.
+        """
+        if not is_full and self.problem.active_only:
+            vec = self.make_full_vec(vec)
+
+        pb = self.problem
+        if mtxs is None:
+            mtxs = pb.mtx_blocks
+        mtxs = pb.equations.eval_tangent_blocks(vec, mtxs)
+
+        if not pb.active_only:
+            variables = pb.get_variables()
+            ebc_rows, (master, slave) = pb.get_ebc_indices()
+            for (rname, cname), mtx in six.iteritems(mtxs):
+                if rname != cname: continue
+
+                indx = variables.get_indx(rname)
+                ii = (master >= indx.start) & (master < indx.stop)
+                ir = ebc_rows[(ebc_rows >= indx.start)
+                              & (ebc_rows < indx.stop)]
+                apply_ebc_to_matrix(mtx, ir - indx.start,
+                                    (master[ii] - indx.start,
+                                     slave[ii] - indx.start))
+
+        return mtxs
+
     def make_full_vec(self, vec):
         return self.problem.equations.make_full_vec(vec)
 
@@ -1152,6 +1152,73 @@ class VolumeField(FEField):
 
         self.is_surface = False
 
+    def clear_mappings(self, clear_all=False):
+        """
+        Clear current reference mappings and sum factorization data.
+        """
+        FEField.clear_mappings(self, clear_all=clear_all)
+        self.sum_factorizations = {}
+
+    def get_sum_factorization(self, region, integral):
+        """
+        Get the data for the sum-factorized evaluation of the field basis, see
+        :class:`SumFactorization
+        <sfepy.discrete.fem.poly_spaces.SumFactorization>`, in the given
+        region and integral. The data are cached in the field instance.
+
+        The sum factorization requires a tensor product basis without
+        orientation or transformation, and quadrature points that are
+        a tensor product of 1D points. The jacobians of the geometry mapping
+        are evaluated by the sum factorization as well.
+
+        Returns
+        -------
+        sfd : Struct instance or None
+            The data with the `sf` (SumFactorization instance), `mtx_i` (the
+            inverse jacobians with the shape `(n_cell, n_qp, dim, dim)`) and
+            `det` (the jacobian determinants multiplied by quadrature weights
+            with the shape `(n_cell, n_qp)`) attributes. None, if the sum
+            factorization is not supported.
+        """
+        from sfepy.discrete.fem.poly_spaces import SumFactorization
+
+        key = (region.name, integral.order)
+        if key in self.sum_factorizations:
+            return self.sum_factorizations[key]
+
+        ps = self.poly_space
+        gps = self.gel.poly_space
+        iels = region.get_cells(true_cells_only=True)
+        qp = self.get_qp('v', integral)
+        coors1d = SumFactorization.get_coors_1d(qp.vals)
+
+        if ((coors1d is None)
+            or not hasattr(ps, 'get_tensor_indices')
+            or not hasattr(gps, 'get_tensor_indices')
+            or (self.basis_transform is not None)
+            or ((self.ori is not None) and self.ori[iels].any())):
+            sfd = None
+
+        else:
+            sf = SumFactorization(ps, coors1d)
+            gsf = SumFactorization(gps, coors1d)
+
+            coors = self.domain.get_mesh_coors(actual=True)
+            conn = self.domain.get_conn()[iels]
+            mtx_j = gsf.eval_grad(coors[conn].transpose((0, 2, 1)))
+            mtx_j = mtx_j.transpose((0, 3, 1, 2))
+
+            det = nm.linalg.det(mtx_j)
+            if (det <= 0.0).any():
+                raise ValueError('warp violation in sum factorization!')
+
+            sfd = Struct(sf=sf, mtx_i=nm.linalg.inv(mtx_j),
+                         det=det * qp.weights)
+
+        self.sum_factorizations[key] = sfd
+
+        return sfd
+
     def _create_interpolant(self):
         name = '%s_%s_%s_%d%s' % (self.gel.name, self.space,
                                   self.poly_space_base, self.approx_order,
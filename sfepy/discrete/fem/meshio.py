@@ -1197,6 +1197,53 @@ class HDF5MeshIO(MeshIO):
 
         return out
 
+    @staticmethod
+    def _is_series(fd):
+        """
+        Return True, if the file was written by :class:`HDF5StreamWriter`.
+        """
+        return 'series' in fd.root
+
+    @staticmethod
+    def _get_series_index(fd, step):
+        """
+        Return the index of `step` along the time axis of the series data, or
+        None, if the step is not saved.
+        """
+        steps = fd.root.series.steps.read()
+        if not len(steps):
+            return None
+
+        if step is None:
+            return 0
+
+        ii = nm.nonzero(steps == step)[0]
+        return ii[0] if len(ii) else None
+
+    @staticmethod
+    def _iter_series_groups(fd):
+        for data_group in fd.root.series._f_iter_nodes('Group'):
+            yield data_group._v_name, data_group
+
+    def _read_series_data(self, fd, step):
+        ii = self._get_series_index(fd, step)
+        if ii is None:
+            output('step %d data not found - premature end of file?' % step)
+            return None
+
+        out = {}
+        for _, data_group in self._iter_series_groups(fd):
+            attrs = data_group._v_attrs
+            data = data_group.data[ii]
+            field_name = attrs.field_name if attrs.mode == 'full' else None
+            out[attrs.dname] = Struct(name=attrs.name, mode=attrs.mode,
+                                      data=data, dofs=tuple(attrs.dofs),
+                                      shape=tuple(int(ic)
+                                                  for ic in attrs.shape),
+                                      field_name=field_name)
+
+        return out
+
     def _get_step_group_names(self, fd):
         return sorted([name for name in fd.root._v_groups.keys()
                        if name.startswith('step')],
@@ -1218,6 +1265,15 @@ class HDF5MeshIO(MeshIO):
         filename = get_default(filename, self.filename)
         fd = pt.open_file(filename, mode='r')
 
+        if self._is_series(fd):
+            series = fd.root.series
+            steps = series.steps.read()
+            times = series.times.read()
+            nts = series.nts.read()
+            fd.close()
+
+            return steps, times, nts
+
         steps = []
         times = []
         nts = []
@@ -1253,6 +1309,11 @@ class HDF5MeshIO(MeshIO):
         return fd, step_group
 
     def read_data(self, step, filename=None, cache=None):
+        with HDF5ContextManager(get_default(filename, self.filename),
+                                mode='r') as fd:
+            if self._is_series(fd):
+                return self._read_series_data(fd, step)
+
         fd, step_group = self._get_step_group(step, filename=filename)
         if fd is None:
             return None
@@ -1296,6 +1357,16 @@ class HDF5MeshIO(MeshIO):
         return out
 
     def read_data_header(self, dname, step=None, filename=None):
+        with HDF5ContextManager(get_default(filename, self.filename),
+                                mode='r') as fd:
+            if self._is_series(fd):
+                for name, data_group in self._iter_series_groups(fd):
+                    attrs = data_group._v_attrs
+                    if attrs.dname == dname:
+                        return attrs.mode, name
+
+                raise KeyError('non-existent data: %s' % dname)
+
         fd, step_group = self._get_step_group(step, filename=filename)
         if fd is None:
             return None
@@ -1317,24 +1388,49 @@ class HDF5MeshIO(MeshIO):
         raise KeyError('non-existent data: %s' % dname)
 
     def read_time_history(self, node_name, indx, filename=None):
-        filename = get_default(filename, self.filename)
-        fd = pt.open_file(filename, mode="r")
+        """
+        Read the time history of the data `node_name` in the vertices or
+        cells `indx`.
 
-        th = dict_from_keys_init(indx, list)
-        for gr_name in self._get_step_group_names(fd):
-            step_group = fd.get_node(fd.root, gr_name)
-            data = step_group._f_get_child(node_name).data
+        Only the requested rows are read: a single hyperslab read over all
+        time steps for files written by :class:`HDF5StreamWriter`, a single
+        read per time step otherwise.
 
-            for ii in indx:
-                th[ii].append(nm.array(data[ii]))
+        Returns
+        -------
+        th : dict
+            The time histories with the items of `indx` as keys.
+        """
+        filename = get_default(filename, self.filename)
+        uindx, iindx = nm.unique(nm.asarray(indx, dtype=nm.int64),
+                                 return_inverse=True)
 
-        fd.close()
+        with HDF5ContextManager(filename, mode='r') as fd:
+            if self._is_series(fd):
+                data = fd.root.series._f_get_child(node_name).data
+                vals = data[:, uindx]
 
-        for key, val in six.iteritems(th):
-            aux = nm.array(val)
+            else:
+                names = self._get_step_group_names(fd)
+                vals = None
+                for istep, gr_name in enumerate(names):
+                    step_group = fd.get_node(fd.root, gr_name)
+                    data = step_group._f_get_child(node_name).data
+                    if vals is None:
+                        vals = nm.empty((len(names), len(uindx))
+                                        + data.shape[1:], dtype=data.dtype)
+                    if len(uindx):
+                        vals[istep] = data[uindx, ...]
+
+                if vals is None:
+                    raise ValueError('no time steps in %s!' % filename)
+
+        th = {}
+        for ii, iu in zip(indx, iindx):
+            aux = vals[:, iu]
             if aux.ndim == 4: # cell data.
                 aux = aux[:,0,:,0]
-            th[key] = aux
+            th[ii] = aux
 
         return th
 
@@ -1344,6 +1440,16 @@ class HDF5MeshIO(MeshIO):
 
         assert_((fd.root.last_step[0] + 1) == ts.n_step)
 
+        if self._is_series(fd):
+            groups = {data_group._v_attrs.dname : data_group
+                      for _, data_group in self._iter_series_groups(fd)}
+            ths = {}
+            for var_name in var_names:
+                ths[var_name] = list(groups[var_name].data[:ts.n_step])
+
+            fd.close()
+            return ths
+
         ths = dict_from_keys_init(var_names, list)
 
         arr = nm.asarray
@@ -1368,6 +1474,300 @@ class HDF5XdmfMeshIO(HDF5MeshIO):
                          xdmf=True, **kwargs)
 
 
+class HDF5StreamWriter(Struct):
+    """
+    Streaming writer of multi-step results into a HDF5 file, that keeps the
+    file open across the time steps.
+
+    The mesh and time stepper information is stored as in
+    :class:`HDF5MeshIO`, but the step data are stored in the ``/series``
+    group: each output variable has a single chunked, extendable and
+    optionally compressed ``data`` array with the time as the first axis and
+    the variable metadata stored only once. The ``steps``, ``times`` and
+    ``nts`` arrays hold the time step numbers, times and normalized times.
+    The files can be read by :class:`HDF5MeshIO`.
+
+    Parameters
+    ----------
+    filename : str
+        The output file name. An existing file is overwritten.
+    mesh : Mesh instance
+        The mesh.
+    ts : TimeStepper instance, optional
+        The time stepper.
+    complevel : int
+        The compression level (0 = no compression).
+    complib : str
+        The compression library, see tables.Filters.
+    chunk_steps : int
+        The number of time steps in a data chunk.
+    chunk_size : int
+        The target size of a data chunk in bytes. The number of vertices or
+        cells in a chunk is chosen so that a chunk of `chunk_steps` time
+        steps does not exceed `chunk_size`, and reading the time history of
+        a few vertices or cells touches only a few chunks.
+    async_flush : bool
+        If True, the data are written by a background thread, so that
+        :func:`HDF5StreamWriter.write()` returns immediately.
+    flush_every : int
+        Flush the file every `flush_every` steps. If 0, the file is flushed
+        only by explicit :func:`HDF5StreamWriter.flush()` calls and on close.
+    append : bool
+        If True and `filename` is an existing file written by this class,
+        append the new steps to it instead of overwriting it.
+    """
+
+    def __init__(self, filename, mesh, ts=None, complevel=0, complib='zlib',
+                 chunk_steps=16, chunk_size=2**16, async_flush=False,
+                 flush_every=0, append=False):
+        import atexit
+
+        if pt is None:
+            raise ValueError('pytables not imported!')
+
+        Struct.__init__(self, filename=filename, mesh=mesh,
+                        complevel=complevel, complib=complib,
+                        chunk_steps=chunk_steps, chunk_size=chunk_size,
+                        async_flush=async_flush,
+                        flush_every=flush_every, n_written=0,
+                        written_steps=set(), is_open=False, thread=None,
+                        queue=None, error=None)
+        self.filters = pt.Filters(complevel=complevel, complib=complib)
+        self.arrays = {}
+
+        if append and op.exists(filename) and self._reopen():
+            pass
+
+        else:
+            self._create(ts)
+
+        if async_flush:
+            import threading
+            from queue import Queue
+
+            self.queue = Queue()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+        atexit.register(self.close)
+
+    def _reopen(self):
+        fd = pt.open_file(self.filename, mode='r+')
+        if not HDF5MeshIO._is_series(fd):
+            fd.close()
+            return False
+
+        self.fd = fd
+        self.is_open = True
+        self.series = fd.root.series
+        for _, data_group in HDF5MeshIO._iter_series_groups(fd):
+            self.arrays[data_group._v_attrs.dname] = data_group.data
+
+        steps = self.series.steps.read()
+        self.written_steps.update(steps.tolist())
+        self.n_written = len(steps)
+
+        return True
+
+    def _create(self, ts):
+        from time import asctime
+
+        mesh = self.mesh
+        fd = pt.open_file(self.filename, mode='w', title='SfePy output file')
+        self.fd = fd
+        self.is_open = True
+
+        mesh_group = fd.create_group('/', 'mesh', 'mesh')
+        HDF5MeshIO.write_mesh_to_hdf5(fd, mesh_group, mesh)
+
+        if ts is not None:
+            ts_group = fd.create_group('/', 'ts', 'time stepper')
+            fd.create_array(ts_group, 't0', ts.t0, 'initial time')
+            fd.create_array(ts_group, 't1', ts.t1, 'final time')
+            fd.create_array(ts_group, 'dt', ts.dt, 'time step')
+            fd.create_array(ts_group, 'n_step', ts.n_step, 'n_step')
+
+        tstat_group = fd.create_group('/', 'tstat', 'global time statistics')
+        fd.create_array(tstat_group, 'created', enc(asctime()),
+                        'file creation time')
+        fd.create_array(tstat_group, 'finished', enc('.' * 24),
+                        'file closing time')
+
+        fd.create_array(fd.root, 'last_step', nm.array([0], dtype=nm.int32),
+                        'last saved step')
+
+        series = fd.create_group('/', 'series', 'time series data')
+        fd.create_earray(series, 'steps', pt.Int32Atom(), (0,), 'steps')
+        fd.create_earray(series, 'times', pt.Float64Atom(), (0,), 'times')
+        fd.create_earray(series, 'nts', pt.Float64Atom(), (0,),
+                         'normalized times')
+        self.series = series
+
+    def _run(self):
+        while 1:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    break
+
+                elif self.error is None:
+                    self._write(*item)
+
+            except Exception as exc:
+                self.error = exc
+
+            finally:
+                self.queue.task_done()
+
+    def _check_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _create_array(self, key, val, data):
+        fd = self.fd
+        group_name = '__' + key.translate(HDF5MeshIO._tr)
+        data_group = fd.create_group(self.series, group_name, '%s data' % key)
+
+        attrs = data_group._v_attrs
+        attrs.dname = key
+        attrs.mode = val.mode
+        attrs.name = val.get('name', 'output_data')
+        shape = val.get('shape', data.shape)
+        dofs = val.get('dofs', None)
+        if dofs is None:
+            dofs = [''] * nm.squeeze(shape)[-1]
+        attrs.dofs = list(dofs)
+        attrs.shape = nm.asarray(shape)
+        attrs.var_name = val.get('var_name', '')
+        attrs.field_name = val.get('field_name', '') or ''
+
+        # Bound the chunk along the vertex/cell axis.
+        row_size = data.dtype.itemsize * int(nm.prod(data.shape[1:]))
+        n_row = self.chunk_size // (self.chunk_steps * row_size)
+        n_row = min(max(n_row, 1), max(data.shape[0], 1))
+        chunkshape = (self.chunk_steps, n_row) + data.shape[1:]
+        arr = fd.create_earray(data_group, 'data',
+                               pt.Atom.from_dtype(data.dtype),
+                               (0,) + data.shape, 'data',
+                               filters=self.filters,
+                               chunkshape=chunkshape,
+                               expectedrows=self.chunk_steps)
+        # Fill the missing steps of variables appearing later.
+        for ii in range(self.n_written):
+            arr.append(nm.zeros((1,) + data.shape, dtype=data.dtype))
+
+        self.arrays[key] = arr
+        return arr
+
+    def _write(self, out, step, time, nt):
+        """
+        Append the data of a single time step. The variables missing in `out`
+        are filled with zeros.
+        """
+        fd = self.fd
+        series = self.series
+
+        if step in self.written_steps:
+            raise ValueError('step %d is already saved in "%s" file!'
+                             % (step, self.filename))
+
+        for key, (val, data) in six.iteritems(out):
+            arr = self.arrays.get(key)
+            if arr is None:
+                arr = self._create_array(key, val, data)
+
+            if arr.shape[1:] != data.shape:
+                raise ValueError('data shape of "%s" changed! (%s == %s)'
+                                 % (key, arr.shape[1:], data.shape))
+
+            arr.append(data[None, ...])
+
+        for key, arr in six.iteritems(self.arrays):
+            if key not in out:
+                arr.append(nm.zeros((1,) + arr.shape[1:], dtype=arr.dtype))
+
+        series.steps.append([step])
+        series.times.append([time])
+        series.nts.append([nt])
+        fd.root.last_step[0] = step
+
+        self.written_steps.add(step)
+        self.n_written += 1
+        if self.flush_every and not (self.n_written % self.flush_every):
+            fd.flush()
+
+    def write(self, out, ts=None):
+        """
+        Write the output data `out` of a single time step. The 'custom' mode
+        data are not supported.
+        """
+        if not self.is_open:
+            raise ValueError('file "%s" is closed!' % self.filename)
+
+        self._check_error()
+
+        if ts is None:
+            step, time, nt = 0, 0.0, 0.0
+        else:
+            step, time, nt = ts.step, ts.time, ts.nt
+
+        sout = {}
+        for key, val in six.iteritems(out):
+            if val.mode == 'custom':
+                raise ValueError('custom data cannot be streamed! (%s)' % key)
+            # Copy the data, as the caller may reuse the buffers.
+            sout[key] = (val, nm.array(val.data, copy=True))
+
+        if self.async_flush:
+            self.queue.put((sout, step, time, nt))
+
+        else:
+            self._write(sout, step, time, nt)
+
+    def flush(self):
+        """
+        Wait for all pending data to be written and flush the file.
+        """
+        if not self.is_open:
+            return
+
+        if self.async_flush:
+            self.queue.join()
+
+        self._check_error()
+        self.fd.flush()
+
+    def close(self):
+        """
+        Flush all pending data, record the file closing time and close the
+        file. Calling it repeatedly has no effect.
+        """
+        import atexit
+        from time import asctime
+
+        if not self.is_open:
+            return
+
+        try:
+            if self.async_flush:
+                self.queue.join()
+                self.queue.put(None)
+                self.thread.join()
+
+            fd = self.fd
+            fd.remove_node(fd.root.tstat.finished)
+            fd.create_array(fd.root.tstat, 'finished', enc(asctime()),
+                            'file closing time')
+
+        finally:
+            self.fd.close()
+            self.is_open = False
+            atexit.unregister(self.close)
+
+        self._check_error()
+
+
 class Mesh3DMeshIO(MeshIO):
     format = "mesh3d"
 
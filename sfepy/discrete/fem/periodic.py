@@ -1,10 +1,38 @@
 from __future__ import print_function
 import numpy as nm
+from scipy.spatial import cKDTree
 
-from sfepy.discrete.fem.mesh import find_map
+from sfepy.base.base import output
+from sfepy.discrete.setup_cache import get_setup_cache, get_digest
 
+# The matches keyed by the digests of the coordinates and matching
+# parameters.
 periodic_cache = {}
 
+def _get_saved(key, get_saved):
+    """
+    Get the saved match with `key` from the in-memory cache or the setup
+    cache, if enabled.
+    """
+    if not get_saved:
+        return None
+
+    match = periodic_cache.get(key)
+    if match is None:
+        cache = get_setup_cache()
+        if cache is not None:
+            match = cache.get('periodic', cache.get_key(key))
+            if match is not None:
+                periodic_cache[key] = match
+
+    return match
+
+def _save(key, match):
+    periodic_cache[key] = match
+    cache = get_setup_cache()
+    if cache is not None:
+        cache.set('periodic', cache.get_key(key), match)
+
 ##
 # c: 05.05.2008, r: 05.05.2008
 eps = 1e-9
@@ -21,9 +49,10 @@ def match_grid_line(coors1, coors2, which, get_saved=True):
         raise ValueError('incompatible shapes: %s == %s'\
               % (coors1.shape, coors2.shape))
 
-    key = coors1.shape + ('line', which)
-    if key in periodic_cache and get_saved:
-        return periodic_cache[key]
+    key = get_digest(coors1, coors2, 'line', which, eps)
+    match = _get_saved(key, get_saved)
+    if match is not None:
+        return match
     else:
         c1 = coors1[:,which]
         c2 = coors2[:,which]
@@ -36,7 +65,7 @@ def match_grid_line(coors1, coors2, which, get_saved=True):
             print(nm.abs(c1[i1] - c2[i2]).max())
             raise ValueError('cannot match nodes!')
 
-        periodic_cache[key] = (i1, i2)
+        _save(key, (i1, i2))
 
         return i1, i2
 
@@ -51,6 +80,47 @@ def match_z_line(coors1, coors2, get_saved=True):
     return match_grid_line(coors1, coors2, 2, get_saved)
 
 
+def match_by_projection(coors1, coors2, direction=None):
+    """
+    Match coordinates `coors1` with `coors2` by a single nearest neighbour
+    query of their projections onto the plane orthogonal to `direction`. If
+    `direction` is None, the coordinates are matched directly.
+
+    All nodes have to be matched one-to-one within the tolerance `eps`,
+    otherwise all unmatched nodes are reported and ValueError is raised.
+
+    Returns
+    -------
+    i1, i2 : arrays
+        The matching indices, such that `coors1[i1]` corresponds to
+        `coors2[i2]`.
+    """
+    if direction is not None:
+        direction = nm.asarray(direction, dtype=nm.float64).ravel()
+        direction = direction[:coors1.shape[1]] / nm.linalg.norm(direction)
+        coors1 = coors1 - nm.outer(nm.dot(coors1, direction), direction)
+        coors2 = coors2 - nm.outer(nm.dot(coors2, direction), direction)
+
+    tree = cKDTree(coors2)
+    dist, i2 = tree.query(coors1, k=1, distance_upper_bound=eps)
+
+    is_matched = nm.isfinite(dist)
+    i1 = nm.where(is_matched)[0]
+    i2 = i2[is_matched]
+
+    unmatched1 = nm.where(~is_matched)[0]
+    unmatched2 = nm.setdiff1d(nm.arange(coors2.shape[0]), i2)
+    if len(unmatched1) or len(unmatched2):
+        output('direction:', direction)
+        output('unmatched nodes 1 (%d):' % len(unmatched1))
+        output(nm.c_[unmatched1, coors1[unmatched1]])
+        output('unmatched nodes 2 (%d):' % len(unmatched2))
+        output(nm.c_[unmatched2, coors2[unmatched2]])
+        raise ValueError('cannot match nodes! (%d and %d unmatched nodes)'
+                         % (len(unmatched1), len(unmatched2)))
+
+    return i1, i2
+
 def match_plane_by_dir(coors1, coors2, direction, get_saved=True):
     """
     Match coordinates `coors1` with `coors2` in a given direction.
@@ -60,39 +130,14 @@ def match_plane_by_dir(coors1, coors2, direction, get_saved=True):
                          % (coors1.shape, coors2.shape))
 
     key_dir = None if direction is None else tuple(direction)
-    key = coors1.shape + ('dir', key_dir)
-    if key in periodic_cache and get_saved:
-        return periodic_cache[key]
+    key = get_digest(coors1, coors2, 'dir', key_dir, eps)
+    match = _get_saved(key, get_saved)
+    if match is not None:
+        return match
     else:
-        aux = coors2.copy()
-        if direction is not None:
-            direction = nm.asarray(direction, dtype=nm.float).reshape((3, 1))
-            direction = direction[:coors1.shape[1]]
-            direction /= nm.linalg.norm(direction)
-            x0p = coors1[0] - coors2
-            dist = nm.linalg.norm(x0p - nm.dot(x0p, direction) * direction.T,
-                                  axis=1)
-            idx = nm.where(dist < eps)[0]
-            if len(idx) < 1:
-                print(direction)
-                print(dist)
-                raise ValueError('cannot match nodes!')
-
-            aux += coors1[0] - coors2[idx[0]]
-
-        i1, i2 = find_map(coors1, aux, join=False)
-
-        if i1.shape[0] != coors1.shape[0]:
-            print(direction)
-            print(coors1[i1])
-            print(coors2[i2])
-            print(nm.abs(coors1[i1] - coors2[i2]).max(0))
-            ii = nm.setdiff1d(nm.arange(coors1.shape[0]), i1)
-            print(coors1[ii])
-            print(coors2[ii])
-            raise ValueError('cannot match nodes!')
+        i1, i2 = match_by_projection(coors1, coors2, direction)
 
-        periodic_cache[key] = (i1, i2)
+        _save(key, (i1, i2))
 
         return i1, i2
 
@@ -142,7 +142,8 @@ class ConstantFunctionByRegion(Function):
         """
         Make a function out of a dictionary of constant values per region. When
         called with coors argument, the values are repeated for each
-        coordinate in each of the given regions.
+        coordinate in each of the given regions. If the term region lies in a
+        single region, the values are not repeated.
         """
 
         name = '_'.join(['get_constants_by_region'] + list(values.keys()))
@@ -154,13 +155,17 @@ class ConstantFunctionByRegion(Function):
                 qps = term.get_physical_qps()
                 assert_(qps.num == coors.shape[0])
 
+                tcells = term.region.get_cells(true_cells_only=False)
                 for key, val in six.iteritems(values):
                     if '.' in key: continue
                     rval = nm.array(val[list(val.keys())[0]], ndmin=3)
                     s0 = rval.shape[1:]
                     dtype = nm.float64 if nm.isrealobj(rval) else nm.complex128
-                    matdata = nm.zeros(qps.shape[:2] + s0, dtype=dtype)
 
+                    # The value of the last region covering all term region
+                    # cells, if any.
+                    cval = None
+                    rdatas = []
                     for rkey, rval in six.iteritems(val):
                         region = problem.domain.regions[rkey]
                         rval = nm.array(rval, dtype=dtype, ndmin=3)
@@ -168,9 +173,23 @@ class ConstantFunctionByRegion(Function):
                         cells = region.get_cells(true_cells_only=False)
                         ii = term.region.get_cell_indices(cells,
                                                           true_cells_only=False)
-                        matdata[ii] = rval
+                        rdatas.append((ii, rval))
 
-                    out[key] = matdata.reshape((-1,) + s0)
+                        if nm.isin(tcells, cells).all():
+                            cval = rval
+
+                        elif len(ii):
+                            cval = None
+
+                    if cval is not None:
+                        out[key] = cval
+
+                    else:
+                        matdata = nm.zeros(qps.shape[:2] + s0, dtype=dtype)
+                        for ii, rval in rdatas:
+                            matdata[ii] = rval
+
+                        out[key] = matdata.reshape((-1,) + s0)
 
             return out
 
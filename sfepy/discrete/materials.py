@@ -182,7 +182,8 @@ class Material(Struct):
         """
         # Restore shape to (n_el, n_qp, ...) until the C
         # core is rewritten to work with a bunch of physical
-        # point values only.
+        # point values only. Constant data are stored for a single cell
+        # (n_el == 1) - the term functions broadcast them to all cells.
         new_data = {}
         if data is not None:
             for dkey, val in six.iteritems(data):
@@ -7,7 +7,7 @@ import numpy as nm
 
 from sfepy.base.base import (
     dict_from_keys_init, select_by_names, is_string, is_integer, is_sequence,
-    output, get_default, Struct, IndexedStruct)
+    output, get_default, get_default_attr, Struct, IndexedStruct)
 import sfepy.base.ioutils as io
 from sfepy.base.conf import ProblemConf, get_standard_keywords
 from sfepy.base.conf import transform_variables, transform_materials
@@ -286,6 +286,7 @@ class Problem(Struct):
             self.setup_hooks()
 
         self.mtx_a = None
+        self.mtx_blocks = None
         self.solver = None
         self.ts = self.get_default_ts()
         self.clear_equations()
@@ -342,7 +343,8 @@ class Problem(Struct):
                          output_format=self.output_format,
                          file_format=self.file_format,
                          file_per_var=self.file_per_var,
-                         linearization=self.linearization)
+                         linearization=self.linearization,
+                         h5_stream=self.h5_stream)
 
         return obj
 
@@ -401,6 +403,7 @@ class Problem(Struct):
         default_file_per_var = conf.options.get('file_per_var', None)
         default_float_format = conf.options.get('float_format', None)
         default_linearization = Struct(kind='strip')
+        default_h5_stream = conf.options.get('h5_stream', None)
 
         self.setup_output(output_filename_trunk=default_trunk,
                           output_dir=default_output_dir,
@@ -408,14 +411,21 @@ class Problem(Struct):
                           file_format=default_file_format,
                           float_format=default_float_format,
                           file_per_var=default_file_per_var,
-                          linearization=default_linearization)
+                          linearization=default_linearization,
+                          h5_stream=default_h5_stream)
 
     def setup_output(self, output_filename_trunk=None, output_dir=None,
                      output_format=None, file_format=None, float_format=None,
-                     file_per_var=None, linearization=None):
+                     file_per_var=None, linearization=None, h5_stream=None):
         """
         Sets output options to given values, or uses the defaults for
         each argument that is None.
+
+        If `h5_stream` is True or a dict of
+        :class:`HDF5StreamWriter <sfepy.discrete.fem.meshio.HDF5StreamWriter>`
+        keyword arguments, the 'h5' output files are kept open by streaming
+        writers between the calls of :func:`Problem.save_state()`, until
+        :func:`Problem.close_output()` is called.
         """
         self.output_modes = {'vtk' : 'sequence',
                              'h5' : 'single', 'h5x' : 'single',
@@ -439,6 +449,42 @@ class Problem(Struct):
             (self.linearization.kind == 'adaptive')):
             self.linearization.kind = None
 
+        self.close_output()
+        self.h5_stream = get_default(h5_stream, False)
+        self.output_writers = {}
+
+    def get_output_writer(self, filename, mesh, ts=None):
+        """
+        Get the streaming writer of the file `filename`. A new writer is
+        started if the writer does not exist yet or at the initial time step,
+        when the file is (re)created. Otherwise, the new writer appends to the
+        existing file.
+        """
+        from sfepy.discrete.fem.meshio import HDF5StreamWriter
+
+        step = get_default_attr(ts, 'step', 0)
+        writer = self.output_writers.get(filename)
+        if (writer is None) or (step == 0) or not writer.is_open:
+            if writer is not None:
+                writer.close()
+
+            kwargs = self.h5_stream if isinstance(self.h5_stream, dict) else {}
+            writer = HDF5StreamWriter(filename, mesh, ts=ts,
+                                      append=(step > 0), **kwargs)
+            self.output_writers[filename] = writer
+
+        return writer
+
+    def close_output(self):
+        """
+        Close all streaming output writers, see :func:`Problem.setup_output()`.
+        """
+        writers = self.__dict__.get('output_writers', {})
+        for writer in writers.values():
+            writer.close()
+
+        writers.clear()
+
     def set_output_dir(self, output_dir=None):
         """
         Set the directory for output files.
@@ -547,7 +593,7 @@ class Problem(Struct):
         """
         Set equations of the problem to `equations`.
         """
-        self.mtx_a = None
+        self.mtx_a = self.mtx_blocks = None
         self.clear_equations()
         self.equations = equations
 
@@ -605,7 +651,11 @@ class Problem(Struct):
 
         The tangent matrix graph is automatically recomputed if the set
         of active essential or periodic boundary conditions changed
-        w.r.t. the previous time step.
+        w.r.t. the previous time step. If the solver assembles the tangent
+        matrix by blocks, see :func:`Problem.uses_block_matrices()`, the
+        graphs of the blocks are created instead of the whole matrix graph. No
+        graph is created in the matrix-free mode, see
+        :func:`Problem.is_matrix_free()`.
 
         Parameters
         ----------
@@ -641,10 +691,22 @@ class Problem(Struct):
                                        verbose=self.conf.get('verbose', True))
         self.graph_changed = graph_changed
 
-        if (is_matrix
-            and ((self.active_only and graph_changed)
-                 or (self.mtx_a is None) or create_matrix)):
-            self.mtx_a = self.equations.create_matrix_graph(active_only=ac)
+        if is_matrix and self.is_matrix_free():
+            self.mtx_a = self.mtx_blocks = None
+
+        elif is_matrix and self.uses_block_matrices():
+            self.mtx_a = None
+            if ((self.active_only and graph_changed)
+                or (self.mtx_blocks is None) or create_matrix):
+                self.mtx_blocks = self.equations.create_block_matrix_graphs(
+                    active_only=ac
+                )
+
+        elif is_matrix:
+            self.mtx_blocks = None
+            if ((self.active_only and graph_changed)
+                or (self.mtx_a is None) or create_matrix):
+                self.mtx_a = self.equations.create_matrix_graph(active_only=ac)
             ## import sfepy.base.plotutils as plu
             ## plu.spy(self.mtx_a)
             ## plu.plt.show()
@@ -869,8 +931,15 @@ class Problem(Struct):
                            float_format=self.float_format, **kwargs)
         else:
             mesh = out.pop('__mesh__', self.domain.mesh)
-            mesh.write(filename, io='auto', out=out,
-                       float_format=self.float_format, **kwargs)
+            if (self.h5_stream and (self.output_format == 'h5')
+                and (self.file_format in (None, 'hdf5'))):
+                ts = kwargs.get('ts')
+                writer = self.get_output_writer(filename, mesh, ts=ts)
+                writer.write(out, ts=ts)
+
+            else:
+                mesh.write(filename, io='auto', out=out,
+                           float_format=self.float_format, **kwargs)
 
     def save_ebc(self, filename, ebcs=None, epbcs=None,
                  force=True, default=0.0):
@@ -1306,6 +1375,32 @@ class Problem(Struct):
         nls = self.get_nls()
         return nls.lin_solver
 
+    def uses_block_matrices(self):
+        """
+        Return True, if the solver evaluates the blocks of the tangent matrix
+        corresponding to the individual variables separately, so that the
+        whole matrix is not needed.
+
+        This is possible if the solver supports it (has the
+        `uses_block_matrices` attribute set to True), the problem is not
+        linear and has no LCBCs, and no matrix hook is used.
+        """
+        solver = self.solver
+        return (getattr(solver, 'uses_block_matrices', False)
+                and not self.is_linear()
+                and (self.matrix_hook is None)
+                and not self.equations.variables.has_lcbc)
+
+    def is_matrix_free(self):
+        """
+        Return True, if the tangent matrix is not assembled and the linear
+        solver gets a matrix-free operator instead, see
+        :class:`MatrixFreeOperator
+        <sfepy.discrete.evaluate.MatrixFreeOperator>`. This is controlled by
+        the 'matrix_free' option.
+        """
+        return self.conf.options.get('matrix_free', False)
+
     def is_linear(self):
         nls = self.get_nls()
         return nls.conf.get('is_linear', False)
@@ -1436,6 +1531,8 @@ class Problem(Struct):
 
             variables.set_state(vec, self.active_only)
 
+        self.close_output()
+
         if post_process_hook_final is not None: # User postprocessing.
             post_process_hook_final(self, variables)
 
@@ -0,0 +1,153 @@
+"""
+Persistent content-keyed cache of problem setup products.
+
+The cache is disabled by default. It is enabled by setting the
+'setup_cache_dir' global option to a directory name::
+
+    from sfepy.base.goptions import goptions
+    goptions['setup_cache_dir'] = 'setup_cache'
+
+The cached products are stored in individual files in that directory. Their
+keys are digests of all the data the products depend on, e.g. the mesh and
+the region definitions, so that stale entries are never used.
+"""
+import os
+import pickle
+import hashlib
+import tempfile
+
+import numpy as nm
+
+from sfepy.base.base import output, Struct
+from sfepy.base.goptions import goptions
+from sfepy.version import __version__
+
+def _update_digest(hsh, item):
+    if isinstance(item, nm.ndarray):
+        hsh.update(('a%s%s' % (item.dtype.str, item.shape)).encode())
+        hsh.update(nm.ascontiguousarray(item).data)
+
+    elif isinstance(item, (list, tuple)):
+        hsh.update(b'(')
+        for val in item:
+            _update_digest(hsh, val)
+        hsh.update(b')')
+
+    elif isinstance(item, dict):
+        hsh.update(b'{')
+        for key in sorted(item.keys(), key=repr):
+            _update_digest(hsh, key)
+            _update_digest(hsh, item[key])
+        hsh.update(b'}')
+
+    else:
+        hsh.update(repr(item).encode())
+
+def get_digest(*items):
+    """
+    Get the digest of `items`, that can be (nested lists, tuples or
+    dictionaries of) numpy arrays or objects with a deterministic repr().
+    """
+    hsh = hashlib.sha1()
+    _update_digest(hsh, items)
+
+    return hsh.hexdigest()
+
+def get_mesh_digest(domain):
+    """
+    Get the digest of the mesh data of `domain`: the vertex coordinates and
+    groups, the cell types, groups and connectivity, and the vertex sets.
+    """
+    cmesh = domain.cmesh
+    conn = cmesh.get_conn(cmesh.tdim, 0)
+    return get_digest(cmesh.coors, cmesh.vertex_groups, cmesh.cell_types,
+                      cmesh.cell_groups, conn.indices, conn.offsets,
+                      getattr(domain, 'vertex_set_bcs', None))
+
+class SetupCache(Struct):
+    """
+    Persistent cache of problem setup products. Each product is stored in a
+    file named by the product kind and key.
+
+    Parameters
+    ----------
+    dirname : str
+        The cache directory, created if it does not exist.
+    """
+
+    def __init__(self, dirname):
+        Struct.__init__(self, dirname=dirname, n_hit=0, n_miss=0)
+
+    @staticmethod
+    def get_key(*items):
+        """
+        Get the cache key of a product depending on `items`. The key
+        includes the sfepy version.
+        """
+        return get_digest(__version__, items)
+
+    def get_filename(self, kind, key):
+        return os.path.join(self.dirname, '%s-%s.pkl' % (kind, key))
+
+    def get(self, kind, key):
+        """
+        Get the product of the given kind and key, or None, if it is not
+        cached.
+        """
+        try:
+            with open(self.get_filename(kind, key), 'rb') as fd:
+                value = pickle.load(fd)
+
+        except Exception:
+            self.n_miss += 1
+            return None
+
+        self.n_hit += 1
+        return value
+
+    def set(self, kind, key, value):
+        """
+        Store the product of the given kind and key. The file is replaced
+        atomically, so that the cache can be shared by several processes.
+        """
+        try:
+            if not os.path.exists(self.dirname):
+                os.makedirs(self.dirname, exist_ok=True)
+
+            fd, tmp_name = tempfile.mkstemp(dir=self.dirname, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as fd:
+                pickle.dump(value, fd, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, self.get_filename(kind, key))
+
+        except OSError as exc:
+            output('cannot save %s to setup cache %s! (%s)'
+                   % (kind, self.dirname, exc))
+
+    def clear(self):
+        """
+        Remove all cached products.
+        """
+        if not os.path.exists(self.dirname):
+            return
+
+        for name in os.listdir(self.dirname):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.dirname, name))
+
+_setup_caches = {}
+
+def get_setup_cache():
+    """
+    Get the setup cache given by the 'setup_cache_dir' global option, or None,
+    if the option is not set.
+    """
+    dirname = goptions['setup_cache_dir']
+    if dirname is None:
+        return None
+
+    dirname = os.path.abspath(dirname)
+    cache = _setup_caches.get(dirname)
+    if cache is None:
+        cache = _setup_caches[dirname] = SetupCache(dirname)
+
+    return cache
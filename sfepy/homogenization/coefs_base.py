@@ -158,6 +158,86 @@ class CorrMiniApp(MiniAppBase):
         self.set_default('post_process_hook', post_process_hook)
         self.set_default('file_per_var', file_per_var)
 
+    def can_batch_solve(self, problem):
+        """
+        Return True, if all load cases of the corrector problem can be solved
+        by :func:`CorrMiniApp.solve_cases_batched()`, i.e. the problem is
+        linear, stationary and the batched solution is not disabled by
+        setting the 'batch_solve' mini-app option to False.
+        """
+        from sfepy.solvers.ts_solvers import StationarySolver
+
+        return (self.is_linear and self.get('batch_solve', True)
+                and isinstance(problem.get_solver(), StationarySolver))
+
+    def solve_cases_batched(self, problem, cases, set_variables):
+        """
+        Solve the linear corrector problem for all load `cases` at once.
+
+        The right-hand sides of all cases are assembled into a single block
+        and solved by a single linear solver call with the matrix factorized
+        only once, if the linear solver supports it. Otherwise the block is
+        solved column by column with the presolved matrix.
+
+        Parameters
+        ----------
+        problem : Problem instance
+            The corrector problem with the solvers initialized by
+            :func:`MiniAppBase.init_solvers()`.
+        cases : sequence
+            The load cases.
+        set_variables : callable
+            The function `set_variables(variables, case)` setting the data of
+            the problem variables for a load case.
+
+        Returns
+        -------
+        states : list
+            The state parts of the solutions of all load cases.
+        """
+        from sfepy.solvers.ls import ScipyDirect, MUMPSSolver
+
+        ev = problem.get_evaluator()
+        ls = problem.get_ls()
+
+        problem.time_update(problem.get_solver().ts)
+
+        variables = problem.get_variables()
+        vecs0, rhss = [], []
+        for case in cases:
+            set_variables(variables, case)
+            state = problem.create_state()
+            state.apply_ebc()
+
+            vec0 = state.get_state(problem.active_only, force=True)
+            vecs0.append(vec0)
+            rhss.append(ev.eval_residual(vec0))
+
+        timer = Timer(start=True)
+
+        mtx = ev.eval_tangent_matrix(vecs0[0])
+        ls.presolve(mtx)
+
+        rhs = nm.array(rhss).T
+        if isinstance(ls, (ScipyDirect, MUMPSSolver)):
+            sols = ls(rhs, mtx=mtx)
+
+        else:
+            sols = nm.array([ls(rr, mtx=mtx) for rr in rhss]).T
+
+        output('%d load cases solved in %.2f [s]'
+               % (len(vecs0), timer.stop()))
+
+        states = []
+        for ii, vec0 in enumerate(vecs0):
+            vec = vec0 - sols[:, ii]
+            state.set_state(vec, problem.active_only)
+            assert_(state.has_ebc())
+
+            states.append(state.get_state_parts(state.get_state().copy()))
+
+        return states
+
     def get_save_name_base(self):
         return self.save_name
 
@@ -367,22 +447,29 @@ class CorrNN(CorrMiniApp):
 
         variables = problem.get_variables()
 
+        def set_variables(variables, case):
+            ir, ic = case
+            if isinstance(self.set_variables, list):
+                self.set_variables_default(variables, ir, ic,
+                                           self.set_variables, data)
+            else:
+                self.set_variables(variables, ir, ic, **data)
+
         states = nm.zeros((self.dim, self.dim), dtype=nm.object)
-        clist = []
-        for ir in range(self.dim):
-            for ic in range(self.dim):
-                if isinstance(self.set_variables, list):
-                    self.set_variables_default(variables, ir, ic,
-                                               self.set_variables, data)
-                else:
-                    self.set_variables(variables, ir, ic, **data)
+        clist = [(ir, ic) for ir in range(self.dim) for ic in range(self.dim)]
+        if self.can_batch_solve(problem):
+            sols = self.solve_cases_batched(problem, clist, set_variables)
+            for (ir, ic), sol in zip(clist, sols):
+                states[ir,ic] = sol
+
+        else:
+            for ir, ic in clist:
+                set_variables(variables, (ir, ic))
 
                 state = problem.solve(update_materials=False)
                 assert_(state.has_ebc())
                 states[ir,ic] = state.get_state_parts()
 
-                clist.append((ir, ic))
-
         corr_sol = CorrSolution(name=self.name,
                                 states=states,
                                 components=clist)
@@ -418,19 +505,28 @@ class CorrN(CorrMiniApp):
 
         variables = problem.get_variables()
 
-        states = nm.zeros((self.dim,), dtype=nm.object)
-        clist = []
-        for ir in range(self.dim):
+        def set_variables(variables, case):
+            ir, = case
             if isinstance(self.set_variables, list):
                 self.set_variables_default(variables, ir,
                                            self.set_variables, data)
             else:
                 self.set_variables(variables, ir, **data)
-            state = problem.solve()
-            assert_(state.has_ebc())
-            states[ir] = state.get_state_parts()
 
-            clist.append((ir,))
+        states = nm.zeros((self.dim,), dtype=nm.object)
+        clist = [(ir,) for ir in range(self.dim)]
+        if self.can_batch_solve(problem):
+            sols = self.solve_cases_batched(problem, clist, set_variables)
+            for (ir,), sol in zip(clist, sols):
+                states[ir] = sol
+
+        else:
+            for ir, in clist:
+                set_variables(variables, (ir,))
+
+                state = problem.solve()
+                assert_(state.has_ebc())
+                states[ir] = state.get_state_parts()
 
         corr_sol = CorrSolution(name=self.name,
                                 states=states,
@@ -111,13 +111,9 @@ def init_global_search(
     next[next[head[Ic]]] etc. - the next array points from the i-th point in
     each cell to the (i+1)-th point, until -1 is reached.
     """
-    cdef int i, lower, upper, Ic
-    cdef np.ndarray[int32, mode='c', ndim=1] I
-    cdef np.ndarray j
     cdef np.ndarray[int32, mode='c', ndim=1] head
     cdef np.ndarray[int32, mode='c', ndim=1] next
 
-    dim = X.shape[1]
     nnod = X.shape[0]
 
     head = np.empty((np.prod(N),), dtype=np.int32);
@@ -126,22 +122,28 @@ def init_global_search(
     next = np.empty((nnod,), dtype=np.int32);
     next[:] = -1
 
-    # Loop over points to find a cell each point is in.
-    for i in range(nnod):
-        lower = np.sum(X[i] < AABBmin)
-        higher = np.sum(X[i] > AABBmax)
+    # Find a cell each point is in, skipping points outside of the box.
+    inside = ~((X < AABBmin) | (X > AABBmax)).any(axis=1)
+    ii = np.nonzero(inside)[0].astype(np.int32)
 
-        if lower + higher: continue
+    I = np.floor(N * (X[ii] - AABBmin)
+                 / (AABBmax - AABBmin)).astype(np.int32)
+    I = np.minimum(I, N - 1)
 
-        I = np.floor(N * (X[i] - AABBmin) / (AABBmax-AABBmin)).astype(np.int32)
+    Ic = np.ravel_multi_index(I.T, N, order='F')
 
-        j = I == N
-        I[j] = N[j] - 1
+    # Points in a cell are linked in the decreasing order of their indices,
+    # which is the order of inserting them one by one at the list head.
+    perm = np.argsort(Ic, kind='stable')
+    ii = ii[perm]
+    Ic = Ic[perm]
 
-        Ic = np.ravel_multi_index(I, N, order='F')
+    if len(ii):
+        same = Ic[1:] == Ic[:-1]
+        next[ii[1:][same]] = ii[:-1][same]
 
-        next[i] = head[Ic]
-        head[Ic] = i
+        last = np.r_[~same, True]
+        head[Ic[last]] = ii[last]
 
     return head, next
 
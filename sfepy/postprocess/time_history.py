@@ -106,6 +106,45 @@ def extract_times(filename):
 
     return steps, times, nts, dts
 
+def convert_to_series(filename, filename_out, verbose=True, **kwargs):
+    """
+    Convert a multi-time-step HDF5 results file with data stored in per-step
+    groups into the time series layout of
+    :class:`HDF5StreamWriter <sfepy.discrete.fem.meshio.HDF5StreamWriter>`,
+    where the time histories of selected vertices or cells can be read by a
+    single hyperslab read. The data of 'custom' mode are skipped.
+
+    Parameters
+    ----------
+    filename : str
+        The name of file to convert.
+    filename_out : str
+        The name of the converted file.
+    verbose : bool
+        Verbosity control.
+    **kwargs : keyword arguments
+        Passed to HDF5StreamWriter, e.g. `complevel` or `chunk_steps`.
+    """
+    from sfepy.discrete.fem.meshio import HDF5StreamWriter
+
+    output('converting %s to %s...' % (filename, filename_out),
+           verbose=verbose)
+    io = MeshIO.any_from_filename(filename)
+    mesh = Mesh.from_file(filename, io=io)
+
+    ts = TimeStepper(*io.read_time_stepper())
+    steps, times, nts, dts = extract_times(filename)
+
+    writer = HDF5StreamWriter(filename_out, mesh, ts=ts, **kwargs)
+    for ii, step in enumerate(steps):
+        out = io.read_data(step)
+        out = {key : val for key, val in six.iteritems(out)
+               if val.mode != 'custom'}
+        writer.write(out, ts=Struct(step=step, time=times[ii], nt=nts[ii]))
+
+    writer.close()
+    output('...done', verbose=verbose)
+
 def extract_time_history(filename, extract, verbose=True):
     """Extract time history of a variable from a multi-time-step results file.
 
@@ -174,11 +213,12 @@ def extract_time_history(filename, extract, verbose=True):
             th = io.read_time_history(nname, pe.indx)
 
         elif pe.mode == 'e' and mode == 'vertex':
-            conn = mesh.conns[0]
+            conn = mesh.get_conn(mesh.descs[0])
+            # Read all the element vertices at once.
+            aux = io.read_time_history(nname, nm.unique(conn[pe.indx]))
             th = {}
             for iel in pe.indx:
-                ips = conn[iel]
-                th[iel] = io.read_time_history(nname, ips)
+                th[iel] = {ip : aux[ip] for ip in conn[iel]}
         else:
             raise ValueError('cannot extract cell data %s in nodes!' % pe.var)
 
@@ -1,21 +1,24 @@
 from __future__ import absolute_import
 import os
 import sfepy
-from sfepy.base.base import load_classes, insert_static_method
+from sfepy.base.base import LazyClassTable, insert_static_method
 from .solvers import *
 from .eigen import eig
 from .auto_fallback import AutoFallbackSolver
+from ._solver_index import solver_index
 
 solver_files = sfepy.get_paths('sfepy/solvers/*.py')
-remove = ['setup.py', 'solvers.py', 'ls_mumps_parallel.py']
+remove = ['setup.py', 'solvers.py', 'ls_mumps_parallel.py',
+          '_solver_index.py']
 solver_files = [name for name in solver_files
                 if os.path.basename(name) not in remove]
-solver_table = load_classes(solver_files,
-                            [AutoFallbackSolver,
-                             LinearSolver, NonlinearSolver,
-                             TimeSteppingSolver, EigenvalueSolver,
-                             QuadraticEVPSolver,
-                             OptimizationSolver], package_name='sfepy.solvers')
+solver_table = LazyClassTable(solver_index, solver_files,
+                              [AutoFallbackSolver,
+                               LinearSolver, NonlinearSolver,
+                               TimeSteppingSolver, EigenvalueSolver,
+                               QuadraticEVPSolver,
+                               OptimizationSolver],
+                              package_name='sfepy.solvers')
 
 
 def register_solver(cls):
@@ -0,0 +1,42 @@
+"""
+Generated by script/gen_lazy_index.py, do not edit.
+"""
+solver_index = {
+    'eig.matlab' : ('sfepy.solvers.eigen', 'MatlabEigenvalueSolver'),
+    'eig.qevp' : ('sfepy.solvers.qeigen', 'LQuadraticEVPSolver'),
+    'eig.scipy' : ('sfepy.solvers.eigen', 'ScipyEigenvalueSolver'),
+    'eig.scipy_lobpcg' : ('sfepy.solvers.eigen', 'LOBPCGEigenvalueSolver'),
+    'eig.sgscipy' : ('sfepy.solvers.eigen', 'ScipySGEigenvalueSolver'),
+    'eig.slepc' : ('sfepy.solvers.eigen', 'SLEPcEigenvalueSolver'),
+    'ls.auto_direct' : ('sfepy.solvers.auto_fallback', 'AutoDirect'),
+    'ls.auto_iterative' : ('sfepy.solvers.auto_fallback', 'AutoIterative'),
+    'ls.cm_pb' : ('sfepy.solvers.ls', 'MultiProblem'),
+    'ls.mumps' : ('sfepy.solvers.ls', 'MUMPSSolver'),
+    'ls.mumps_par' : ('sfepy.solvers.ls', 'MUMPSParallelSolver'),
+    'ls.petsc' : ('sfepy.solvers.ls', 'PETScKrylovSolver'),
+    'ls.pyamg' : ('sfepy.solvers.ls', 'PyAMGSolver'),
+    'ls.pyamg_krylov' : ('sfepy.solvers.ls', 'PyAMGKrylovSolver'),
+    'ls.schur_mumps' : ('sfepy.solvers.ls', 'SchurMumps'),
+    'ls.scipy_direct' : ('sfepy.solvers.ls', 'ScipyDirect'),
+    'ls.scipy_iterative' : ('sfepy.solvers.ls', 'ScipyIterative'),
+    'ls.scipy_superlu' : ('sfepy.solvers.ls', 'ScipySuperLU'),
+    'ls.scipy_umfpack' : ('sfepy.solvers.ls', 'ScipyUmfpack'),
+    'nls.newton' : ('sfepy.solvers.nls', 'Newton'),
+    'nls.oseen' : ('sfepy.solvers.oseen', 'Oseen'),
+    'nls.petsc' : ('sfepy.solvers.nls', 'PETScNonlinearSolver'),
+    'nls.scipy_broyden_like' : ('sfepy.solvers.nls', 'ScipyBroyden'),
+    'nls.scipy_fmin_like' : ('sfepy.solvers.optimize', 'ScipyFMinSolver'),
+    'nls.semismooth_newton' : ('sfepy.solvers.semismooth_newton', 'SemismoothNewton'),
+    'opt.fmin_sd' : ('sfepy.solvers.optimize', 'FMinSteepestDescent'),
+    'ts.adaptive' : ('sfepy.solvers.ts_solvers', 'AdaptiveTimeSteppingSolver'),
+    'ts.bathe' : ('sfepy.solvers.ts_solvers', 'BatheTS'),
+    'ts.euler' : ('sfepy.solvers.ts_dg_solvers', 'EulerStepSolver'),
+    'ts.generalized_alpha' : ('sfepy.solvers.ts_solvers', 'GeneralizedAlphaTS'),
+    'ts.multistaged' : ('sfepy.solvers.ts_dg_solvers', 'DGMultiStageTSS'),
+    'ts.newmark' : ('sfepy.solvers.ts_solvers', 'NewmarkTS'),
+    'ts.runge_kutta_4' : ('sfepy.solvers.ts_dg_solvers', 'RK4StepSolver'),
+    'ts.simple' : ('sfepy.solvers.ts_solvers', 'SimpleTimeSteppingSolver'),
+    'ts.stationary' : ('sfepy.solvers.ts_solvers', 'StationarySolver'),
+    'ts.tvd_runge_kutta_3' : ('sfepy.solvers.ts_dg_solvers', 'TVDRK3StepSolver'),
+    'ts.velocity_verlet' : ('sfepy.solvers.ts_solvers', 'VelocityVerletTS'),
+}
@@ -5,6 +5,7 @@ import numpy as nm
 import warnings
 
 import scipy.sparse as sps
+from scipy.sparse.linalg import LinearOperator
 import six
 from six.moves import range
 
@@ -29,38 +30,92 @@ def solve(mtx, rhs, solver_class=None, solver_conf=None):
 
     return solution
 
-def _get_cs_matrix_hash(mtx, chunk_size=100000):
-    def _gen_array_chunks(arr):
-        ii = 0
-        while len(arr[ii:]):
-            yield arr[ii:ii+chunk_size].tobytes()
-            ii += chunk_size
-
-    sha1 = hashlib.sha1()
-    for chunk in _gen_array_chunks(mtx.indptr):
-        sha1.update(chunk)
-    for chunk in _gen_array_chunks(mtx.indices):
-        sha1.update(chunk)
-    for chunk in _gen_array_chunks(mtx.data):
-        sha1.update(chunk)
+def _get_array_digest(arr):
+    """
+    Return a 128-bit BLAKE2b digest of the array data.
+    """
+    arr = nm.ascontiguousarray(arr)
+    digest = hashlib.blake2b(arr.view(nm.uint8), digest_size=16)
+    return '%s%d:%s' % (arr.dtype.char, arr.size, digest.hexdigest())
 
-    digest = sha1.hexdigest()
-    return digest
+def _get_cs_matrix_hash(mtx):
+    """
+    Return the digests of the CSR/CSC matrix data and sparsity pattern.
+    """
+    data_digest = _get_array_digest(mtx.data)
+    pattern_digest = '%s:%s:%s' % (mtx.shape,
+                                   _get_array_digest(mtx.indptr),
+                                   _get_array_digest(mtx.indices))
+    return data_digest, pattern_digest
 
 def _is_new_matrix(mtx, mtx_digest, force_reuse=False):
+    """
+    Check whether `mtx` differs from the matrix with `mtx_digest`.
+
+    Returns
+    -------
+    is_new : bool
+        True if the matrix is new.
+    mtx_digest : tuple
+        The new matrix digest `(id, data_digest, pattern_digest)`. The
+        digests are empty for non-CSR matrices, as their pattern is unknown.
+    """
     if not isinstance(mtx, sps.csr_matrix):
-        return True, mtx_digest
+        return True, (0, '', '')
 
     if force_reuse:
         return False, mtx_digest
 
-    id0, digest0 = mtx_digest
+    id0, digest0 = mtx_digest[:2]
     id1 = id(mtx)
-    digest1 = _get_cs_matrix_hash(mtx)
+    digest1, pattern1 = _get_cs_matrix_hash(mtx)
     if (id1 == id0) and (digest1 == digest0):
-        return False, (id1, digest1)
+        return False, (id1, digest1, pattern1)
+
+    return True, (id1, digest1, pattern1)
+
+def _is_new_pattern(mtx_digest0, mtx_digest1):
+    """
+    Check whether the sparsity patterns of two matrices with the given digests
+    differ. An empty pattern digest (no previous matrix, or a non-CSR matrix)
+    always means a new pattern.
+    """
+    return ((len(mtx_digest0) < 3) or (len(mtx_digest1) < 3)
+            or (not mtx_digest0[2]) or (not mtx_digest1[2])
+            or (mtx_digest0[2] != mtx_digest1[2]))
 
-    return True, (id1, digest1)
+def create_jacobi_precond(mtx):
+    """
+    Create the Jacobi (diagonal) preconditioner of `mtx` as a
+    LinearOperator. The matrix `mtx` can be any object with the `shape`
+    attribute and the `diagonal()` method, e.g. a sparse matrix or a
+    matrix-free operator. Zero diagonal entries are left unscaled.
+    """
+    diag = nm.asarray(mtx.diagonal())
+    idiag = nm.ones_like(diag)
+    ii = diag != 0.0
+    idiag[ii] = 1.0 / diag[ii]
+
+    return LinearOperator(mtx.shape, matvec=lambda x: idiag * x.ravel(),
+                          dtype=idiag.dtype)
+
+class PETScShellContext(object):
+    """
+    The PETSc Python matrix context for matrix-free operators.
+
+    Wraps an object with the `matvec()` and `diagonal()` methods, e.g. a
+    LinearOperator subclass, so that it can be used as a PETSc shell
+    matrix, including the 'jacobi' preconditioner.
+    """
+
+    def __init__(self, mtx):
+        self.mtx = mtx
+
+    def mult(self, mat, x, y):
+        y[...] = self.mtx.matvec(x[...])
+
+    def getDiagonal(self, mat, d):
+        d[...] = self.mtx.diagonal()
 
 def standard_call(call):
     """
@@ -145,11 +200,18 @@ class ScipyDirect(LinearSolver):
          'The actual solver to use.'),
         ('use_presolve', 'bool', False, False,
          'If True, pre-factorize the matrix.'),
+        ('reuse_symbolic', 'bool', False, False,
+         """If True and UMFPACK is used, keep the symbolic factorization
+            (fill-reducing ordering and symbolic analysis) for the matrices
+            with the same sparsity pattern, and redo only the numeric
+            factorization when the matrix changes. The matrix factors are
+            kept between the calls, as with `use_presolve`."""),
     ]
 
     def __init__(self, conf, method=None, **kwargs):
-        LinearSolver.__init__(self, conf, solve=None, **kwargs)
-        um = self.sls = None
+        LinearSolver.__init__(self, conf, solve=None, umf_context=None,
+                              **kwargs)
+        um = self.sls = self.um = None
         if method is None:
             method = self.conf.method
 
@@ -181,26 +243,68 @@ class ScipyDirect(LinearSolver):
         if is_umfpack:
             self.sls.use_solver(useUmfpack=True,
                                 assumeSortedIndices=True)
+            self.um = aux['um']
         else:
             self.sls.use_solver(useUmfpack=False)
+        self.is_umfpack = is_umfpack
 
     @standard_call
     def __call__(self, rhs, x0=None, conf=None, eps_a=None, eps_r=None,
                  i_max=None, mtx=None, status=None, **kwargs):
-
-        if conf.use_presolve:
+        """
+        Solve the linear system. A 2D `rhs` holds multiple right-hand sides
+        in its columns.
+        """
+        if (conf.use_presolve or self._can_reuse_symbolic(conf)
+            or ((rhs.ndim == 2) and (rhs.shape[1] > 1))):
             self.presolve(mtx)
 
         if self.solve is not None:
             # Matrix is already prefactorized.
+            if (rhs.ndim == 2) and self.is_umfpack:
+                # The UMFPACK solve() supports only a single right-hand side.
+                return nm.array([self.solve(rr) for rr in rhs.T]).T
+
             return self.solve(rhs)
         else:
             return self.sls.spsolve(mtx, rhs)
 
+    def _can_reuse_symbolic(self, conf):
+        return (conf.get('reuse_symbolic', False) and self.is_umfpack
+                and hasattr(self.um, 'UmfpackContext'))
+
+    def _factorize_umfpack(self, mtx, is_new_pattern):
+        """
+        Factorize `mtx` using UMFPACK. The symbolic factorization is reused
+        if the sparsity pattern has not changed.
+        """
+        mtx = sps.csc_matrix(mtx)
+        if mtx.dtype.char not in 'dD':
+            mtx = mtx.astype(nm.float64)
+        if is_new_pattern or (self.umf_context is None):
+            family = (('z' if mtx.dtype.char == 'D' else 'd')
+                      + ('l' if mtx.indices.dtype == nm.int64 else 'i'))
+            self.umf_context = self.um.UmfpackContext(family)
+            self.umf_context.symbolic(mtx)
+
+        umf = self.umf_context
+        umf.numeric(mtx)
+
+        def solve(rhs):
+            return umf.solve(self.um.UMFPACK_A, mtx, rhs, autoTranspose=True)
+
+        return solve
+
     def presolve(self, mtx):
         is_new, mtx_digest = _is_new_matrix(mtx, self.mtx_digest)
         if is_new:
-            self.solve = self.sls.factorized(mtx)
+            if self._can_reuse_symbolic(self.conf):
+                is_new_pattern = _is_new_pattern(self.mtx_digest, mtx_digest)
+                self.solve = self._factorize_umfpack(mtx, is_new_pattern)
+
+            else:
+                self.solve = self.sls.factorized(mtx)
+
             self.mtx_digest = mtx_digest
 
 
@@ -228,6 +332,10 @@ class ScipyUmfpack(ScipyDirect):
     _parameters = [
         ('use_presolve', 'bool', False, False,
          'If True, pre-factorize the matrix.'),
+        ('reuse_symbolic', 'bool', False, False,
+         """If True, keep the symbolic factorization for the matrices with
+            the same sparsity pattern, and redo only the numeric
+            factorization when the matrix changes."""),
     ]
 
     def __init__(self, conf, **kwargs):
@@ -252,6 +360,11 @@ class ScipyIterative(LinearSolver):
             matrix, context is a user-supplied context, and should return one
             of {sparse matrix, dense matrix, LinearOperator}.
          """),
+        ('precond', "{'jacobi', None}", None, False,
+         """The preconditioner used when `setup_precond` returns None. The
+            'jacobi' preconditioner requires only the matrix diagonal, so it
+            can be used with matrix-free operators.
+         """),
         ('callback', 'callable', None, False,
          """User-supplied function to call after each iteration. It is called
             as callback(xk), where xk is the current solution vector, except
@@ -322,6 +435,8 @@ class ScipyIterative(LinearSolver):
             callback(sol)
 
         precond = setup_precond(mtx, context)
+        if (precond is None) and (conf.precond == 'jacobi'):
+            precond = create_jacobi_precond(mtx)
 
         if conf.method == 'qmr':
             prec_args = {'M1' : precond, 'M2' : precond}
@@ -565,6 +680,12 @@ class PETScKrylovSolver(LinearSolver):
     Convergence is reached when `rnorm < max(eps_r * rnorm_0, eps_a)`,
     where, in PETSc, `rnorm` is by default the norm of *preconditioned*
     residual.
+
+    A matrix-free operator (a LinearOperator instance, see
+    :class:`MatrixFreeOperator <sfepy.discrete.evaluate.MatrixFreeOperator>`)
+    is wrapped in a PETSc shell matrix in serial runs. Only the preconditioners
+    that do not need the matrix entries, e.g. 'jacobi' or 'none', can be used
+    with it.
     """
     name = 'ls.petsc'
 
@@ -676,6 +797,12 @@ class PETScKrylovSolver(LinearSolver):
         if isinstance(mtx, self.petsc.Mat):
             pmtx = mtx
 
+        elif isinstance(mtx, LinearOperator):
+            pmtx = self.petsc.Mat()
+            pmtx.createPython(mtx.shape, context=PETScShellContext(mtx),
+                              comm=comm)
+            pmtx.setUp()
+
         else:
             mtx = sps.csr_matrix(mtx)
 
@@ -788,7 +915,8 @@ class MUMPSSolver(LinearSolver):
         if not self.mumps_presolved:
             self.presolve(mtx, presolve_flag=conf.use_presolve)
 
-        out = rhs.copy()
+        # Multiple right-hand sides are stored column-wise.
+        out = rhs.copy(order='F')
         self.mumps_ls.set_rhs(out)
         self.mumps_ls(3)  # solve
 
@@ -812,7 +940,13 @@ class MUMPSSolver(LinearSolver):
                 self.mumps_ls.set_verbose()
 
             self.mumps_ls.set_mtx_centralized(mtx)
-            self.mumps_ls(4)  # analyze + factorize
+            if _is_new_pattern(self.mtx_digest, mtx_digest):
+                self.mumps_ls(4)  # analyze + factorize
+
+            else:
+                # Keep the ordering and symbolic analysis.
+                self.mumps_ls(2)  # factorize
+
             if presolve_flag:
                 self.mumps_presolved = True
             self.mtx_digest = mtx_digest
@@ -604,9 +604,12 @@ class MumpsSolver(object):
         self.struct.a = data.ctypes.data_as(mumps_pcomplex)
 
     def set_rhs(self, rhs):
-        """Set the right hand side of the linear system."""
+        """Set the right hand side of the linear system. A 2D `rhs` in the
+        Fortran order holds multiple right hand sides in its columns."""
         self._data.update(rhs=rhs)
         self.struct.rhs = rhs.ctypes.data_as(mumps_pcomplex)
+        self.struct.lrhs = rhs.shape[0]
+        self.struct.nrhs = rhs.shape[1] if rhs.ndim == 2 else 1
 
     def __call__(self, job):
         """Set the job and call MUMPS."""
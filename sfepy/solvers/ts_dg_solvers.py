@@ -3,6 +3,8 @@ Explicit time stepping solvers for use with DG FEM
 """
 import numpy as nm
 import numpy.linalg as nla
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
 
 # sfepy imports
 from sfepy.discrete.dg.limiters import ComposedLimiter, IdentityLimiter
@@ -13,6 +15,60 @@ from sfepy.solvers.ts import TimeStepper
 from sfepy.solvers.ts_solvers import standard_ts_call
 
 
+def get_block_diagonal_inverse(mtx, max_block_size=1000):
+    """
+    Get a function applying the inverse of a block-diagonal sparse matrix,
+    e.g. the DG mass matrix, that has a block for each cell.
+
+    The blocks are the connected components of the matrix graph, so that the
+    DOFs of a block need not be numbered consecutively. The blocks of the
+    same size are inverted and applied as a batch of dense matrices.
+    Diagonal matrices, for example the mass matrices of orthogonal Legendre
+    bases, give blocks of size one.
+
+    Parameters
+    ----------
+    mtx : scipy.sparse matrix
+        The block-diagonal matrix.
+    max_block_size : int
+        The maximum allowed block size.
+
+    Returns
+    -------
+    apply_inverse : callable or None
+        The function `apply_inverse(vec)` returning the product of the
+        inverse of `mtx` with `vec`, or None, if `mtx` has a block larger
+        than `max_block_size`.
+    """
+    mtx = sp.csr_matrix(mtx)
+    n_block, labels = connected_components(mtx, directed=True,
+                                           connection='weak')
+    sizes = nm.bincount(labels, minlength=n_block)
+    if sizes.max() > max_block_size:
+        return None
+
+    # DOFs sorted by blocks.
+    perm = nm.argsort(labels, kind='stable')
+    offsets = nm.r_[0, nm.cumsum(sizes)]
+
+    groups = []
+    for size in nm.unique(sizes):
+        ibs = nm.where(sizes == size)[0]
+        iis = perm[offsets[ibs][:, None] + nm.arange(size)]
+        blocks = mtx[iis.ravel()[:, None].repeat(size, 1).ravel(),
+                     nm.repeat(iis, size, axis=0).ravel()]
+        blocks = nm.asarray(blocks).reshape((len(ibs), size, size))
+        groups.append((iis, nla.inv(blocks)))
+
+    def apply_inverse(vec):
+        out = nm.empty_like(vec)
+        for iis, inv_blocks in groups:
+            out[iis] = nm.einsum('bij,bj->bi', inv_blocks, vec[iis])
+
+        return out
+
+    return apply_inverse
+
 class DGMultiStageTSS(TimeSteppingSolver):
     """Explicit time stepping solver with multistage solve_step method"""
     __metaclass__ = SolverMeta
@@ -33,6 +89,13 @@ class DGMultiStageTSS(TimeSteppingSolver):
             solver is invoked also for the initial time."""),
         ('limiters', 'dictionary', None, None,
          "Limiters for DGFields, keys: field name, values: limiter class"),
+        ('mass_inverse', 'bool', False, False,
+         """If True, the matrix of the equations, typically the DG mass
+            matrix, is assumed constant and block-diagonal with blocks
+            corresponding to cells. Its inverse is then computed once and
+            applied in all stages instead of the linear solver. The linear
+            solver is used if the matrix blocks are too large. Do not use
+            with time- or state-dependent matrices."""),
     ]
 
     def __init__(self, conf, nls=None, context=None, **kwargs):
@@ -65,6 +128,52 @@ class DGMultiStageTSS(TimeSteppingSolver):
         self.post_stage_hook = ComposedLimiter(*zip(*applied_limiters),
                                                verbose=self.verbose)
 
+        self.mtx = None
+        self.apply_inverse = None
+
+    def invalidate_caches(self):
+        """
+        Invalidate the evaluate caches of the current state. They correspond
+        to the last evaluated stage, and must not be moved to the state
+        history by `prestep_fun()` or `poststep_fun()`.
+        """
+        self.context.equations.variables.invalidate_evaluate_caches(step=0)
+
+    def solve_linear(self, nls, vec_r, vec_x, x0=None):
+        """
+        Solve the linear system with the matrix of the equations evaluated
+        in `vec_x` and the right-hand side `vec_r`.
+
+        Returns
+        -------
+        vec_dx : array
+            The solution.
+        mtx_a : scipy.sparse matrix
+            The matrix.
+        """
+        if self.conf.mass_inverse:
+            if self.mtx is None:
+                self.mtx = nls.fun_grad(vec_x).copy()
+                self.apply_inverse = get_block_diagonal_inverse(self.mtx)
+                if self.apply_inverse is None:
+                    output('matrix is not block-diagonal,'
+                           ' using linear solver', verbose=self.verbose)
+
+            if self.apply_inverse is not None:
+                return self.apply_inverse(vec_r), self.mtx
+
+        lin_solver = nls.lin_solver
+        ls_eps_a, ls_eps_r = lin_solver.get_tolerance()
+        eps_a = get_default(ls_eps_a, 1.0)
+        eps_r = get_default(ls_eps_r, 1.0)
+
+        mtx_a = nls.fun_grad(vec_x)
+        vec_dx = lin_solver(vec_r, x0=x0,
+                            eps_a=eps_a, eps_r=eps_r, mtx=mtx_a,
+                            status={})
+
+        return vec_dx, mtx_a
+
 
     def solve_step0(self, nls, vec0):
         res = nls.fun(vec0)
@@ -113,6 +222,7 @@ class DGMultiStageTSS(TimeSteppingSolver):
             vect = self.solve_step(ts, nls, vec, prestep_fun, poststep_fun,
                                    status)
 
+            self.invalidate_caches()
             poststep_fun(ts, vect)
 
             vec = vect
@@ -131,27 +241,15 @@ class EulerStepSolver(DGMultiStageTSS):
             raise ValueError("Provide TimeStepper to explicit Euler solver")
 
         fun = nls.fun
-        fun_grad = nls.fun_grad
-        lin_solver = nls.lin_solver
-
-        ls_eps_a, ls_eps_r = lin_solver.get_tolerance()
-        eps_a = get_default(ls_eps_a, 1.0)
-        eps_r = get_default(ls_eps_r, 1.0)
 
         vec_x = vec_x0.copy()
 
         vec_r = fun(vec_x)
+        vec_dx, mtx_a = self.solve_linear(nls, vec_r, vec_x, x0=vec_x)
 
-        mtx_a = fun_grad(vec_x)
-        ls_status = {}
-
-        vec_dx = lin_solver(vec_r, x0=vec_x,
-                            eps_a=eps_a, eps_r=eps_r, mtx=mtx_a,
-                            status=ls_status)
-
-        vec_e = mtx_a * vec_dx - vec_r
-        lerr = nla.norm(vec_e)
         if self.verbose:
+            vec_e = mtx_a * vec_dx - vec_r
+            lerr = nla.norm(vec_e)
             output(self.name + ' linear system sol error {}'.format(lerr))
             output(self.name + ' mtx max {}, min {}, trace {}'
                    .format(mtx_a.max(), mtx_a.min(), nm.sum(mtx_a.diagonal())))
@@ -193,22 +291,12 @@ class TVDRK3StepSolver(DGMultiStageTSS):
             raise ValueError("Provide TimeStepper to explicit Runge-Kutta solver")
 
         fun = nls.fun
-        fun_grad = nls.fun_grad
-        lin_solver = nls.lin_solver
-
-        ls_eps_a, ls_eps_r = lin_solver.get_tolerance()
-        eps_a = get_default(ls_eps_a, 1.0)
-        eps_r = get_default(ls_eps_r, 1.0)
-        ls_status = {}
 
         # ----1st stage----
         vec_x = vec_x0.copy()
 
         vec_r = fun(vec_x)
-        mtx_a = fun_grad(vec_x)
-        vec_dx = lin_solver(vec_r, x0=vec_x,
-                            eps_a=eps_a, eps_r=eps_r, mtx=mtx_a,
-                            status=ls_status)
+        vec_dx, mtx_a = self.solve_linear(nls, vec_r, vec_x, x0=vec_x)
 
         vec_x1 = vec_x - ts.dt * (vec_dx - vec_x)
 
@@ -221,10 +309,7 @@ class TVDRK3StepSolver(DGMultiStageTSS):
 
         # ----2nd stage----
         vec_r = fun(vec_x1)
-        mtx_a = fun_grad(vec_x1)
-        vec_dx = lin_solver(vec_r, x0=vec_x1,
-                            eps_a=eps_a, eps_r=eps_r, mtx=mtx_a,
-                            status=ls_status)
+        vec_dx, mtx_a = self.solve_linear(nls, vec_r, vec_x1, x0=vec_x1)
 
         vec_x2 = (3 * vec_x + vec_x1 - ts.dt * (vec_dx - vec_x1)) / 4
 
@@ -237,12 +322,10 @@ class TVDRK3StepSolver(DGMultiStageTSS):
 
         # ----3rd stage-----
         ts.set_substep_time(1. / 2. * ts.dt)
+        self.invalidate_caches()
         prestep_fun(ts, vec_x2)
         vec_r = fun(vec_x2)
-        mtx_a = fun_grad(vec_x2)
-        vec_dx = lin_solver(vec_r, x0=vec_x2,
-                            eps_a=eps_a, eps_r=eps_r, mtx=mtx_a,
-                            status=ls_status)
+        vec_dx, mtx_a = self.solve_linear(nls, vec_r, vec_x2, x0=vec_x2)
 
         vec_x3 = (vec_x + 2 * vec_x2 - 2 * ts.dt * (vec_dx - vec_x2)) / 3
 
@@ -283,13 +366,6 @@ class RK4StepSolver(DGMultiStageTSS):
             raise ValueError("Provide TimeStepper to explicit Runge-Kutta solver")
 
         fun = nls.fun
-        fun_grad = nls.fun_grad
-        lin_solver = nls.lin_solver
-
-        ls_eps_a, ls_eps_r = lin_solver.get_tolerance()
-        eps_a = get_default(ls_eps_a, 1.0)
-        eps_r = get_default(ls_eps_r, 1.0)
-        ls_status = {}
 
         dt = ts.dt
         vec_x = None
@@ -298,14 +374,11 @@ class RK4StepSolver(DGMultiStageTSS):
         for stage, stage_update in enumerate(self.stage_updates):
             stage_vec = stage_update(vec_x0, vec_x, dt)
             vec_r = fun(stage_vec)
-            mtx_a = fun_grad(stage_vec)
-            vec_dx = lin_solver(vec_r,  # x0=stage_vec,
-                                eps_a=eps_a, eps_r=eps_r, mtx=mtx_a,
-                                status=ls_status)
+            vec_dx, mtx_a = self.solve_linear(nls, vec_r, stage_vec)
 
-            vec_e = mtx_a * vec_dx - vec_r
-            lerr = nla.norm(vec_e)
             if self.verbose:
+                vec_e = mtx_a * vec_dx - vec_r
+                lerr = nla.norm(vec_e)
                 output(self.stage_format.format(stage, lerr))
 
             vec_x = - vec_dx - stage_vec
@@ -351,12 +351,35 @@ def _cache(obj, attr, dep):
         return new_fun
     return decorate
 
+def get_diagonal(mtx):
+    """
+    Return the diagonal of a sparse matrix `mtx`, if all its nonzero entries
+    are on the diagonal, or None.
+    """
+    mtx = mtx.tocsr()
+    rows = nm.repeat(nm.arange(mtx.shape[0]), nm.diff(mtx.indptr))
+    if nm.any(mtx.data[mtx.indices != rows]):
+        return None
+
+    return mtx.diagonal()
+
 class ElastodynamicsBaseTS(TimeSteppingSolver):
     """
     Base class for elastodynamics solvers.
 
-    Assumes block-diagonal matrix in `u`, `v`, `a`.
+    Assumes block-diagonal matrix in `u`, `v`, `a`. When used with
+    a :class:`Problem <sfepy.discrete.problem.Problem>` instance as the
+    context, the diagonal blocks are assembled separately, see
+    :func:`Problem.uses_block_matrices()
+    <sfepy.discrete.problem.Problem.uses_block_matrices()>`.
+
+    If the problem is linear and the matrix of a time step problem is
+    diagonal, for example with a lumped mass matrix (see the ``dw_mass`` term)
+    in an explicit scheme, the step is solved by a vector division instead of
+    the nonlinear solver.
     """
+    uses_block_matrices = True
+
     def __init__(self, conf, nls=None, context=None, **kwargs):
         TimeSteppingSolver.__init__(self, conf, nls=nls, context=context,
                                     **kwargs)
@@ -370,20 +393,34 @@ class ElastodynamicsBaseTS(TimeSteppingSolver):
         self.verbose = self.conf.verbose
         self.constant_matrices = None
         self.matrix = None
+        self.diagonals = {}
 
     def get_matrices(self, nls, vec):
         if self.conf.is_linear and self.constant_matrices is not None:
             out = self.constant_matrices
 
         else:
-            aux = nls.fun_grad(vec)
+            pb = self.context
+            if getattr(pb, 'mtx_blocks', None) is not None:
+                # The blocks are evaluated in place - copy them if they are
+                # kept.
+                mtxs = pb.get_evaluator(reuse=True).eval_tangent_blocks(vec)
+                names = pb.get_variables().ordered_state
+                assert_(len(names) == 3)
+
+                K, C, M = [mtxs[(name, name)] for name in names]
+                if self.conf.is_linear:
+                    M, C, K = M.copy(), C.copy(), K.copy()
+
+            else:
+                aux = nls.fun_grad(vec)
 
-            assert_((len(vec) % 3) == 0)
-            i3 = len(vec) // 3
+                assert_((len(vec) % 3) == 0)
+                i3 = len(vec) // 3
 
-            K = aux[:i3, :i3]
-            C = aux[i3:2*i3, i3:2*i3]
-            M = aux[2*i3:, 2*i3:]
+                K = aux[:i3, :i3]
+                C = aux[i3:2*i3, i3:2*i3]
+                M = aux[2*i3:, 2*i3:]
 
             out = (M, C, K)
 
@@ -403,7 +440,12 @@ class ElastodynamicsBaseTS(TimeSteppingSolver):
         r = aux[:i3] + aux[i3:2*i3] + aux[2*i3:]
 
         M = self.get_matrices(nls, vec)[0]
-        a0 = nls.lin_solver(-r, mtx=M)
+        diag = get_diagonal(M)
+        if diag is not None:
+            a0 = - r / diag
+
+        else:
+            a0 = nls.lin_solver(-r, mtx=M)
         output_array_stats(a0, 'initial acceleration', verbose=self.verbose)
         return a0
 
@@ -432,6 +474,25 @@ class ElastodynamicsBaseTS(TimeSteppingSolver):
 
         return vec, unpack, pack
 
+    def solve_nlst(self, nlst, vec0):
+        """
+        Solve the time step problem `nlst` with the initial guess `vec0`.
+
+        If the problem is linear and its (constant) matrix is diagonal, the
+        solution is obtained by a vector division.
+        """
+        if self.conf.is_linear:
+            mtx = nlst.fun_grad(vec0)
+            aux = self.diagonals.get(id(mtx))
+            if aux is None:
+                aux = self.diagonals[id(mtx)] = (mtx, get_diagonal(mtx))
+
+            diag = aux[1]
+            if diag is not None:
+                return vec0 - nlst.fun(vec0) / diag
+
+        return nlst(vec0)
+
     def _create_nlst_a(self, nls, dt, ufun, vfun, cc, ck, cache_name):
         nlst = nls.copy()
 
@@ -572,7 +633,7 @@ class VelocityVerletTS(ElastodynamicsBaseTS):
             ut, vt, at = unpack(vec)
 
             nlst = self.create_nlst(nls, dt, ut, vt, at)
-            atp = nlst(at)
+            atp = self.solve_nlst(nlst, at)
             vtp = nlst.v1(atp)
             utp = nlst.u1
 
@@ -657,7 +718,7 @@ class NewmarkTS(ElastodynamicsBaseTS):
             ut, vt, at = unpack(vec)
 
             nlst = self.create_nlst(nls, dt, conf.gamma, conf.beta, ut, vt, at)
-            atp = nlst(at)
+            atp = self.solve_nlst(nlst, at)
             vtp = nlst.v(atp)
             utp = nlst.u(atp)
 
@@ -787,7 +848,7 @@ class GeneralizedAlphaTS(ElastodynamicsBaseTS):
                                     ut, vt, at)
 
             ts.set_substep_time((1.0 - alpha_f) * dt)
-            am = nlst(at)
+            am = self.solve_nlst(nlst, at)
             ts.restore_step_time()
 
             atp = nlst.a1(am)
@@ -884,7 +945,7 @@ class BatheTS(ElastodynamicsBaseTS):
             prestep_fun(ts, vec)
             ut, vt, at = unpack(vec)
             nlst1 = self.create_nlst1(nls, dt, ut, vt, at)
-            ut1 = nlst1(ut)
+            ut1 = self.solve_nlst(nlst1, ut)
             vt1 = nlst1.v(ut1)
             at1 = nlst1.a(vt1)
 
@@ -894,7 +955,7 @@ class BatheTS(ElastodynamicsBaseTS):
             prestep_fun(ts, vec1)
 
             nlst2 = self.create_nlst2(nls, dt, ut, ut1, vt, vt1)
-            ut2 = nlst2(ut1)
+            ut2 = self.solve_nlst(nlst2, ut1)
             vt2 = nlst2.v(ut2)
             at2 = nlst2.a(vt2)
 
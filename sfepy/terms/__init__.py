@@ -4,10 +4,12 @@ from . import terms
 from . import extmods
 from .terms import Terms, Term
 from .terms_th import THTerm, ETHTerm
-from sfepy.base.base import load_classes
+from sfepy.base.base import LazyClassTable
+from ._term_index import term_index
 
 term_files = sfepy.get_paths('sfepy/terms/terms*.py')
-term_table = load_classes(term_files, [Term], ignore_errors=True)
+term_table = LazyClassTable(term_index, term_files, [Term],
+                            ignore_errors=True)
 
 del sfepy
 
@@ -0,0 +1,167 @@
+"""
+Generated by script/gen_lazy_index.py, do not edit.
+"""
+term_index = {
+    'd_of_ns_min_grad' : ('sfepy.terms.terms_adj_navier_stokes', 'NSOFMinGradTerm'),
+    'd_sum_vals' : ('sfepy.terms.terms_compat', 'DSumNodalValuesTerm'),
+    'd_surface' : ('sfepy.terms.terms_compat', 'SurfaceTerm'),
+    'd_surface_flux' : ('sfepy.terms.terms_compat', 'DSurfaceFluxTerm'),
+    'd_surface_moment' : ('sfepy.terms.terms_compat', 'DSurfaceMomentTerm'),
+    'd_volume' : ('sfepy.terms.terms_compat', 'VolumeXTerm'),
+    'd_volume_surface' : ('sfepy.terms.terms_compat', 'DVolumeSurfaceTerm'),
+    'de_cauchy_stress' : ('sfepy.terms.terms_multilinear', 'ECauchyStressTerm'),
+    'de_convect' : ('sfepy.terms.terms_multilinear', 'EConvectTerm'),
+    'de_diffusion' : ('sfepy.terms.terms_multilinear', 'EDiffusionTerm'),
+    'de_div' : ('sfepy.terms.terms_multilinear', 'EDivTerm'),
+    'de_div_grad' : ('sfepy.terms.terms_multilinear', 'EDivGradTerm'),
+    'de_dot' : ('sfepy.terms.terms_multilinear', 'EDotTerm'),
+    'de_grad' : ('sfepy.terms.terms_multilinear', 'EGradTerm'),
+    'de_integrate' : ('sfepy.terms.terms_multilinear', 'EIntegrateOperatorTerm'),
+    'de_laplace' : ('sfepy.terms.terms_multilinear', 'ELaplaceTerm'),
+    'de_lin_elastic' : ('sfepy.terms.terms_multilinear', 'ELinearElasticTerm'),
+    'de_non_penetration_p' : ('sfepy.terms.terms_multilinear', 'ENonPenetrationPenaltyTerm'),
+    'de_nonsym_elastic' : ('sfepy.terms.terms_multilinear', 'ENonSymElasticTerm'),
+    'de_s_dot_mgrad_s' : ('sfepy.terms.terms_multilinear', 'EScalarDotMGradScalarTerm'),
+    'de_sd_diffusion' : ('sfepy.terms.terms_sensitivity', 'ESDDiffusionTerm'),
+    'de_sd_div_grad' : ('sfepy.terms.terms_sensitivity', 'ESDDivGradTerm'),
+    'de_sd_dot' : ('sfepy.terms.terms_sensitivity', 'ESDDotTerm'),
+    'de_sd_lin_elastic' : ('sfepy.terms.terms_sensitivity', 'ESDLinearElasticTerm'),
+    'de_sd_piezo_coupling' : ('sfepy.terms.terms_sensitivity', 'ESDPiezoCouplingTerm'),
+    'de_sd_stokes' : ('sfepy.terms.terms_sensitivity', 'ESDStokesTerm'),
+    'de_sd_surface_ltr' : ('sfepy.terms.terms_sensitivity', 'ESDLinearTractionTerm'),
+    'de_stokes' : ('sfepy.terms.terms_multilinear', 'EStokesTerm'),
+    'de_surface_ltr' : ('sfepy.terms.terms_multilinear', 'ELinearTractionTerm'),
+    'dw_adj_convect1' : ('sfepy.terms.terms_adj_navier_stokes', 'AdjConvect1Term'),
+    'dw_adj_convect2' : ('sfepy.terms.terms_adj_navier_stokes', 'AdjConvect2Term'),
+    'dw_adj_div_grad' : ('sfepy.terms.terms_adj_navier_stokes', 'AdjDivGradTerm'),
+    'dw_advect_div_free' : ('sfepy.terms.terms_diffusion', 'AdvectDivFreeTerm'),
+    'dw_bc_newton' : ('sfepy.terms.terms_dot', 'BCNewtonTerm'),
+    'dw_biot' : ('sfepy.terms.terms_biot', 'BiotTerm'),
+    'dw_biot_eth' : ('sfepy.terms.terms_biot', 'BiotETHTerm'),
+    'dw_biot_th' : ('sfepy.terms.terms_biot', 'BiotTHTerm'),
+    'dw_contact' : ('sfepy.terms.terms_contact', 'ContactTerm'),
+    'dw_contact_plane' : ('sfepy.terms.terms_surface', 'ContactPlaneTerm'),
+    'dw_contact_sphere' : ('sfepy.terms.terms_surface', 'ContactSphereTerm'),
+    'dw_convect' : ('sfepy.terms.terms_navier_stokes', 'ConvectTerm'),
+    'dw_convect_v_grad_s' : ('sfepy.terms.terms_diffusion', 'ConvectVGradSTerm'),
+    'dw_dg_advect_laxfrie_flux' : ('sfepy.terms.terms_dg', 'AdvectionDGFluxTerm'),
+    'dw_dg_diffusion_flux' : ('sfepy.terms.terms_dg', 'DiffusionDGFluxTerm'),
+    'dw_dg_interior_penalty' : ('sfepy.terms.terms_dg', 'DiffusionInteriorPenaltyTerm'),
+    'dw_dg_nonlinear_laxfrie_flux' : ('sfepy.terms.terms_dg', 'NonlinearHyperbolicDGFluxTerm'),
+    'dw_diffusion' : ('sfepy.terms.terms_diffusion', 'DiffusionTerm'),
+    'dw_diffusion_coupling' : ('sfepy.terms.terms_diffusion', 'DiffusionCoupling'),
+    'dw_diffusion_r' : ('sfepy.terms.terms_diffusion', 'DiffusionRTerm'),
+    'dw_div' : ('sfepy.terms.terms_navier_stokes', 'DivOperatorTerm'),
+    'dw_div_grad' : ('sfepy.terms.terms_navier_stokes', 'DivGradTerm'),
+    'dw_dot' : ('sfepy.terms.terms_dot', 'DotProductTerm'),
+    'dw_elastic_wave' : ('sfepy.terms.terms_elastic', 'ElasticWaveTerm'),
+    'dw_elastic_wave_cauchy' : ('sfepy.terms.terms_elastic', 'ElasticWaveCauchyTerm'),
+    'dw_electric_source' : ('sfepy.terms.terms_electric', 'ElectricSourceTerm'),
+    'dw_integrate' : ('sfepy.terms.terms_basic', 'IntegrateOperatorTerm'),
+    'dw_jump' : ('sfepy.terms.terms_surface', 'SurfaceJumpTerm'),
+    'dw_laplace' : ('sfepy.terms.terms_diffusion', 'LaplaceTerm'),
+    'dw_lin_convect' : ('sfepy.terms.terms_navier_stokes', 'LinearConvectTerm'),
+    'dw_lin_convect2' : ('sfepy.terms.terms_navier_stokes', 'LinearConvect2Term'),
+    'dw_lin_elastic' : ('sfepy.terms.terms_elastic', 'LinearElasticTerm'),
+    'dw_lin_elastic_eth' : ('sfepy.terms.terms_elastic', 'LinearElasticETHTerm'),
+    'dw_lin_elastic_iso' : ('sfepy.terms.terms_elastic', 'LinearElasticIsotropicTerm'),
+    'dw_lin_elastic_th' : ('sfepy.terms.terms_elastic', 'LinearElasticTHTerm'),
+    'dw_lin_prestress' : ('sfepy.terms.terms_elastic', 'LinearPrestressTerm'),
+    'dw_lin_strain_fib' : ('sfepy.terms.terms_elastic', 'LinearStrainFiberTerm'),
+    'dw_mass' : ('sfepy.terms.terms_mass', 'MassTerm'),
+    'dw_non_penetration' : ('sfepy.terms.terms_constraints', 'NonPenetrationTerm'),
+    'dw_non_penetration_p' : ('sfepy.terms.terms_constraints', 'NonPenetrationPenaltyTerm'),
+    'dw_nonsym_elastic' : ('sfepy.terms.terms_elastic', 'NonsymElasticTerm'),
+    'dw_ns_dot_grad_s' : ('sfepy.terms.terms_dg', 'NonlinearScalarDotGradTerm'),
+    'dw_of_ns_surf_min_d_press_diff' : ('sfepy.terms.terms_adj_navier_stokes', 'NSOFSurfMinDPressDiffTerm'),
+    'dw_piezo_coupling' : ('sfepy.terms.terms_piezo', 'PiezoCouplingTerm'),
+    'dw_point_load' : ('sfepy.terms.terms_point', 'ConcentratedPointLoadTerm'),
+    'dw_point_lspring' : ('sfepy.terms.terms_point', 'LinearPointSpringTerm'),
+    'dw_s_dot_grad_i_s' : ('sfepy.terms.terms_dot', 'ScalarDotGradIScalarTerm'),
+    'dw_s_dot_mgrad_s' : ('sfepy.terms.terms_dot', 'ScalarDotMGradScalarTerm'),
+    'dw_shell10x' : ('sfepy.terms.terms_shells', 'Shell10XTerm'),
+    'dw_st_adj1_supg_p' : ('sfepy.terms.terms_adj_navier_stokes', 'SUPGPAdj1StabilizationTerm'),
+    'dw_st_adj2_supg_p' : ('sfepy.terms.terms_adj_navier_stokes', 'SUPGPAdj2StabilizationTerm'),
+    'dw_st_adj_supg_c' : ('sfepy.terms.terms_adj_navier_stokes', 'SUPGCAdjStabilizationTerm'),
+    'dw_st_grad_div' : ('sfepy.terms.terms_navier_stokes', 'GradDivStabilizationTerm'),
+    'dw_st_pspg_c' : ('sfepy.terms.terms_navier_stokes', 'PSPGCStabilizationTerm'),
+    'dw_st_pspg_p' : ('sfepy.terms.terms_navier_stokes', 'PSPGPStabilizationTerm'),
+    'dw_st_supg_c' : ('sfepy.terms.terms_navier_stokes', 'SUPGCStabilizationTerm'),
+    'dw_st_supg_p' : ('sfepy.terms.terms_navier_stokes', 'SUPGPStabilizationTerm'),
+    'dw_stokes' : ('sfepy.terms.terms_navier_stokes', 'StokesTerm'),
+    'dw_stokes_wave' : ('sfepy.terms.terms_navier_stokes', 'StokesWaveTerm'),
+    'dw_stokes_wave_div' : ('sfepy.terms.terms_navier_stokes', 'StokesWaveDivTerm'),
+    'dw_surface_dot' : ('sfepy.terms.terms_compat', 'DotSurfaceProductTerm'),
+    'dw_surface_flux' : ('sfepy.terms.terms_diffusion', 'SurfaceFluxOperatorTerm'),
+    'dw_surface_integrate' : ('sfepy.terms.terms_compat', 'IntegrateSurfaceOperatorTerm'),
+    'dw_surface_ltr' : ('sfepy.terms.terms_surface', 'LinearTractionTerm'),
+    'dw_surface_ndot' : ('sfepy.terms.terms_surface', 'SufaceNormalDotTerm'),
+    'dw_tl_bulk_active' : ('sfepy.terms.terms_hyperelastic_tl', 'BulkActiveTLTerm'),
+    'dw_tl_bulk_penalty' : ('sfepy.terms.terms_hyperelastic_tl', 'BulkPenaltyTLTerm'),
+    'dw_tl_bulk_pressure' : ('sfepy.terms.terms_hyperelastic_tl', 'BulkPressureTLTerm'),
+    'dw_tl_diffusion' : ('sfepy.terms.terms_hyperelastic_tl', 'DiffusionTLTerm'),
+    'dw_tl_fib_a' : ('sfepy.terms.terms_fibres', 'FibresActiveTLTerm'),
+    'dw_tl_he_genyeoh' : ('sfepy.terms.terms_hyperelastic_tl', 'GenYeohTLTerm'),
+    'dw_tl_he_mooney_rivlin' : ('sfepy.terms.terms_hyperelastic_tl', 'MooneyRivlinTLTerm'),
+    'dw_tl_he_neohook' : ('sfepy.terms.terms_hyperelastic_tl', 'NeoHookeanTLTerm'),
+    'dw_tl_he_ogden' : ('sfepy.terms.terms_hyperelastic_tl', 'OgdenTLTerm'),
+    'dw_tl_membrane' : ('sfepy.terms.terms_membrane', 'TLMembraneTerm'),
+    'dw_tl_surface_traction' : ('sfepy.terms.terms_hyperelastic_tl', 'SurfaceTractionTLTerm'),
+    'dw_tl_volume' : ('sfepy.terms.terms_hyperelastic_tl', 'VolumeTLTerm'),
+    'dw_ul_bulk_penalty' : ('sfepy.terms.terms_hyperelastic_ul', 'BulkPenaltyULTerm'),
+    'dw_ul_bulk_pressure' : ('sfepy.terms.terms_hyperelastic_ul', 'BulkPressureULTerm'),
+    'dw_ul_compressible' : ('sfepy.terms.terms_hyperelastic_ul', 'CompressibilityULTerm'),
+    'dw_ul_he_mooney_rivlin' : ('sfepy.terms.terms_hyperelastic_ul', 'MooneyRivlinULTerm'),
+    'dw_ul_he_neohook' : ('sfepy.terms.terms_hyperelastic_ul', 'NeoHookeanULTerm'),
+    'dw_ul_volume' : ('sfepy.terms.terms_hyperelastic_ul', 'VolumeULTerm'),
+    'dw_v_dot_grad_s' : ('sfepy.terms.terms_dot', 'VectorDotGradScalarTerm'),
+    'dw_vm_dot_s' : ('sfepy.terms.terms_dot', 'VectorDotScalarTerm'),
+    'dw_volume_dot' : ('sfepy.terms.terms_compat', 'DotVolumeProductTerm'),
+    'dw_volume_dot_w_scalar_eth' : ('sfepy.terms.terms_dot', 'DotSProductVolumeOperatorWETHTerm'),
+    'dw_volume_dot_w_scalar_th' : ('sfepy.terms.terms_dot', 'DotSProductVolumeOperatorWTHTerm'),
+    'dw_volume_integrate' : ('sfepy.terms.terms_compat', 'IntegrateVolumeOperatorTerm'),
+    'dw_volume_lvf' : ('sfepy.terms.terms_volume', 'LinearVolumeForceTerm'),
+    'dw_zero' : ('sfepy.terms.terms_basic', 'ZeroTerm'),
+    'ev_biot_stress' : ('sfepy.terms.terms_biot', 'BiotStressTerm'),
+    'ev_cauchy_strain' : ('sfepy.terms.terms_elastic', 'CauchyStrainTerm'),
+    'ev_cauchy_strain_s' : ('sfepy.terms.terms_compat', 'CauchyStrainSTerm'),
+    'ev_cauchy_stress' : ('sfepy.terms.terms_elastic', 'CauchyStressTerm'),
+    'ev_cauchy_stress_eth' : ('sfepy.terms.terms_elastic', 'CauchyStressETHTerm'),
+    'ev_cauchy_stress_th' : ('sfepy.terms.terms_elastic', 'CauchyStressTHTerm'),
+    'ev_def_grad' : ('sfepy.terms.terms_hyperelastic_base', 'DeformationGradientTerm'),
+    'ev_diffusion_velocity' : ('sfepy.terms.terms_diffusion', 'DiffusionVelocityTerm'),
+    'ev_div' : ('sfepy.terms.terms_navier_stokes', 'DivTerm'),
+    'ev_grad' : ('sfepy.terms.terms_navier_stokes', 'GradTerm'),
+    'ev_integrate' : ('sfepy.terms.terms_basic', 'IntegrateTerm'),
+    'ev_integrate_mat' : ('sfepy.terms.terms_basic', 'IntegrateMatTerm'),
+    'ev_of_ns_surf_min_d_press' : ('sfepy.terms.terms_adj_navier_stokes', 'NSOFSurfMinDPressTerm'),
+    'ev_piezo_strain' : ('sfepy.terms.terms_piezo', 'PiezoStrainTerm'),
+    'ev_piezo_stress' : ('sfepy.terms.terms_piezo', 'PiezoStressTerm'),
+    'ev_sd_convect' : ('sfepy.terms.terms_adj_navier_stokes', 'SDConvectTerm'),
+    'ev_sd_diffusion' : ('sfepy.terms.terms_diffusion', 'SDDiffusionTerm'),
+    'ev_sd_div' : ('sfepy.terms.terms_adj_navier_stokes', 'SDDivTerm'),
+    'ev_sd_div_grad' : ('sfepy.terms.terms_adj_navier_stokes', 'SDDivGradTerm'),
+    'ev_sd_dot' : ('sfepy.terms.terms_adj_navier_stokes', 'SDDotTerm'),
+    'ev_sd_lin_elastic' : ('sfepy.terms.terms_elastic', 'SDLinearElasticTerm'),
+    'ev_sd_piezo_coupling' : ('sfepy.terms.terms_piezo', 'SDPiezoCouplingTerm'),
+    'ev_sd_st_grad_div' : ('sfepy.terms.terms_adj_navier_stokes', 'SDGradDivStabilizationTerm'),
+    'ev_sd_st_pspg_c' : ('sfepy.terms.terms_adj_navier_stokes', 'SDPSPGCStabilizationTerm'),
+    'ev_sd_st_pspg_p' : ('sfepy.terms.terms_adj_navier_stokes', 'SDPSPGPStabilizationTerm'),
+    'ev_sd_st_supg_c' : ('sfepy.terms.terms_adj_navier_stokes', 'SDSUPGCStabilizationTerm'),
+    'ev_sd_surface_integrate' : ('sfepy.terms.terms_surface', 'SDSufaceIntegrateTerm'),
+    'ev_sd_surface_ltr' : ('sfepy.terms.terms_surface', 'SDLinearTractionTerm'),
+    'ev_sd_volume_dot' : ('sfepy.terms.terms_compat', 'SDVolumeDotTerm'),
+    'ev_sum_vals' : ('sfepy.terms.terms_basic', 'SumNodalValuesTerm'),
+    'ev_surface_div' : ('sfepy.terms.terms_compat', 'SurfaceDivTerm'),
+    'ev_surface_flux' : ('sfepy.terms.terms_diffusion', 'SurfaceFluxTerm'),
+    'ev_surface_grad' : ('sfepy.terms.terms_compat', 'SurfaceGradTerm'),
+    'ev_surface_integrate' : ('sfepy.terms.terms_compat', 'IntegrateSurfaceTerm'),
+    'ev_surface_integrate_mat' : ('sfepy.terms.terms_compat', 'IntegrateSurfaceMatTerm'),
+    'ev_surface_moment' : ('sfepy.terms.terms_basic', 'SurfaceMomentTerm'),
+    'ev_tl_surface_flux' : ('sfepy.terms.terms_hyperelastic_tl', 'SurfaceFluxTLTerm'),
+    'ev_tl_volume_surface' : ('sfepy.terms.terms_hyperelastic_tl', 'VolumeSurfaceTLTerm'),
+    'ev_volume' : ('sfepy.terms.terms_basic', 'VolumeTerm'),
+    'ev_volume_integrate' : ('sfepy.terms.terms_compat', 'IntegrateVolumeTerm'),
+    'ev_volume_integrate_mat' : ('sfepy.terms.terms_compat', 'IntegrateVolumeMatTerm'),
+    'ev_volume_surface' : ('sfepy.terms.terms_basic', 'VolumeSurfaceTerm'),
+}
@@ -335,10 +335,10 @@ class Term(Struct):
         else:
             raise ValueError('bad term syntax! (%s)' % name)
 
-        if name in term_table:
+        try:
             constructor = term_table[name]
 
-        else:
+        except KeyError:
             msg = "term '%s' is not in %s" % (name, sorted(term_table.keys()))
             raise ValueError(msg)
 
@@ -360,8 +360,15 @@ class Term(Struct):
 
     @staticmethod
     def tile_mat(mat, nel):
+        """
+        Return the material data `mat` constant in cells repeated for `nel`
+        cells. The data are not copied - the result is a read-only view with
+        zero stride in the first axis. Use `nm.ascontiguousarray()` on it
+        before passing it to C functions that do not support constant data
+        (`nCell == 1`) directly.
+        """
         if mat.shape[0] == 1 and nel > 1:
-            return nm.tile(mat, (nel,) + (mat.ndim - 1) * (1,))
+            return nm.broadcast_to(mat, (nel,) + mat.shape[1:])
         else:
             return mat
 
@@ -1116,6 +1123,48 @@ class Term(Struct):
         out = variable.get_data_shape(self.integral, integration, region.name)
         return out
 
+    def get_sum_factorization(self, virtual, state):
+        """
+        Get the data for the sum-factorized evaluation of the term residual,
+        see :func:`VolumeField.get_sum_factorization()
+        <sfepy.discrete.fem.fields_base.VolumeField.get_sum_factorization()>`,
+        and the cell DOFs of `state`.
+
+        The sum factorization is used only if enabled by the
+        'sum_factorization' global option, the virtual and state variables
+        share a real volume field, and the field and the term integral support
+        it.
+
+        Returns
+        -------
+        sfd : Struct instance or None
+            The sum factorization data or None.
+        dofs : array or None
+            The cell DOFs with the shape `(n_cell, n_component, n_ep)` or
+            None.
+        """
+        name = state.name
+        if (not goptions['sum_factorization']
+            or (virtual.field is not state.field)
+            or (self.geometry_types[name] != 'volume')
+            or self.arg_traces[name]
+            or (state.dtype != nm.float64)):
+            return None, None
+
+        get_sfd = getattr(state.field, 'get_sum_factorization', None)
+        sfd = get_sfd(self.region, self.integral) if get_sfd else None
+        if sfd is None:
+            return None, None
+
+        vec = state(step=self.arg_steps[name],
+                    derivative=self.arg_derivatives[name])
+        vec = vec.reshape((-1, state.n_components))
+        conn = state.field.get_econn(self.get_dof_conn_type(), self.region)
+        # axis 0: cells, axis 1: component, axis 2: node
+        dofs = vec[conn].transpose((0, 2, 1))
+
+        return sfd, dofs
+
     def get(self, variable, quantity_name, bf=None, integration=None,
             step=None, time_derivative=None):
         """
@@ -1513,6 +1562,73 @@ class Term(Struct):
 
         return out
 
+    def get_assembling_map(self, diff_name, tmd, iels, rdc, cdc):
+        """
+        Get the map of the cell matrix entries to positions in the data array
+        of the CSR matrix given by `tmd` = (data, indptr, indices).
+
+        The map is created on the first call and cached for later calls with
+        the same matrix graph, assembling cells and DOF connectivities, so
+        that the subsequent matrix assembling is a direct scatter-add without
+        searching the CSR rows.
+        """
+        import sfepy.discrete.common.extmods.assemble as asm
+
+        cache = self.__dict__.setdefault('_assembling_maps', {})
+
+        item = cache.get(diff_name)
+        if item is not None:
+            indptr, indices, _iels, _rdc, _cdc, imap = item
+            if ((indptr is tmd[1]) and (indices is tmd[2])
+                and (_rdc is rdc) and (_cdc is cdc)
+                and ((_iels is iels) or nm.array_equal(_iels, iels))):
+                return imap
+
+        imap = asm.create_assembling_map(tmd[1], tmd[2], iels, rdc, cdc)
+        cache[diff_name] = (tmd[1], tmd[2], iels, rdc, cdc, imap)
+
+        return imap
+
+    def get_assembling_coloring(self, key, iels, dc, n_dof):
+        """
+        Get the coloring of the assembling cells `iels` w.r.t. the DOF
+        connectivity `dc` for the parallel assembling.
+
+        The coloring is cached for later calls with the same assembling cells
+        and DOF connectivity.
+        """
+        import sfepy.discrete.common.extmods.assemble as asm
+
+        cache = self.__dict__.setdefault('_assembling_colorings', {})
+
+        item = cache.get(key)
+        if item is not None:
+            _iels, _dc, coloring = item
+            if ((_dc is dc)
+                and ((_iels is iels) or nm.array_equal(_iels, iels))):
+                return coloring
+
+        coloring = asm.create_cell_coloring(iels, dc, n_dof)
+        cache[key] = (iels, dc, coloring)
+
+        return coloring
+
+    def get_assembling_sign(self, svar):
+        """
+        Get the factor applied to the element matrices w.r.t. the state
+        variable `svar` in assembling: 1/dt, if the term uses the time
+        derivative of `svar`, 1 otherwise.
+        """
+        sign = 1.0
+        if self.arg_derivatives[svar.name]:
+            if not self.is_quasistatic or (self.step > 0):
+                sign *= 1.0 / self.dt
+
+            else:
+                sign = 0.0
+
+        return sign
+
     def assemble_to(self, asm_obj, val, iels, mode='vector', diff_var=None):
         """
         Assemble the results of term evaluation.
@@ -1534,6 +1650,9 @@ class Term(Struct):
 
         extra = None
 
+        num_threads = goptions['assemble_num_threads']
+        is_parallel = (num_threads > 1) and (asm_obj.dtype == nm.float64)
+
         if mode == 'vector':
             if asm_obj.dtype == nm.float64:
                 assemble = asm.assemble_vector
@@ -1549,7 +1668,16 @@ class Term(Struct):
                 dc = vvar.get_dof_conn(dc_type)
                 assert_(val.shape[2] == dc.shape[1])
 
-                assemble(asm_obj, val, iels, 1.0, dc)
+                if is_parallel:
+                    color_ptr, cells = self.get_assembling_coloring(
+                        'vector', iels, dc, asm_obj.shape[0]
+                    )
+                    asm.assemble_vector_colored(asm_obj, val, iels, 1.0, dc,
+                                                color_ptr, cells,
+                                                num_threads)
+
+                else:
+                    assemble(asm_obj, val, iels, 1.0, dc)
 
             else:
                 vals, rows, var = val
@@ -1578,13 +1706,7 @@ class Term(Struct):
                 and (val.dtype == nm.float64)):
                 val = val.astype(nm.complex128)
 
-            sign = 1.0
-            if self.arg_derivatives[svar.name]:
-                if not self.is_quasistatic or (self.step > 0):
-                    sign *= 1.0 / self.dt
-
-                else:
-                    sign = 0.0
+            sign = self.get_assembling_sign(svar)
 
             if not isinstance(val, tuple):
                 rdc = vvar.get_dof_conn(dc_type)
@@ -1594,7 +1716,33 @@ class Term(Struct):
                 cdc = svar.get_dof_conn(dc_type, is_trace, trace_region)
                 assert_(val.shape[2:] == (rdc.shape[1], cdc.shape[1]))
 
-                assemble(tmd[0], tmd[1], tmd[2], val, iels, sign, rdc, cdc)
+                if is_parallel:
+                    color_ptr, cells = self.get_assembling_coloring(
+                        'matrix', iels, rdc, asm_obj.shape[0]
+                    )
+
+                if goptions['assemble_by_maps']:
+                    imap = self.get_assembling_map(svar.name, tmd, iels,
+                                                   rdc, cdc)
+                    if is_parallel:
+                        asm.assemble_matrix_by_map_colored(tmd[0], val, imap,
+                                                           sign, color_ptr,
+                                                           cells, num_threads)
+
+                    elif asm_obj.dtype == nm.float64:
+                        asm.assemble_matrix_by_map(tmd[0], val, imap, sign)
+
+                    else:
+                        asm.assemble_matrix_complex_by_map(tmd[0], val, imap,
+                                                           sign)
+
+                elif is_parallel:
+                    asm.assemble_matrix_colored(tmd[0], tmd[1], tmd[2], val,
+                                                iels, sign, rdc, cdc,
+                                                color_ptr, cells, num_threads)
+
+                else:
+                    assemble(tmd[0], tmd[1], tmd[2], val, iels, sign, rdc, cdc)
 
             else:
                 from scipy.sparse import coo_matrix
@@ -225,13 +225,13 @@ class BiotTHTerm(BiotTerm, THTerm):
                 def iter_kernel():
                     for ii, mat in enumerate(mats):
                         val_qp = self.get(qp_var, qp_name, step=-ii)
-                        mat = nm.tile(mat, (n_el, n_qp, 1, 1))
+                        mat = nm.tile(mat, (1, n_qp, 1, 1))
                         yield ii, (ts.dt, val_qp, mat, svg, vvg, 0)
                 fargs = iter_kernel
 
             else:
                 val_qp = nm.array([0], ndmin=4, dtype=nm.float64)
-                mat = nm.tile(mats[0], (n_el, n_qp, 1, 1))
+                mat = nm.tile(mats[0], (1, n_qp, 1, 1))
                 fargs = ts.dt, val_qp, mat, svg, vvg, 1
 
             return fargs
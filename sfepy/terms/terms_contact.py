@@ -48,13 +48,32 @@ class ContactInfo(Struct):
                         nsn=nsn, npd=region.tdim - 1,
                         elementID=elementID, segmentID=segmentID,
                         IEN=state.field.econn, ISN=ISN,
-                        gw=bqp.weights, H=H, dH=dH, GPs=GPs)
-
-    def update(self, xx):
-        longestEdge, GPs = cc.get_longest_edge_and_gps(
-            self.GPs, self.neq, self.elementID, self.segmentID,
-            self.ISN, self.IEN, self.H, xx)
-
+                        gw=bqp.weights, H=H, dH=dH, GPs=GPs,
+                        vals=None, rows=None, cols=None,
+                        search=None, search_tol=0.1)
+
+    def get_buffers(self, num):
+        """
+        Get the buffers for `num` contact stiffness matrix entries. The
+        buffers are reused between calls and grow as needed.
+        """
+        if (self.vals is None) or (len(self.vals) < num):
+            # Allocate some extra space for a growing contact zone.
+            size = num if self.vals is None else max(num,
+                                                     int(1.5 * len(self.vals)))
+            size = max(size, 1)
+            self.vals = nm.empty(size, dtype=nm.float64)
+            self.rows = nm.empty(size, dtype=nm.int32)
+            self.cols = nm.empty(size, dtype=nm.int32)
+
+        return self.vals, self.rows, self.cols
+
+    def init_search(self, xx, longestEdge, GPs):
+        """
+        Initialize the global contact search: the axis-aligned bounding box of
+        the contact surface and the linked lists of Gauss points in the cells
+        of a uniform grid covering the box.
+        """
         AABBmin, AABBmax = cc.get_AABB(xx, longestEdge, self.IEN, self.ISN,
                                        self.elementID, self.segmentID, self.neq)
 
@@ -64,9 +83,42 @@ class ContactInfo(Struct):
 
         head, next = cc.init_global_search(N, AABBmin, AABBmax,
                                            GPs[:,:self.nsd])
+
+        self.search = Struct(xx=xx.copy(), longestEdge=longestEdge,
+                             AABBmin=AABBmin, AABBmax=AABBmax, N=N,
+                             head=head, next=next)
+
+    def is_search_valid(self, xx):
+        """
+        Check whether the search data can be reused for the current
+        coordinates `xx`. This is true if no node moved by more than
+        `search_tol` times the longest edge since the last search, as the
+        Gauss points then stay within the search distance of their grid
+        cells.
+        """
+        if self.search is None:
+            return False
+
+        search = self.search
+        if xx.shape != search.xx.shape:
+            return False
+
+        du = nm.abs(xx - search.xx).max() if xx.size else 0.0
+        return du <= self.search_tol * search.longestEdge
+
+    def update(self, xx):
+        longestEdge, GPs = cc.get_longest_edge_and_gps(
+            self.GPs, self.neq, self.elementID, self.segmentID,
+            self.ISN, self.IEN, self.H, xx)
+
+        if not self.is_search_valid(xx):
+            self.init_search(xx, longestEdge, GPs)
+
+        search = self.search
         GPs = cc.evaluate_contact_constraints(
-            GPs, self.ISN, self.IEN, N, AABBmin, AABBmax, head, next, xx,
-            self.elementID, self.segmentID, self.npd, self.neq, longestEdge)
+            GPs, self.ISN, self.IEN, search.N, search.AABBmin, search.AABBmax,
+            search.head, search.next, xx, self.elementID, self.segmentID,
+            self.npd, self.neq, search.longestEdge)
 
         return GPs
 
@@ -181,14 +233,14 @@ class ContactTerm(Term):
                 keyAssembleKc = 0
 
             else:
-                max_num = 4 * (ci.nsd * ci.nsn)**2 * ci.ngp * GPs.shape[0]
+                # Only the potentially active Gauss points contribute, each
+                # by at most 4 (nsd * nsn)^2 entries.
+                n_active = nm.count_nonzero(activeGPs)
+                max_num = 4 * (ci.nsd * ci.nsn)**2 * n_active
                 keyContactDetection = self.detect
                 keyAssembleKc = 1
 
-            # print 'max_num:', max_num
-            vals = nm.empty(max_num, dtype=nm.float64)
-            rows = nm.empty(max_num, dtype=nm.int32)
-            cols = nm.empty(max_num, dtype=nm.int32)
+            vals, rows, cols = ci.get_buffers(max_num)
 
             aux = cc.assemble_contact_residual_and_stiffness(
                 Gc, vals, rows, cols, ci.GPs, ci.ISN, ci.IEN, X, Um,
@@ -82,18 +82,7 @@ class DGTerm(Term):
             corresponding neighbour indicies
 
         """
-        inner_iels = field.bubble_dofs
-        inner_iels = nm.stack((nm.repeat(inner_iels, field.n_el_nod),
-                               nm.tile(inner_iels, field.n_el_nod).flatten()),
-                              axis=-1)
-
-        outer_iels = nm.stack(
-            (nm.repeat(field.bubble_dofs[cells], field.n_el_nod),
-             nm.tile(field.bubble_dofs[nrbhs], field.n_el_nod).flatten()),
-             axis=-1)
-
-        iels = nm.vstack((inner_iels, outer_iels))
-        return iels
+        return field.get_facet_dof_indices(cells, nrbhs)
 
 
 class AdvectionDGFluxTerm(DGTerm):
@@ -171,31 +160,20 @@ class AdvectionDGFluxTerm(DGTerm):
         return fargs
 
     def function(self, out, state, diff_var, field, region, advelo):
+        fc_n = field.get_cell_normals_per_facet(region)
+        # normal velocity and maximal wave speeds at facets
+        fc_an = nm.einsum("ifk,ik->if", fc_n, advelo)
+        C = nm.abs(fc_an)
+        # n . n C (1 - alpha)
+        upwind = (1 - self.alpha) * C * nm.einsum("ifk,ifk->if", fc_n, fc_n)
 
         if diff_var is not None:
+            pairs = field.get_facet_pairs(region, state.eq_map)
+            in_fc_b, out_fc_b, whs = field.get_both_facet_base_vals(state,
+                                                                    region)
 
-            fc_n = field.get_cell_normals_per_facet(region)
-            C = nm.abs(nm.einsum("ifk,ik->if", fc_n, advelo))
-
-            nbrhd_idx = field.get_facet_neighbor_idx(region, state.eq_map)
-            active_cells, active_facets = nm.where(nbrhd_idx[:, :, 0] >= 0)
-            active_nrbhs = nbrhd_idx[active_cells, active_facets, 0]
-
-            in_fc_b, out_fc_b, whs = field.get_both_facet_base_vals(state, region)
-
-            # TODO broadcast advelo to facets
-            #  - maybe somehow get values of advelo at them?
-            # compute values
-            inner_diff = nm.einsum("nfk, nfk->nf",
-                                   fc_n,
-                                   advelo[:, None, :]
-                                   + nm.einsum("nfk, nf->nfk",
-                                               (1 - self.alpha) * fc_n, C)) / 2.
-            outer_diff = nm.einsum("nfk, nfk->nf",
-                                   fc_n,
-                                   advelo[:, None, :]
-                                   - nm.einsum("nfk, nf->nfk",
-                                               (1 - self.alpha) * fc_n, C)) / 2.
+            inner_diff = (fc_an + upwind) / 2.
+            outer_diff = ((fc_an - upwind) / 2.)[pairs.cells, pairs.facets]
 
             inner_vals = nm.einsum("nf, ndfq, nbfq, nfq -> ndb",
                                    inner_diff,
@@ -203,23 +181,16 @@ class AdvectionDGFluxTerm(DGTerm):
                                    in_fc_b,
                                    whs)
             outer_vals = nm.einsum("i, idq, ibq, iq -> idb",
-                                   outer_diff[active_cells, active_facets],
-                                   in_fc_b[active_cells, :, active_facets],
-                                   out_fc_b[active_cells, :, active_facets],
-                                   whs[active_cells, active_facets])
+                                   outer_diff,
+                                   in_fc_b[pairs.cells, :, pairs.facets],
+                                   out_fc_b[pairs.cells, :, pairs.facets],
+                                   pairs.whs)
 
             vals = nm.vstack((inner_vals, outer_vals))
             vals = vals.flatten()
 
-            # compute positions within matrix
-            iels = self._get_nbrhd_dof_indexes(active_cells, active_nrbhs, field)
-
-            out = (vals, iels[:, 0], iels[:, 1], state, state)
+            out = (vals, pairs.iels[:, 0], pairs.iels[:, 1], state, state)
         else:
-            fc_n = field.get_cell_normals_per_facet(region)
-            # get maximal wave speeds at facets
-            C = nm.abs(nm.einsum("ifk,ik->if", fc_n, advelo))
-
             facet_base_vals = field.get_facet_base(base_only=True)
             in_fc_v, out_fc_v, weights = field.get_both_facet_state_vals(state,
                                                                          region)
@@ -227,20 +198,14 @@ class AdvectionDGFluxTerm(DGTerm):
             fc_b = facet_base_vals[:, 0, :, 0, :].T
             # (n_el_nod, n_el_facet, n_qp)
 
-            fc_v_avg = (in_fc_v + out_fc_v)/2.
-            fc_v_jmp = in_fc_v - out_fc_v
-
-            central = nm.einsum("ik,ifq->ifkq", advelo, fc_v_avg)
-            upwind = (1 - self.alpha) / 2. * nm.einsum("if,ifk,ifq->ifkq",
-                                                       C, fc_n, fc_v_jmp)
+            # normal numerical flux in facet QPs
+            fc_flux = (fc_an[..., None] * (in_fc_v + out_fc_v)
+                       + upwind[..., None] * (in_fc_v - out_fc_v)) / 2.
+            fc_flux *= weights
 
-            cell_fluxes = nm.einsum("ifk,ifkq,dfq,ifq->id",
-                                    fc_n, central + upwind, fc_b, weights)
+            cell_fluxes = nm.einsum("ifq,dfq->id", fc_flux, fc_b)
 
-            out[:] = 0.0
-            n_el_nod = field.n_el_nod
-            for i in range(n_el_nod):
-                out[:, :, i, 0] = cell_fluxes[:, i, None]
+            out[:] = cell_fluxes[:, None, :, None]
 
         status = None
         return out, status
@@ -346,9 +311,8 @@ class DiffusionDGFluxTerm(DGTerm):
     def _function_matrix(self, out, state, diff_var, field, region, D):
         fc_n = field.get_cell_normals_per_facet(region)
 
-        nbrhd_idx = field.get_facet_neighbor_idx(region, state.eq_map)
-        active_cells, active_facets = nm.where(nbrhd_idx[:, :, 0] >= 0)
-        active_nrbhs = nbrhd_idx[active_cells, active_facets, 0]
+        pairs = field.get_facet_pairs(region, state.eq_map)
+        active_cells, active_facets = pairs.cells, pairs.facets
 
         inner_facet_base, outer_facet_base, whs = \
             field.get_both_facet_base_vals(state, region, derivative=False)
@@ -368,9 +332,9 @@ class DiffusionDGFluxTerm(DGTerm):
                 "ikl, ibkq, ik, idq, iq->idb",
                 D[active_cells],
                 outer_facet_base_d[active_cells, :, active_facets] / 2,  # state
-                fc_n[active_cells, active_facets],
+                pairs.normals,
                 inner_facet_base[active_cells, :, active_facets],  # test
-                whs[active_cells, active_facets])
+                pairs.whs)
 
         elif self.mode == 'avg_virtual':
             # content of diagonal
@@ -384,17 +348,15 @@ class DiffusionDGFluxTerm(DGTerm):
             outer_vals = nm.einsum("ikl, idkq, ik, ibq, iq->idb",
                    D[active_cells],
                    inner_facet_base_d[active_cells, :, active_facets] / 2,  # test
-                   fc_n[active_cells, active_facets],
+                   pairs.normals,
                    - outer_facet_base[active_cells, :, active_facets],  # state
-                   whs[active_cells, active_facets])
-
-        iels = self._get_nbrhd_dof_indexes(active_cells, active_nrbhs, field)
+                   pairs.whs)
 
         vals = nm.vstack((inner_vals, outer_vals))
         vals = vals.flatten()
 
         #               i           j
-        out = (vals, iels[:, 0], iels[:, 1], state, state)
+        out = (vals, pairs.iels[:, 0], pairs.iels[:, 1], state, state)
         return out
 
     def _function_residual(self, out, state, diff_var, field, region, D):
@@ -431,10 +393,7 @@ class DiffusionDGFluxTerm(DGTerm):
             cell_fluxes = nm.einsum("idfkq, ifk, ifq , ifq -> id",
                              avgDdbase, fc_n, jmpState, weights)
 
-        out[:] = 0.0
-        n_el_nod = field.n_el_nod
-        for i in range(n_el_nod):
-            out[:, :, i, 0] = cell_fluxes[:, i, None]
+        out[:] = cell_fluxes[:, None, :, None]
         return out
 
 
@@ -501,10 +460,8 @@ class DiffusionInteriorPenaltyTerm(DGTerm):
         sigma = nu * Cw * approx_order ** 2 / facet_vols
 
         if diff_var is not None:
-
-            nbrhd_idx = field.get_facet_neighbor_idx(region, state.eq_map)
-            active_cells, active_facets = nm.where(nbrhd_idx[:, :, 0] >= 0)
-            active_nrbhs = nbrhd_idx[active_cells, active_facets, 0]
+            pairs = field.get_facet_pairs(region, state.eq_map)
+            active_cells, active_facets = pairs.cells, pairs.facets
 
             inner = nm.einsum("nf, ndfq, nbfq, nfq -> ndb",
                                sigma,
@@ -516,34 +473,25 @@ class DiffusionInteriorPenaltyTerm(DGTerm):
                                sigma[active_cells, active_facets],
                                inner_facet_base[active_cells, :, active_facets],  # test
                                - outer_facet_base[active_cells, :, active_facets],  # state
-                               whs[active_cells, active_facets])
+                               pairs.whs)
 
             vals = nm.vstack((inner, outer))
             vals = vals.flatten()
 
-            iels = self._get_nbrhd_dof_indexes(active_cells, active_nrbhs, field)
-
-            out = (vals, iels[:, 0], iels[:, 1], state, state)
+            out = (vals, pairs.iels[:, 0], pairs.iels[:, 1], state, state)
 
         else:
             inner_facet_state, outer_facet_state, whs = \
                 field.get_both_facet_state_vals(state, region,
                                                 derivative=False
                                                 )
-            inner_facet_base, outer_facet_base, _ = \
-                field.get_both_facet_base_vals(state, region,
-                                               derivative=False
-                                               )
             jmp_state = inner_facet_state - outer_facet_state
             jmp_base = inner_facet_base  # - outer_facet_base
 
-            n_el_nod = nm.shape(inner_facet_base)[1]
             cell_penalty = nm.einsum("nf,nfq,ndfq,nfq->nd",
                                      sigma, jmp_state, jmp_base, whs)
 
-            out[:] = 0.0
-            for i in range(n_el_nod):
-                out[:, :, i, 0] = cell_penalty[:, i, None]
+            out[:] = cell_penalty[:, None, :, None]
 
         status = None
         return out, status
@@ -652,8 +600,6 @@ class NonlinearHyperbolicDGFluxTerm(DGTerm):
 
         fc_b = facet_base_vals[:, 0, :, 0, :].T  # (n_el_nod, n_el_facet, n_qp)
 
-        n_el_nod = field.n_el_nod
-
         # get maximal wave speeds at facets
         df_in = df(in_fc_v)
         df_out = df(out_fc_v)
@@ -672,9 +618,7 @@ class NonlinearHyperbolicDGFluxTerm(DGTerm):
         cell_fluxes = nm.einsum("ifk,ifqk,dfq,ifq->id",
                                 fc_n, central + upwind, fc_b, weights)
 
-        out[:] = 0.0
-        for i in range(n_el_nod):
-            out[:, :, i, 0] = cell_fluxes[:, i, None]
+        out[:] = cell_fluxes[:, None, :, None]
 
         status = None
         return out, status
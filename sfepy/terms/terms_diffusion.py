@@ -35,6 +35,33 @@ class DiffusionTerm(Term):
     symbolic = {'expression': 'div( K * grad( u ) )',
                 'map' : {'u' : 'state', 'K' : 'material'}}
 
+    @staticmethod
+    def dw_fun(out, fun, *args):
+        return fun(out, *args)
+
+    @staticmethod
+    def dw_sum_factorized(out, dofs, mat, sfd):
+        """
+        Evaluate the residual using the sum factorization, see
+        :func:`Term.get_sum_factorization()
+        <sfepy.terms.terms.Term.get_sum_factorization()>`.
+        """
+        grad = sfd.sf.eval_grad(dofs[:, 0])
+        grad = nm.einsum('cqdi,cdq->cqi', sfd.mtx_i, grad)
+
+        mat = nm.broadcast_to(mat, grad.shape[:2] + mat.shape[2:])
+        if mat.shape[-1] == 1:
+            flux = mat[..., 0] * grad
+
+        else:
+            flux = nm.einsum('cqij,cqj->cqi', mat, grad)
+
+        flux *= sfd.det[..., None]
+        flux = nm.einsum('cqdi,cqi->cdq', sfd.mtx_i, flux)
+        out[:, 0, :, 0] = sfd.sf.integrate_grad(flux)
+
+        return 0
+
     def get_fargs(self, mat, virtual, state,
                   mode=None, term_mode=None, diff_var=None, **kwargs):
         vg, _ = self.get_mapping(state)
@@ -46,6 +73,10 @@ class DiffusionTerm(Term):
 
         if mode == 'weak':
             if diff_var is None:
+                sfd, dofs = self.get_sum_factorization(virtual, state)
+                if sfd is not None:
+                    return self.dw_sum_factorized, dofs, mat, sfd
+
                 grad = self.get(state, 'grad')
                 fmode = 0
 
@@ -53,7 +84,7 @@ class DiffusionTerm(Term):
                 grad = nm.array([0], ndmin=4, dtype=nm.float64)
                 fmode = 1
 
-            return grad, mat, vg, fmode
+            return self.weak_function, grad, mat, vg, fmode
 
         elif mode == 'eval':
             grad1 = self.get(virtual, 'grad')
@@ -73,7 +104,8 @@ class DiffusionTerm(Term):
 
     def set_arg_types(self):
         if self.mode == 'weak':
-            self.function = terms.dw_diffusion
+            self.function = self.dw_fun
+            self.weak_function = terms.dw_diffusion
 
         else:
             self.function = terms.d_diffusion
@@ -158,7 +190,8 @@ class LaplaceTerm(DiffusionTerm):
 
     def set_arg_types(self):
         if self.mode == 'weak':
-            self.function = terms.dw_laplace
+            self.function = self.dw_fun
+            self.weak_function = terms.dw_laplace
 
         else:
             self.function = terms.d_laplace
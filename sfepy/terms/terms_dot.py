@@ -72,6 +72,28 @@ class DotProductTerm(Term):
         status = fun(out, mat, val_qp, vgeo, sgeo, fmode)
         return status
 
+    @staticmethod
+    def dw_sum_factorized(out, mat, dofs, sfd, sgeo, fmode):
+        """
+        Evaluate the residual using the sum factorization, see
+        :func:`Term.get_sum_factorization()
+        <sfepy.terms.terms.Term.get_sum_factorization()>`. The `sgeo` and
+        `fmode` arguments are not used.
+        """
+        val = sfd.sf.eval_base(dofs)
+
+        mat = nm.broadcast_to(mat, sfd.det.shape + mat.shape[2:])
+        if mat.shape[-1] == 1:
+            val *= (mat[..., 0, 0] * sfd.det)[:, None, :]
+
+        else:
+            val = nm.einsum('cqij,cjq->ciq', mat, val)
+            val *= sfd.det[:, None, :]
+
+        out[:, 0, :, 0] = sfd.sf.integrate(val).reshape((out.shape[0], -1))
+
+        return 0
+
     @staticmethod
     def d_dot(out, mat, val1_qp, val2_qp, geo):
         if mat is None:
@@ -113,6 +135,11 @@ class DotProductTerm(Term):
             sgeo, _ = self.get_mapping(state)
 
             if diff_var is None:
+                sfd, dofs = self.get_sum_factorization(virtual, state)
+                if sfd is not None:
+                    return (mat, dofs, sfd, sgeo,
+                            self.dw_sum_factorized, 0)
+
                 val_qp = self.get(state, 'val')
                 fmode = 0
 
@@ -227,13 +254,13 @@ class DotSProductVolumeOperatorWTHTerm(THTerm):
             def iter_kernel():
                 for ii, mat in enumerate(mats):
                     val_qp = self.get(state, 'val', step=-ii)
-                    mat = nm.tile(mat, (n_el, n_qp, 1, 1))
+                    mat = nm.tile(mat, (1, n_qp, 1, 1))
                     yield ii, (ts.dt * mat, val_qp, vg, vg, 0)
             fargs = iter_kernel
 
         else:
             val_qp = nm.array([0], ndmin=4, dtype=nm.float64)
-            mat = nm.tile(mats[0], (n_el, n_qp, 1, 1))
+            mat = nm.tile(mats[0], (1, n_qp, 1, 1))
             fargs = ts.dt * mat, val_qp, vg, vg, 1
 
         return fargs
@@ -51,12 +51,49 @@ class LinearElasticTerm(Term):
 ##     symbolic = {'expression': expr,
 ##                 'map' : {'u' : 'state', 'D_sym' : 'material'}}
 
+    @staticmethod
+    def dw_fun(out, fun, *args):
+        return fun(out, *args)
+
+    @staticmethod
+    def dw_sum_factorized(out, dofs, mat, sfd):
+        """
+        Evaluate the residual using the sum factorization, see
+        :func:`Term.get_sum_factorization()
+        <sfepy.terms.terms.Term.get_sum_factorization()>`.
+        """
+        from sfepy.mechanics.tensors import get_sym_indices, get_full_indices
+
+        n_el, dim = dofs.shape[:2]
+        n_qp = sfd.det.shape[1]
+
+        grad = sfd.sf.eval_grad(dofs)
+        grad = nm.einsum('cqdi,ckdq->cqki', sfd.mtx_i, grad)
+        grad = (grad + grad.transpose((0, 1, 3, 2))).reshape((n_el, n_qp, -1))
+
+        # The engineering shear strains.
+        strain = grad[..., get_sym_indices(dim)]
+        strain[..., :dim] *= 0.5
+
+        mat = nm.broadcast_to(mat, (n_el, n_qp) + mat.shape[2:])
+        stress = nm.einsum('cqij,cqj->cqi', mat, strain)
+        stress *= sfd.det[..., None]
+        stress = stress[..., nm.array(get_full_indices(dim))]
+        flux = nm.einsum('cqdi,cqki->ckdq', sfd.mtx_i, stress)
+        out[:, 0, :, 0] = sfd.sf.integrate_grad(flux).reshape((n_el, -1))
+
+        return 0
+
     def get_fargs(self, mat, virtual, state,
                   mode=None, term_mode=None, diff_var=None, **kwargs):
         vg, _ = self.get_mapping(state)
 
         if mode == 'weak':
             if diff_var is None:
+                sfd, dofs = self.get_sum_factorization(virtual, state)
+                if sfd is not None:
+                    return self.dw_sum_factorized, dofs, mat, sfd
+
                 strain = self.get(state, 'cauchy_strain')
                 fmode = 0
 
@@ -64,7 +101,7 @@ class LinearElasticTerm(Term):
                 strain = nm.array([0], ndmin=4, dtype=nm.float64)
                 fmode = 1
 
-            return 1.0, strain, mat, vg, fmode
+            return terms.dw_lin_elastic, 1.0, strain, mat, vg, fmode
 
         elif mode == 'eval':
             strain1 = self.get(virtual, 'cauchy_strain')
@@ -84,7 +121,7 @@ class LinearElasticTerm(Term):
 
     def set_arg_types(self):
         if self.mode == 'weak':
-            self.function = terms.dw_lin_elastic
+            self.function = self.dw_fun
 
         else:
             self.function = terms.d_lin_elastic
@@ -213,13 +250,13 @@ class LinearElasticTHTerm(THTerm):
                     for ii, mat in enumerate(mats):
                         strain = self.get(state, 'cauchy_strain',
                                           step=-ii)
-                        mat = nm.tile(mat, (n_el, n_qp, 1, 1))
+                        mat = nm.tile(mat, (1, n_qp, 1, 1))
                         yield ii, (ts.dt, strain, mat, vg, 0)
                 fargs = iter_kernel
 
             else:
                 strain = nm.array([0], ndmin=4, dtype=nm.float64)
-                mat = nm.tile(mats[0], (n_el, n_qp, 1, 1))
+                mat = nm.tile(mats[0], (1, n_qp, 1, 1))
                 fargs = ts.dt, strain, mat, vg, 1
 
             return fargs
@@ -558,7 +595,7 @@ class CauchyStressTHTerm(CauchyStressTerm, THTerm):
             for ii, mat in enumerate(mats):
                 strain = self.get(state, 'cauchy_strain',
                                   step=-ii)
-                mat = nm.tile(mat, (n_el, n_qp, 1, 1))
+                mat = nm.tile(mat, (1, n_qp, 1, 1))
                 yield ii, (ts.dt, strain, mat, vg, fmode)
 
         return iter_kernel
@@ -1,6 +1,7 @@
 import numpy as nm
 from sfepy.terms.terms import Term, terms
-from sfepy.base.base import Struct
+from sfepy.base.base import Struct, assert_
+from sfepy.base.goptions import goptions
 import six
 
 _msg_missing_data = 'missing family data!'
@@ -88,6 +89,10 @@ class HyperElasticBase(Term):
       - 0: total formulation
       - 1: updated formulation
 
+    Several terms of the same formulation family acting on the same variables
+    in the same region can be evaluated together in the weak mode, see
+    :func:`HyperElasticBase.evaluate_fused()`.
+
     Notes
     -----
     This is not a proper Term!
@@ -201,6 +206,96 @@ class HyperElasticBase(Term):
 
         return (n_el, n_qp, sym, 1), state.dtype
 
+    def get_fusion_key(self):
+        """
+        Get the key of the group of terms that can be evaluated together by
+        :func:`HyperElasticBase.evaluate_fused()`, or None, if the term
+        cannot be fused with other terms.
+
+        The terms of a group share the formulation family, the virtual and
+        state variables, the region and the integral. Only the terms using
+        :func:`HyperElasticBase.get_fargs()` can be fused.
+        """
+        if type(self).get_fargs is not HyperElasticBase.get_fargs:
+            return None
+
+        virtual, state = self.get_args(arg_types=('virtual', 'state'))
+        if state.dtype != nm.float64:
+            return None
+
+        name = state.name
+        key = (type(self.get_family_data), self.weak_function,
+               self.hyperelastic_mode, virtual.name, name, self.region.name,
+               self.integral.name, self.geometry_types[name],
+               self.arg_steps[name], self.arg_derivatives[name])
+
+        return key
+
+    @staticmethod
+    def evaluate_fused(terms, diff_var=None, **kwargs):
+        """
+        Evaluate the terms with the same fusion key, see
+        :func:`HyperElasticBase.get_fusion_key()`, in the weak mode together.
+
+        The stresses and tangent moduli of the terms, multiplied by the term
+        signs, are summed in quadrature points, and the weak form is
+        integrated only once for all the terms.
+
+        Returns
+        -------
+        vals : array
+            The element residuals or tangent matrices summed over the terms.
+        iels : array
+            The assembling cells, see :func:`Term.get_assembling_cells()
+            <sfepy.terms.terms.Term.get_assembling_cells()>`.
+        status : int
+            The evaluation status.
+        """
+        term = terms[0]
+        virtual, state = term.get_args(arg_types=('virtual', 'state'))
+
+        n_el, _, _, n_en, n_c = term.get_data_shape(virtual)
+        if diff_var is None:
+            shape = (n_el, 1, n_c * n_en, 1)
+
+        else:
+            _, _, _, n_enc, n_cc = term.get_data_shape(state)
+            shape = (n_el, 1, n_c * n_en, n_cc * n_enc)
+
+        if n_el == 0:
+            vals = nm.zeros(shape, dtype=nm.float64)
+            status = 0
+
+        else:
+            stress = tan_mod = None
+            for term in terms:
+                args = term.get_args(**kwargs)
+                term.check_shapes(*args)
+
+                _args = tuple(args) + ('weak', None, diff_var)
+                fargs = term.call_get_fargs(_args, kwargs)
+                if stress is None:
+                    stress = term.sign * fargs[1]
+                    tan_mod = term.sign * fargs[2]
+
+                else:
+                    stress += term.sign * fargs[1]
+                    tan_mod += term.sign * fargs[2]
+
+            term = terms[0]
+            fargs = (fargs[0], stress, tan_mod) + fargs[3:]
+            vals, status = term.eval_real(shape, fargs, 'weak', None,
+                                          diff_var)
+
+        iels = term.get_assembling_cells(vals.shape)
+
+        if goptions['check_term_finiteness']:
+            assert_(nm.isfinite(vals).all(),
+                    msg='"%s" term values not finite!'
+                    % ' + '.join(term.get_str() for term in terms))
+
+        return vals, iels, status
+
 class DeformationGradientTerm(Term):
     r"""
     Deformation gradient :math:`\ull{F}` in quadrature points for
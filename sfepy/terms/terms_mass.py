@@ -0,0 +1,122 @@
+import numpy as nm
+
+from sfepy.terms.terms import Term
+
+def lump_mass_matrices(mtx, lumping):
+    """
+    Lump the scalar element mass matrices.
+
+    Parameters
+    ----------
+    mtx : array
+        The element mass matrices with the shape `(n_el, n_ep, n_ep)`.
+    lumping : 'row_sum' or 'hrz'
+        The lumping kind. The row-sum lumping sums each row of an element
+        matrix. The HRZ lumping (Hinton, Rock, Zienkiewicz) scales the
+        diagonal of an element matrix to preserve the element mass.
+
+    Returns
+    -------
+    diag : array
+        The diagonals of the lumped element mass matrices with the shape
+        `(n_el, n_ep)`.
+    """
+    if lumping == 'row_sum':
+        diag = mtx.sum(axis=2)
+
+    elif lumping == 'hrz':
+        diag = nm.diagonal(mtx, axis1=1, axis2=2)
+        diag = diag * (mtx.sum(axis=(1, 2)) / diag.sum(axis=1))[:, None]
+
+    else:
+        raise ValueError('unknown mass lumping! (%s)' % lumping)
+
+    return diag
+
+class MassTerm(Term):
+    r"""
+    Mass term with the consistent or lumped element mass matrices for both
+    scalar and vector fields. The lumped mass matrices are diagonal, which
+    allows the explicit time-stepping solvers to avoid solving linear systems.
+
+    The lumping kind is one of 'consistent', 'row_sum' or 'hrz'. It is given
+    by a special constant material parameter, for example
+    ``{'rho' : 7800.0, '.lumping' : 'row_sum'}``.
+
+    :Definition:
+
+    .. math::
+        \int_{\cal{D}} \rho q p \mbox{ , } \int_{\cal{D}} \rho \ul{v} \cdot
+        \ul{u}
+
+    :Arguments:
+        - material_rho     : :math:`\rho`
+        - material_lumping : the mass lumping kind
+        - virtual          : :math:`q` or :math:`\ul{v}`
+        - state            : :math:`p` or :math:`\ul{u}`
+    """
+    name = 'dw_mass'
+    arg_types = ('material_rho', 'material_lumping', 'virtual', 'state')
+    arg_shapes = [{'material_rho' : '1, 1', 'material_lumping' : '.: str',
+                   'virtual' : (1, 'state'), 'state' : 1},
+                  {'virtual' : ('D', 'state'), 'state' : 'D'}]
+    lumpings = ('consistent', 'row_sum', 'hrz')
+
+    @staticmethod
+    def function(out, rho, lumping, dofs, vg, fmode):
+        bf = vg.bf[..., 0, :]
+        rdet = (rho * vg.det)[..., 0, 0]
+        if bf.shape[0] == 1:
+            mtx = nm.einsum('cq,qi,qj->cij', rdet, bf[0], bf[0])
+
+        else:
+            mtx = nm.einsum('cq,cqi,cqj->cij', rdet, bf, bf)
+
+        n_el, n_ep = mtx.shape[:2]
+        n_c = out.shape[2] // n_ep
+
+        if lumping != 'consistent':
+            diag = lump_mass_matrices(mtx, lumping)
+
+            if fmode == 0:
+                out[:, 0, :, 0] = (diag[:, None, :] * dofs).reshape((n_el, -1))
+
+            else:
+                out.fill(0.0)
+                ii = nm.arange(n_c * n_ep)
+                out[:, 0, ii, ii] = nm.tile(diag, n_c)
+
+        else:
+            if fmode == 0:
+                val = nm.einsum('cij,ckj->cki', mtx, dofs)
+                out[:, 0, :, 0] = val.reshape((n_el, -1))
+
+            else:
+                out.fill(0.0)
+                for ic in range(n_c):
+                    ir = slice(ic * n_ep, (ic + 1) * n_ep)
+                    out[:, 0, ir, ir] = mtx
+
+        return 0
+
+    def get_fargs(self, rho, lumping, virtual, state,
+                  mode=None, term_mode=None, diff_var=None, **kwargs):
+        if lumping not in self.lumpings:
+            raise ValueError('unknown mass lumping! (%s not in %s)'
+                             % (lumping, self.lumpings))
+
+        vg, _ = self.get_mapping(state)
+
+        if diff_var is None:
+            vec = state().reshape((-1, state.n_components))
+            conn = state.field.get_econn(self.get_dof_conn_type(),
+                                         self.region)
+            # axis 0: cells, axis 1: component, axis 2: node
+            dofs = vec[conn].transpose((0, 2, 1))
+            fmode = 0
+
+        else:
+            dofs = None
+            fmode = 1
+
+        return rho, lumping, dofs, vg, fmode
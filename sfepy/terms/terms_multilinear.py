@@ -1,3 +1,9 @@
+import os
+import re
+import atexit
+import pickle
+import tempfile
+
 import numpy as nm
 from sfepy.linalg import dot_sequences
 
@@ -13,6 +19,12 @@ try:
 except ImportError:
     oe = None
 
+try:
+    import fcntl
+
+except ImportError:
+    fcntl = None
+
 try:
     from jax.config import config
     config.update("jax_enable_x64", True)
@@ -26,7 +38,8 @@ from pyparsing import (Word, Suppress, oneOf, OneOrMore, delimitedList,
                        Combine, alphas, alphanums, Literal)
 from functools import partial
 
-from sfepy.base.base import output, Struct
+from sfepy.base.base import output, Struct, sfepy_config_dir
+from sfepy.base.goptions import goptions
 from sfepy.base.timing import Timer
 from sfepy.mechanics.tensors import dim2sym
 from sfepy.terms.terms import Term
@@ -153,6 +166,39 @@ def get_einsum_ops(eargs, ebuilder, expr_cache):
 
     return operands
 
+def get_cell_sample_ops(subscripts, operands, n_cell):
+    """
+    Get views of `operands` restricted to the first `n_cell` cells.
+    """
+    sample = []
+    for subs, ops in zip(subscripts, operands):
+        sops = []
+        for indices, op in zip(subs, ops):
+            if 'c' in indices:
+                ic = indices.index('c')
+                op = op[(slice(None),) * ic + (slice(0, n_cell),)]
+
+            sops.append(op)
+
+        sample.append(sops)
+
+    return sample
+
+def get_block_ops(ops, ics, ic0, ic1):
+    """
+    Get views of operands `ops` restricted to cells `ic0:ic1`, where `ics`
+    are the positions of the cell index in the operands, see
+    :func:`get_loop_indices()`.
+    """
+    bops = []
+    for op, icol in zip(ops, ics):
+        if (icol is not None) and (op.shape[icol] > 1):
+            op = op[(slice(None),) * icol + (slice(ic0, ic1),)]
+
+        bops.append(op)
+
+    return bops
+
 def get_slice_ops(subs, ops, loop_index):
     ics = get_loop_indices(subs, loop_index)
 
@@ -647,6 +693,134 @@ class ExpressionBuilder(Struct):
             raise ValueError('unknown transformation! ({})'
                              .format(transformation))
 
+class PersistentCache(Struct):
+    """
+    Dictionary-like cache shared by all instances of ETermBase terms. The
+    cache is stored in a file, by default in the sfepy configuration
+    directory, so that its values are computed only once for all processes.
+
+    New values are kept in memory until :func:`PersistentCache.flush()` is
+    called, or the process exits. At most `max_size` values are kept, the
+    least recently used values are dropped first.
+    """
+
+    def __init__(self, filename, max_size=1000):
+        filename = os.path.join(sfepy_config_dir, filename)
+        Struct.__init__(self, filename=filename, max_size=max_size,
+                        values=None, is_dirty=False)
+        atexit.register(self.flush)
+
+    def _read(self):
+        try:
+            with open(self.filename, 'rb') as fd:
+                values = pickle.load(fd)
+
+        except Exception:
+            values = {}
+
+        return values if isinstance(values, dict) else {}
+
+    def _prune(self, values):
+        n_drop = len(values) - self.max_size
+        if n_drop > 0:
+            for key in list(values.keys())[:n_drop]:
+                del values[key]
+
+        return values
+
+    def load(self):
+        """
+        Load the cached values, if not already loaded.
+        """
+        if self.values is None:
+            self.values = self._read()
+
+        return self.values
+
+    def save(self):
+        """
+        Save the cached values, merged with the values stored by other
+        processes in the meantime. The file is locked during the merge (on
+        platforms with fcntl) and replaced atomically.
+        """
+        dirname = os.path.dirname(self.filename)
+        try:
+            with open(self.filename + '.lock', 'w') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+
+                values = self._read()
+                # The values of this process are the most recent ones.
+                for key in self.load().keys():
+                    values.pop(key, None)
+                values.update(self.values)
+                self.values = self._prune(values)
+
+                fd, tmp_name = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as fd:
+                    pickle.dump(self.values, fd,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, self.filename)
+
+        except OSError as exc:
+            output('cannot save cache to {}! ({})'
+                   .format(self.filename, exc))
+
+        self.is_dirty = False
+
+    def flush(self):
+        """
+        Save the cached values, if there are any new ones.
+        """
+        if self.is_dirty:
+            self.save()
+
+    def get(self, key):
+        values = self.load()
+        value = values.pop(key, None)
+        if value is not None:
+            # Keep the recently used values at the end.
+            values[key] = value
+
+        return value
+
+    def set(self, key, value):
+        values = self.load()
+        values.pop(key, None)
+        values[key] = value
+        self._prune(values)
+        self.is_dirty = True
+
+    def clear(self, persistent=False):
+        """
+        Clear the cache. If `persistent` is True, remove also the cache file.
+        """
+        self.values = {}
+        self.is_dirty = False
+        if persistent and os.path.exists(self.filename):
+            os.remove(self.filename)
+
+def _get_path_key(expression, operands, backend, optimize, memory_limit):
+    # Omit the cell axis, so that the paths are reused for any number of
+    # cells.
+    subscripts = expression.split('->')[0].split(',')
+    shapes = []
+    for subs, op in zip(subscripts, operands):
+        shape = tuple(op.shape)
+        if len(subs) == len(shape):
+            shape = tuple(size for letter, size in zip(subs, shape)
+                          if letter != 'c')
+        shapes.append(shape)
+
+    key = (expression, tuple(shapes), backend, optimize, memory_limit)
+    try:
+        hash(key)
+
+    except TypeError:
+        key = None
+
+    return key
+
 class ETermBase(Term):
     """
     Reserved letters:
@@ -671,9 +845,11 @@ class ETermBase(Term):
         'numpy' : nm,
         'numpy_loop' : nm,
         'numpy_qloop' : nm,
+        'numpy_block' : nm,
         'opt_einsum' : oe,
         'opt_einsum_loop' : oe,
         'opt_einsum_qloop' : oe,
+        'opt_einsum_block' : oe,
         'jax' : jnp,
         'jax_vmap' : jnp,
         'dask_single' : da,
@@ -684,6 +860,21 @@ class ETermBase(Term):
 
     layout_letters = 'cqgvd0'
 
+    # Contraction paths: (expression, operand shapes without the cell axis,
+    # backend, optimize, memory_limit) -> (path, path info string).
+    path_cache = PersistentCache('einsum_paths.pkl')
+
+    # Auto-tuning results: (term name, mode, expressions, operand shapes,
+    # candidates, optimize) -> (backend, layout).
+    tune_cache = PersistentCache('eterm_backends.pkl')
+
+    # Default candidate layouts for backend='auto'.
+    tune_layouts = ('cqgvd0', 'cqgdv0', 'qcgvd0')
+
+    # If not None, the expressions are evaluated in the first tune_n_cell
+    # cells only.
+    tune_n_cell = None
+
     def __init__(self, *args, **kwargs):
         Term.__init__(self, *args, **kwargs)
 
@@ -715,6 +906,47 @@ class ETermBase(Term):
 
     def set_backend(self, backend='numpy', optimize=True, layout=None,
                     **kwargs):
+        """
+        Set the backend used to evaluate the einsum expressions.
+
+        Parameters
+        ----------
+        backend : str
+            One of the `can_backend` keys, or 'auto'. With 'auto', the
+            fastest of the available backends and layouts is selected in the
+            first evaluation in each mode, see
+            :func:`ETermBase.set_tuned_backend()`.
+        optimize : bool or str
+            The contraction path optimization strategy.
+        layout : str, optional
+            The operands layout, a permutation of `layout_letters`. Ignored
+            with 'auto'.
+        **kwargs : dict
+            Additional backend options: 'memory_limit', 'c_chunk_size',
+            'eval_fun'. With 'auto', also 'tune_backends' (candidate
+            backends, defaults to all available backends), 'tune_layouts'
+            (candidate layouts, defaults to `tune_layouts`), 'tune_n_cell'
+            (the number of sample cells, default 100) and 'tune_n_repeat'
+            (the number of timed evaluations, default 3).
+        """
+        if backend == 'auto':
+            self.is_auto = True
+            self.backend = backend
+            self.optimize = optimize
+            self.layout = self.layout_letters
+            self.backend_kwargs = kwargs
+            self.auto_kwargs = kwargs
+            self.auto_choices = {}
+            self.auto_caches = {}
+            self.einfos = {}
+            self.clear_cache()
+            return
+
+        self.is_auto = False
+        self._set_backend(backend, optimize=optimize, layout=layout, **kwargs)
+
+    def _set_backend(self, backend='numpy', optimize=True, layout=None,
+                     **kwargs):
         if backend not in self.can_backend.keys():
             raise ValueError('backend {} not in {}!'
                              .format(self.backend, self.can_backend.keys()))
@@ -773,6 +1005,7 @@ class ETermBase(Term):
             ebuilder=None,
             paths=None,
             path_infos=None,
+            block_size=None,
             eval_einsum=None,
         ))
 
@@ -897,6 +1130,31 @@ class ETermBase(Term):
                         vout[ic] += contract(expressions[ia], *ops,
                                              optimize=paths[ia])
 
+        elif self.backend in ('numpy_block', 'opt_einsum_block'):
+            contract = (nm.einsum if self.backend == 'numpy_block'
+                        else oe.contract)
+            def eval_einsum(out, eshape, expressions, operands, all_ics,
+                            block_size, paths):
+                n_cell = out.shape[0]
+                vout = out.reshape(eshape)
+                if n_add > 1:
+                    buf = nm.empty((min(block_size, n_cell),) + eshape[1:],
+                                   dtype=out.dtype)
+
+                for ic0 in range(0, n_cell, block_size):
+                    ic1 = min(ic0 + block_size, n_cell)
+                    ops = get_block_ops(operands[0], all_ics[0], ic0, ic1)
+                    contract(expressions[0], *ops, out=vout[ic0:ic1],
+                             optimize=paths[0])
+
+                    for ia in range(1, n_add):
+                        ops = get_block_ops(operands[ia], all_ics[ia],
+                                            ic0, ic1)
+                        aux = buf[:ic1 - ic0]
+                        contract(expressions[ia], *ops, out=aux,
+                                 optimize=paths[ia])
+                        vout[ic0:ic1] += aux
+
         elif self.backend in ('numpy_qloop', 'opt_einsum_qloop'):
             contract = (nm.einsum if self.backend == 'numpy_qloop'
                         else oe.contract)
@@ -998,49 +1256,273 @@ class ETermBase(Term):
         einfo = self.einfos[diff_var]
         return get_einsum_ops(einfo.eargs, einfo.ebuilder, self.expr_cache)
 
-    def get_paths(self, expressions, operands):
+    def get_path(self, expression, operands):
         memory_limit = self.backend_kwargs.get('memory_limit')
 
         if ('numpy' in self.backend) or self.backend.startswith('dask'):
             optimize = (self.optimize if memory_limit is None
                         else (self.optimize, memory_limit))
-            paths, path_infos = zip(*[nm.einsum_path(
-                expressions[ia], *operands[ia],
+            path, path_info = nm.einsum_path(
+                expression, *operands,
                 optimize=optimize,
-            ) for ia in range(len(operands))])
+            )
 
         elif 'opt_einsum' in self.backend:
-            paths, path_infos = zip(*[oe.contract_path(
-                expressions[ia], *operands[ia],
+            path, path_info = oe.contract_path(
+                expression, *operands,
                 optimize=self.optimize,
                 memory_limit=memory_limit,
-            ) for ia in range(len(operands))])
+            )
 
         elif 'jax' in self.backend:
-            paths, path_infos = [], []
-            for ia in range(len(operands)):
-                path, info = jnp.einsum_path(
-                    expressions[ia], *operands[ia],
-                    optimize=self.optimize,
-                )
-                paths.append(tuple(path))
-                path_infos.append(info)
-            paths = tuple(paths)
-            path_infos = tuple(path_infos)
+            path, path_info = jnp.einsum_path(
+                expression, *operands,
+                optimize=self.optimize,
+            )
+            path = tuple(path)
 
         else:
             raise ValueError('unsupported backend! ({})'.format(self.backend))
 
-        return paths, path_infos
+        return path, path_info
+
+    def get_block_size(self, expressions, subscripts, operands,
+                       out_subscripts):
+        """
+        Get the number of cells evaluated at once by the block backends.
+
+        The size is given by the 'c_chunk_size' backend option, or
+        determined so that the output and the largest contraction
+        intermediate of a block take at most 'block_memory' bytes (default
+        64 MB).
+        """
+        block_size = self.backend_kwargs.get('c_chunk_size')
+        if block_size is not None:
+            return max(int(block_size), 1)
+
+        block_memory = self.backend_kwargs.get('block_memory', 2**26)
+
+        sample = get_cell_sample_ops(subscripts, operands, 1)
+        n_max = 0
+        for ia, ops in enumerate(sample):
+            _, path_info = self.get_path(expressions[ia], ops)
+            if hasattr(path_info, 'largest_intermediate'):
+                n_inter = path_info.largest_intermediate
+
+            else:
+                mm = re.search(r'Largest intermediate:\s+(\S+) elements',
+                               path_info)
+                n_inter = float(mm.group(1)) if mm else 0
+
+            n_out = nm.prod(get_output_shape(out_subscripts[ia],
+                                             subscripts[ia], ops))
+            n_max = max(n_max, n_inter + 2 * n_out)
+
+        itemsize = nm.result_type(*operands[0]).itemsize
+        block_size = int(block_memory // max(n_max * itemsize, 1))
+
+        return max(block_size, 1)
+
+    def time_evaluation(self, n_repeat, *args, **kwargs):
+        """
+        Return the shortest time of `n_repeat` evaluations of the term with
+        the current backend, after a warm-up evaluation.
+        """
+        mode, term_mode, diff_var = args[-3:]
+
+        fargs = self.get_fargs(*args, **kwargs)
+
+        ebuilder = self.einfos[diff_var].ebuilder
+        operands = self.get_operands(diff_var)
+        if self.tune_n_cell is not None:
+            operands = get_cell_sample_ops(ebuilder.subscripts, operands,
+                                           self.tune_n_cell)
+        eshape = get_output_shape(ebuilder.out_subscripts[0],
+                                  ebuilder.subscripts[0], operands[0])
+        out = nm.empty(eshape, dtype=nm.result_type(*operands[0]))
+
+        self.function_silent(out, *fargs)
+
+        timer = Timer('')
+        times = []
+        for ii in range(n_repeat):
+            timer.start()
+            self.function_silent(out, *fargs)
+            times.append(timer.stop())
+
+        return min(times)
+
+    def set_tuned_backend(self, *args, **kwargs):
+        """
+        Set the backend and layout selected by :func:`ETermBase.autotune()`
+        for the evaluation mode and the differentiation variable in `args`.
+        The choices are kept for each mode and differentiation variable, and
+        the expressions built for each chosen backend and layout are kept
+        too, so that switching between the choices is cheap.
+        """
+        mode, term_mode, diff_var = args[-3:]
+
+        key = (mode, diff_var)
+        choice = self.auto_choices.get(key)
+        if choice is None:
+            self.is_auto = False
+            try:
+                choice = self.autotune(*args, **kwargs)
+
+            finally:
+                self.is_auto = True
+
+            self.auto_choices[key] = choice
+            # Remove data computed for the sample cells.
+            self.auto_caches = {}
+            self.einfos = {}
+            self.clear_cache()
+
+        elif choice == (self.backend, self.layout):
+            return
+
+        else:
+            self.auto_caches[(self.backend, self.layout)] = (self.einfos,
+                                                            self.expr_cache)
+
+        backend, layout = choice
+        backend_kwargs = {key : val for key, val in self.auto_kwargs.items()
+                          if not key.startswith('tune_')}
+        self._set_backend(backend, optimize=self.optimize, layout=layout,
+                          **backend_kwargs)
+        self.einfos, self.expr_cache = self.auto_caches.pop(choice, ({}, {}))
+
+        if self.verbosity:
+            output('{}: {} {}: using backend {}, layout {}'
+                   .format(self.name, mode, diff_var, backend, layout))
+
+    def autotune(self, *args, **kwargs):
+        """
+        Select the fastest backend and layout for the term arguments `args`
+        by timing the candidate backends and layouts on a sample of cells.
+
+        The choice is stored in `tune_cache` under a key composed of the term
+        name, the evaluation mode, the einsum expressions, the operand shapes
+        and the candidates, so that the tuning is skipped in later runs with
+        the same key.
+
+        Returns
+        -------
+        choice : tuple
+            The selected (backend, layout).
+        """
+        mode, term_mode, diff_var = args[-3:]
+
+        tune_kwargs = {key : val for key, val in self.auto_kwargs.items()
+                       if key.startswith('tune_')}
+        backend_kwargs = {key : val for key, val in self.auto_kwargs.items()
+                          if not key.startswith('tune_')}
+        optimize = self.optimize
+
+        backends = tuple(
+            backend
+            for backend in tune_kwargs.get('tune_backends',
+                                           self.can_backend.keys())
+            if self.can_backend.get(backend)
+        )
+        layouts = tuple(tune_kwargs.get('tune_layouts', self.tune_layouts))
+        n_cell = tune_kwargs.get('tune_n_cell', 100)
+        n_repeat = tune_kwargs.get('tune_n_repeat', 3)
+
+        # Build the expression with the default backend to get the tuning
+        # key.
+        self._set_backend('numpy', optimize=optimize, **backend_kwargs)
+        self.get_function(*args, **kwargs)
+        ebuilder = self.einfos[diff_var].ebuilder
+        operands = self.get_operands(diff_var)
+        key = (self.name, mode, diff_var is not None,
+               ebuilder.get_expressions(),
+               tuple(tuple(op.shape) for ops in operands for op in ops),
+               backends, layouts, optimize)
+
+        choice = self.tune_cache.get(key)
+        if choice is None:
+            timings = {}
+            self.tune_n_cell = n_cell
+            try:
+                for backend in backends:
+                    for layout in layouts:
+                        self._set_backend(backend, optimize=optimize,
+                                          layout=layout, **backend_kwargs)
+                        try:
+                            dt = self.time_evaluation(n_repeat,
+                                                      *args, **kwargs)
+
+                        except Exception as exc:
+                            if self.verbosity:
+                                output('backend {}, layout {} failed! ({})'
+                                       .format(backend, layout, exc))
+                            continue
+
+                        timings[(backend, layout)] = dt
+                        if self.verbosity:
+                            output('backend {}, layout {}: {} s'
+                                   .format(backend, layout, dt))
+
+            finally:
+                self.tune_n_cell = None
+
+            if not len(timings):
+                raise ValueError('no backend can evaluate term {}!'
+                                 .format(self.name))
+
+            choice = min(timings, key=timings.get)
+            self.tune_cache.set(key, choice)
+            self.tune_cache.flush()
+
+        return tuple(choice)
+
+    def get_paths(self, expressions, operands):
+        """
+        Get the contraction paths of `expressions`. If the
+        'cache_einsum_paths' global option is True, the paths are taken from
+        or stored to the persistent cache shared by all terms.
+        """
+        use_cache = goptions['cache_einsum_paths']
+        memory_limit = self.backend_kwargs.get('memory_limit')
+
+        paths, path_infos = [], []
+        for ia in range(len(operands)):
+            key = None
+            if use_cache:
+                key = _get_path_key(expressions[ia], operands[ia],
+                                    self.backend, self.optimize, memory_limit)
+                cached = self.path_cache.get(key) if key is not None else None
+                if cached is not None:
+                    paths.append(cached[0])
+                    path_infos.append(cached[1])
+                    continue
+
+            path, path_info = self.get_path(expressions[ia], operands[ia])
+            if key is not None:
+                self.path_cache.set(key, (path, str(path_info)))
+
+            paths.append(path)
+            path_infos.append(path_info)
+
+        self.path_cache.flush()
+
+        return tuple(paths), tuple(path_infos)
 
     def get_fargs(self, *args, **kwargs):
         mode, term_mode, diff_var = args[-3:]
 
+        if self.is_auto:
+            self.set_tuned_backend(*args, **kwargs)
+
         eval_einsum = self.get_function(*args, **kwargs)
         operands = self.get_operands(diff_var)
 
         einfo = self.einfos[diff_var]
         ebuilder = einfo.ebuilder
+        if self.tune_n_cell is not None:
+            operands = get_cell_sample_ops(ebuilder.subscripts, operands,
+                                           self.tune_n_cell)
         eshape = get_output_shape(ebuilder.out_subscripts[0],
                                   ebuilder.subscripts[0], operands[0])
 
@@ -1077,6 +1559,19 @@ class ETermBase(Term):
                 if qloop:
                     out.append(loop_sizes)
 
+        elif self.backend in ('numpy_block', 'opt_einsum_block'):
+            all_ics = [get_loop_indices(subs, 'c') for subs in subscripts]
+            if einfo.block_size is None:
+                einfo.block_size = self.get_block_size(
+                    self.parsed_expressions, subscripts, operands,
+                    ebuilder.out_subscripts,
+                )
+            block_size = einfo.block_size
+            # The contraction paths do not depend on the number of cells.
+            poperands = get_cell_sample_ops(subscripts, operands, block_size)
+            expressions = self.parsed_expressions
+            out += [expressions, operands, all_ics, block_size]
+
         elif (self.backend.startswith('dask')
               or self.backend.startswith('opt_einsum_dask')):
             c_chunk_size = self.backend_kwargs.get('c_chunk_size')
@@ -1115,6 +1610,9 @@ class ETermBase(Term):
             raise ValueError('cannot differentiate in {} mode!'
                              .format(mode))
 
+        if self.is_auto:
+            self.set_tuned_backend(*args, **kwargs)
+
         self.get_function(*args, **kwargs)
 
         operands = self.get_operands(diff_var)
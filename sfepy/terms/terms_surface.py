@@ -74,17 +74,18 @@ class LinearTractionTerm(Term):
                   mode=None, term_mode=None, diff_var=None, **kwargs):
         sg, _ = self.get_mapping(virtual)
 
-        if traction is not None:
-            n_el, _, _, _, _ = self.get_data_shape(virtual)
-            traction = Term.tile_mat(traction, n_el)
-
         if traction is None:
             traction = nm.zeros((0,0,0,0), dtype=nm.float64)
 
         if mode == 'weak':
+            # dw_surface_ltr() supports constant traction data.
             return traction, sg
 
         elif mode == 'eval':
+            if traction.shape[2]:
+                n_el, _, _, _, _ = self.get_data_shape(virtual)
+                traction = nm.ascontiguousarray(Term.tile_mat(traction, n_el))
+
             val = self.get(virtual, 'val')
             return traction, val, sg
 
@@ -281,9 +282,8 @@ class ContactPlaneTerm(Term):
 
     @staticmethod
     def _get_force_pars(force_pars, shape):
-        k = force_pars[..., 0]
-        f0 = force_pars[..., 1]
-        k.shape = f0.shape = shape
+        k = force_pars[..., 0].reshape(shape)
+        f0 = force_pars[..., 1].reshape(shape)
 
         ir = f0 >= 1e-14
         eps = nm.where(ir, - 2.0 * f0 / k, 0.0)
@@ -17,6 +17,12 @@ compile_flags = '-g -O2'
 # extension modules.
 link_flags = ''
 
+# Flags for compiling and linking C extension modules with OpenMP support,
+# e.g. '-fopenmp' for gcc. Used by the parallel assembling functions, see the
+# 'assemble_num_threads' global option. If '', the extension modules are
+# compiled without OpenMP and the assembling is serial.
+openmp_flags = ''
+
 # Can be '' or one or several from '-DDEBUG_FMF', '-DDEBUG_MESH'. For
 # developers internal use only.
 debug_flags = ''
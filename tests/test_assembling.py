@@ -106,3 +106,80 @@ class Test(TestCommon):
                                   label1='assembled',
                                   label2='expected')
         return ok
+
+    def test_assemble_matrix_by_map(self):
+        from sfepy.discrete.common.extmods.assemble import (
+            assemble_matrix, create_assembling_map, assemble_matrix_by_map)
+
+        mtx = sps.csr_matrix(nm.ones((self.num, self.num),
+                                     dtype=nm.float64))
+        mtx.data[:] = 0.0
+
+        conn = self.conn.copy()
+        conn[0, 1] = -1
+
+        assemble_matrix(mtx.data, mtx.indptr, mtx.indices, self.mtx_in_els,
+                        self.iels, 1, conn, conn)
+        aux = mtx.toarray()
+
+        imap = create_assembling_map(mtx.indptr, mtx.indices, self.iels,
+                                     conn, conn)
+        self.report('assembling map:\n%s' % imap)
+        ok = (imap.shape == (2, 3, 3)) and (imap[0, 1] == -1).all()
+
+        mtx.data[:] = 0.0
+        assemble_matrix_by_map(mtx.data, self.mtx_in_els, imap, 1)
+
+        self.report('assembled:\n%s' % mtx.toarray())
+        self.report('expected:\n%s' % aux)
+        ok = self.compare_vectors(mtx, aux,
+                                  label1='assembled',
+                                  label2='expected') and ok
+        return ok
+
+    def test_assemble_colored(self):
+        from sfepy.discrete.common.extmods.assemble import (
+            create_cell_coloring, assemble_vector, assemble_vector_colored,
+            assemble_matrix, assemble_matrix_colored, create_assembling_map,
+            assemble_matrix_by_map_colored)
+
+        color_ptr, cells = create_cell_coloring(self.iels, self.conn,
+                                                self.num)
+        self.report('color offsets:', color_ptr, 'cells:', cells)
+        ok = (len(color_ptr) == 3) and (sorted(cells) == [0, 1])
+
+        vec0 = nm.zeros(self.num, dtype=nm.float64)
+        assemble_vector(vec0, self.vec_in_els, self.iels, 1, self.conn)
+        vec = nm.zeros(self.num, dtype=nm.float64)
+        assemble_vector_colored(vec, self.vec_in_els, self.iels, 1,
+                                self.conn, color_ptr, cells, 2)
+        ok = self.compare_vectors(vec, vec0,
+                                  label1='colored',
+                                  label2='serial') and ok
+
+        mtx0 = sps.csr_matrix(nm.ones((self.num, self.num),
+                                      dtype=nm.float64))
+        mtx0.data[:] = 0.0
+        assemble_matrix(mtx0.data, mtx0.indptr, mtx0.indices,
+                        self.mtx_in_els, self.iels, 1, self.conn, self.conn)
+        aux = mtx0.toarray()
+
+        mtx = mtx0.copy()
+        mtx.data[:] = 0.0
+        assemble_matrix_colored(mtx.data, mtx.indptr, mtx.indices,
+                                self.mtx_in_els, self.iels, 1,
+                                self.conn, self.conn, color_ptr, cells, 2)
+        ok = self.compare_vectors(mtx, aux,
+                                  label1='colored',
+                                  label2='serial') and ok
+
+        imap = create_assembling_map(mtx.indptr, mtx.indices, self.iels,
+                                     self.conn, self.conn)
+        mtx.data[:] = 0.0
+        assemble_matrix_by_map_colored(mtx.data, self.mtx_in_els, imap, 1,
+                                       color_ptr, cells, 2)
+        ok = self.compare_vectors(mtx, aux,
+                                  label1='colored by map',
+                                  label2='serial') and ok
+
+        return ok
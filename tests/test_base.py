@@ -170,3 +170,134 @@ class Test( TestCommon ):
                          (['a',{},[],None,True,False,"False"],{}))
 
         return True
+
+    def test_validate_positive_int(self):
+        from sfepy.base.goptions import validate_positive_int
+
+        ok = all(validate_positive_int(val) == 4 for val in [4, 4.0, '4'])
+        for val in [4.5, 0, -1, '0', '4.5', 'four']:
+            try:
+                validate_positive_int(val)
+
+            except ValueError:
+                pass
+
+            else:
+                self.report('accepted invalid value:', val)
+                ok = False
+
+        return ok
+
+    def test_lazy_class_tables(self):
+        """
+        Check that the generated class indices of the term and solver tables
+        are up to date and that the lazy tables return the same classes as
+        the eagerly loaded ones.
+        """
+        from sfepy.base.base import load_classes, LazyClassTable
+        import sfepy.discrete
+        from sfepy.terms import term_table, term_index, Term
+        from sfepy.solvers import solver_table, solver_index
+
+        ok = True
+        for table, index in [(term_table, term_index),
+                             (solver_table, solver_index)]:
+            _ok = table.create_index() == index
+            self.report('index up to date:', _ok)
+            ok = ok and _ok
+
+            eager = load_classes(table.filenames, table.classes,
+                                 package_name=table.package_name,
+                                 ignore_errors=table.ignore_errors)
+            _ok = ((sorted(table.keys()) == sorted(eager.keys()))
+                   and all(table[key] is eager[key] for key in eager))
+            self.report('same classes:', _ok)
+            ok = ok and _ok
+
+        # An outdated index: all files are loaded on a missing key.
+        table = LazyClassTable({}, term_table.filenames, [Term],
+                               ignore_errors=True)
+        table['dw_custom'] = Term
+        _ok = ((len(table) == 1)
+               and ('dw_custom' in table)
+               and ('dw_laplace' not in table)
+               and not table.all_loaded
+               and (table['dw_laplace'] is term_table['dw_laplace'])
+               and table.all_loaded
+               and (len(table) == len(term_table) + 1)
+               and (table['dw_custom'] is Term)
+               and ('dw_nonexistent' not in table))
+        self.report('outdated index:', _ok)
+        ok = ok and _ok
+
+        return ok
+
+    def test_file_output(self):
+        """
+        Check the buffered and threaded log file output.
+        """
+        import os.path as op
+        from sfepy.base.base import Output
+
+        filename = op.join(self.options.out_dir, 'test_file_output.txt')
+        lines = ['test %d' % ii for ii in range(1000)]
+        expected = ''.join('p: %s\n' % line for line in lines)
+
+        def read():
+            with open(filename) as fd:
+                return fd.read()
+
+        ok = True
+        for threaded in [False, True]:
+            output = Output('p:', filename=filename, quiet=True,
+                            flush_interval=None, threaded=threaded)
+            for line in lines:
+                output(line)
+
+            output.flush()
+            _ok1 = read() == expected
+
+            output('last')
+            output.close()
+            _ok2 = read() == expected + 'p: last\n'
+
+            # Append after reopening.
+            output.set_output(filename=filename, quiet=True, append=True,
+                              flush_interval=0, threaded=threaded)
+            output('appended')
+            _ok3 = threaded or (read() == expected + 'p: last\np: appended\n')
+            output.close()
+            _ok3 = _ok3 and (read() == expected + 'p: last\np: appended\n')
+
+            _ok = _ok1 and _ok2 and _ok3
+            self.report('threaded: %s, flush: %s, close: %s, append: %s'
+                        % (threaded, _ok1, _ok2, _ok3))
+            ok = ok and _ok
+
+        # The threaded writer flushes the buffered messages when idle.
+        import time
+        output = Output('p:', filename=filename, quiet=True,
+                        flush_interval=0.05, threaded=True)
+        output('idle')
+        for ii in range(100):
+            time.sleep(0.01)
+            if read() == 'p: idle\n': break
+
+        _ok = read() == 'p: idle\n'
+        output.close()
+        self.report('threaded idle flush:', _ok)
+        ok = ok and _ok
+
+        # A file object is flushed after each message.
+        with open(filename, 'w') as fd:
+            output = Output('p:', filename=fd, quiet=True,
+                            flush_interval=None)
+            output('file object')
+            _ok = read() == 'p: file object\n'
+            output.close()
+            _ok = _ok and not fd.closed
+
+        self.report('file object flushed:', _ok)
+        ok = ok and _ok
+
+        return ok
@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+import os.path as op
+
+import numpy as nm
+
+from sfepy.base.testing import TestCommon
+
+filename_conf = 'examples/linear_elasticity/elastodynamic.py'
+
+def _matrix_hook(mtx, pb, call_mode=None):
+    return mtx
+
+class Test(TestCommon):
+
+    @staticmethod
+    def from_conf(conf, options):
+        return Test(conf=conf, options=options)
+
+    def _create_problem(self, active_only, matrix_hook=None, n_step=5):
+        from sfepy.base.conf import ProblemConf, get_standard_keywords
+        from sfepy.discrete import Problem
+
+        required, other = get_standard_keywords()
+        conf = ProblemConf.from_file(op.join(op.dirname(__file__), '..',
+                                             filename_conf),
+                                     required, other)
+        conf.options.active_only = active_only
+        for solver_conf in conf.solvers.values():
+            if solver_conf.name == 'tsn':
+                solver_conf.t1 = n_step * solver_conf.dt
+                solver_conf.is_linear = False
+
+        pb = Problem.from_conf(conf)
+        pb.conf.options.output_dir = self.options.out_dir
+        pb.matrix_hook = matrix_hook
+        pb.init_solvers()
+
+        return pb
+
+    def test_block_graphs(self):
+        """
+        Check that the separately assembled blocks of the tangent matrix are
+        equal to the blocks of the whole matrix.
+        """
+        ok = True
+        for active_only in [True, False]:
+            pb = self._create_problem(active_only)
+            pb.set_default_state()
+            pb.time_update()
+            pb.update_materials()
+
+            _ok = (pb.mtx_a is None) and (len(pb.mtx_blocks) == 3)
+            self.report('active_only: %s, blocks only:' % active_only, _ok)
+            ok = ok and _ok
+
+            variables = pb.get_variables()
+            vec = nm.random.RandomState(0).rand(variables.adi.ptr[-1])
+            mtxs = pb.get_evaluator(reuse=True).eval_tangent_blocks(vec)
+
+            mtx = pb.equations.create_matrix_graph(active_only=active_only)
+            pb.mtx_a = mtx
+            mtx = pb.get_evaluator(reuse=True).eval_tangent_matrix(vec, mtx)
+            for name in variables.ordered_state:
+                ii = variables.get_indx(name, reduced=True)
+                mtx0 = mtx[ii, ii]
+                mtx1 = mtxs[(name, name)]
+                _ok = (nm.abs(mtx0 - mtx1).max()
+                       <= 1e-12 * nm.abs(mtx0).max())
+                self.report('active_only: %s, block %s:'
+                            % (active_only, name), _ok)
+                ok = ok and _ok
+
+        return ok
+
+    def test_block_solve(self):
+        """
+        Check that the elastodynamics solution with the separately assembled
+        blocks is the same as with the whole tangent matrix.
+        """
+        ok = True
+        for active_only in [True, False]:
+            vecs = []
+            for matrix_hook in [None, _matrix_hook]:
+                pb = self._create_problem(active_only, matrix_hook)
+                variables = pb.solve(save_results=False, verbose=False)
+                _ok = ((pb.mtx_blocks is None) == (matrix_hook is not None))
+                self.report('active_only: %s, hook: %s, blocks used:'
+                            % (active_only, matrix_hook is not None), _ok)
+                ok = ok and _ok
+
+                vecs.append(variables())
+
+            _ok = nm.allclose(vecs[0], vecs[1], rtol=1e-10,
+                              atol=1e-10 * nm.abs(vecs[0]).max())
+            self.report('active_only: %s, same solutions:' % active_only, _ok)
+            ok = ok and _ok
+
+        return ok
@@ -0,0 +1,215 @@
+from __future__ import absolute_import
+import os.path as op
+
+import numpy as nm
+
+from sfepy.base.testing import TestCommon
+from sfepy import data_dir
+
+filename_mesh = data_dir + '/meshes/2d/square_unit_tri.mesh'
+
+class Test(TestCommon):
+
+    @staticmethod
+    def from_conf(conf, options):
+        from sfepy.discrete import FieldVariable, Integral
+        from sfepy.discrete.fem import Mesh, FEDomain, Field
+
+        mesh = Mesh.from_file(filename_mesh)
+        domain = FEDomain('domain', mesh)
+        omega = domain.create_region('Omega', 'all')
+
+        field = Field.from_args('fu', nm.float64, 1, omega, approx_order=2)
+        u = FieldVariable('u', 'unknown', field)
+        u.set_data(nm.arange(u.n_dof, dtype=nm.float64))
+        v = FieldVariable('v', 'test', field, primary_var_name='u')
+
+        integral = Integral('i', order=2)
+
+        test = Test(conf=conf, options=options, u=u, v=v, omega=omega,
+                    integral=integral)
+        return test
+
+    def test_path_cache(self):
+        from sfepy.base.base import goptions
+        from sfepy.terms import Term
+        from sfepy.terms.terms_multilinear import ETermBase, PersistentCache
+
+        filename = op.abspath(op.join(self.options.out_dir,
+                                       'einsum_paths.pkl'))
+
+        # A subdomain with a different number of cells.
+        left = self.omega.domain.create_region('Left',
+                                               'vertices in (x < 0.0)',
+                                               'cell')
+
+        cache0 = ETermBase.path_cache
+        use_cache0 = goptions['cache_einsum_paths']
+        try:
+            goptions['cache_einsum_paths'] = True
+            ETermBase.path_cache = PersistentCache(filename=filename)
+            ETermBase.path_cache.clear(persistent=True)
+
+            vals = []
+            for ii in range(2):
+                term = Term.new('de_laplace(u, u)', self.integral,
+                                self.omega, u=self.u)
+                term.setup()
+                vals.append(term.evaluate(mode='eval'))
+
+            term = Term.new('de_laplace(u, u)', self.integral, left,
+                            u=self.u)
+            term.setup()
+            term.evaluate(mode='eval')
+
+            n_path = len(ETermBase.path_cache.values)
+
+            # A new cache instance reads the paths from the file.
+            cache = PersistentCache(filename=filename)
+            n_saved = len(cache.load())
+
+        finally:
+            ETermBase.path_cache = cache0
+            goptions['cache_einsum_paths'] = use_cache0
+
+        self.report('computed paths: %d, saved paths: %d' % (n_path, n_saved))
+        ok = (n_path == 1) and (n_saved == 1)
+        _ok = nm.allclose(vals[0], vals[1], rtol=0, atol=1e-14)
+        self.report('cached path result ok:', _ok)
+
+        return ok and _ok
+
+    def test_cache_pruning(self):
+        from sfepy.terms.terms_multilinear import PersistentCache
+
+        filename = op.abspath(op.join(self.options.out_dir,
+                                      'test_cache.pkl'))
+        cache = PersistentCache(filename=filename, max_size=3)
+        cache.clear(persistent=True)
+
+        for ii in range(5):
+            cache.set(ii, ii)
+            if ii == 2:
+                cache.get(0)
+
+        # Nothing is saved before flush().
+        ok = not op.exists(filename)
+        cache.flush()
+        other = PersistentCache(filename=filename, max_size=3)
+        other.set(5, 5)
+        other.flush()
+
+        keys = list(PersistentCache(filename=filename).load().keys())
+        self.report('saved keys:', keys)
+        ok = ok and (keys == [3, 4, 5])
+
+        return ok
+
+    def test_autotune(self):
+        from sfepy.terms import Term
+        from sfepy.terms.terms_multilinear import ETermBase, PersistentCache
+
+        filename = op.abspath(op.join(self.options.out_dir,
+                                      'eterm_backends.pkl'))
+
+        cache0 = ETermBase.tune_cache
+        try:
+            ETermBase.tune_cache = PersistentCache(filename=filename)
+            ETermBase.tune_cache.clear(persistent=True)
+
+            term = Term.new('de_laplace(v, u)', self.integral,
+                            self.omega, v=self.v, u=self.u)
+            term.setup()
+            mtx0 = term.evaluate(mode='weak', diff_var='u')[0]
+            res0 = term.evaluate(mode='weak')[0]
+
+            vals = []
+            choices = []
+            for ii in range(2):
+                term = Term.new('de_laplace(v, u)', self.integral,
+                                self.omega, v=self.v, u=self.u)
+                term.setup()
+                term.set_backend('auto',
+                                 tune_backends=('numpy', 'numpy_loop'),
+                                 tune_layouts=('cqgvd0', 'cqgdv0'),
+                                 tune_n_cell=10, tune_n_repeat=1)
+                # Alternate the modes to switch between the choices.
+                for diff_var in ['u', None, 'u', None]:
+                    val = term.evaluate(mode='weak', diff_var=diff_var)[0]
+                    vals.append((val, mtx0 if diff_var else res0))
+                    ok = (term.backend, term.layout) == \
+                        term.auto_choices[('weak', diff_var)]
+                    if not ok: break
+
+                choices.append(term.auto_choices)
+
+            n_choice = len(ETermBase.tune_cache.values)
+
+        finally:
+            ETermBase.tune_cache = cache0
+
+        self.report('selected backends:', choices)
+        ok = (ok and (n_choice == 2) and (choices[0] == choices[1])
+              and (len(choices[0]) == 2)
+              and all(backend in ('numpy', 'numpy_loop')
+                      for backend, layout in choices[0].values()))
+        for val, val0 in vals:
+            _ok = nm.allclose(val, val0, rtol=1e-13, atol=1e-13)
+            self.report('autotuned result ok:', _ok)
+            ok = ok and _ok
+
+        return ok
+
+    def test_block_backend(self):
+        from sfepy.discrete import FieldVariable
+        from sfepy.discrete.fem import Field
+        from sfepy.terms import Term
+
+        field = Field.from_args('fw', nm.float64, 2, self.omega,
+                                approx_order=2)
+        w = FieldVariable('w', 'unknown', field)
+        w.set_data(nm.linspace(0, 1, w.n_dof))
+        z = FieldVariable('z', 'test', field, primary_var_name='w')
+
+        cases = [
+            ('de_laplace(v, u)', 'weak', 'u', {'v' : self.v, 'u' : self.u}),
+            ('de_laplace(u, u)', 'eval', None, {'u' : self.u}),
+            ('de_convect(z, w)', 'weak', None, {'z' : z, 'w' : w}),
+            ('de_convect(z, w)', 'weak', 'w', {'z' : z, 'w' : w}),
+        ]
+
+        ok = True
+        for expr, mode, diff_var, args in cases:
+            vals = []
+            for backend, kwargs in [('numpy', {}),
+                                    ('numpy_block', {}),
+                                    ('numpy_block', {'c_chunk_size' : 7})]:
+                term = Term.new(expr, self.integral, self.omega, **args)
+                term.setup()
+                term.set_backend(backend, **kwargs)
+                val = term.evaluate(mode=mode, diff_var=diff_var)
+                vals.append(val[0] if mode == 'weak' else val)
+
+            _ok = all(nm.allclose(val, vals[0], rtol=1e-13, atol=1e-13)
+                      for val in vals[1:])
+            self.report('%s %s %s:' % (expr, mode, diff_var), _ok)
+            ok = ok and _ok
+
+        # The block size is determined only once.
+        term = Term.new('de_laplace(v, u)', self.integral, self.omega,
+                        v=self.v, u=self.u)
+        term.setup()
+        term.set_backend('numpy_block')
+        calls = []
+        get_block_size = term.get_block_size
+        def _get_block_size(*args):
+            calls.append(args)
+            return get_block_size(*args)
+        term.get_block_size = _get_block_size
+        for ii in range(3):
+            term.evaluate(mode='weak', diff_var='u')
+        _ok = len(calls) == 1
+        self.report('block size computed %d times' % len(calls))
+        ok = ok and _ok
+
+        return ok
@@ -59,6 +59,7 @@ materials = {
     'mf4' : 'get_pars',
     'mf5' : ({'a' : -2 - 1j},),
     'mf6' : ({'a' : {'Circle' : 1 + 1j, 'Rest' : 3j}},),
+    'mf7' : ({'a' : {'Circle' : 2.0, 'Rest' : 3.0}},),
 }
 
 fields = {
@@ -179,11 +180,62 @@ class Test( TestCommon ):
         mat6 = materials['mf6']
         key = mat6.get_keys(region_name='Circle')[0]
         assert_(nm.all(mat6.get_data(key, 'a') == 1 + 1j))
+        # Constant in the term region -> not repeated in cells.
+        assert_(mat6.get_data(key, 'a').shape[0] == 1)
         key = mat6.get_keys(region_name='Rest')[0]
         assert_(nm.all(mat6.get_data(key, 'a') == 3j))
+        assert_(mat6.get_data(key, 'a').shape[0] == 1)
 
         return True
 
+    def test_material_by_region_eval(self):
+        """
+        Compare the terms evaluated in a region spanning two material regions
+        (values in all quadrature points) with the sum of the terms evaluated
+        in the material regions (compact constant values).
+        """
+        from sfepy.discrete import Material
+
+        problem = self.problem
+        problem.set_equations(self.conf.equations)
+        problem.time_update()
+
+        conf_mat = self.conf.get_item_by_name('materials', 'mf7')
+        mat = Material.from_conf(conf_mat, problem.functions)
+
+        p = problem.get_variables()['p']
+        p.set_data(nm.linspace(0, 1, p.n_dof))
+
+        ok = True
+        for name in ['dw_laplace', 'de_laplace']:
+            exprs = ['%s.2.Omega(mf7.a, q, p)' % name,
+                     '%s.2.Circle(mf7.a, q, p) + %s.2.Rest(mf7.a, q, p)'
+                     % (name, name)]
+            for dw_mode in ['vector', 'matrix']:
+                vals = []
+                for expr in exprs:
+                    val = problem.evaluate(expr, mode='weak',
+                                           dw_mode=dw_mode, p=p, mf7=mat,
+                                           copy_materials=False,
+                                           verbose=False)
+                    vals.append(val.toarray() if dw_mode == 'matrix'
+                                else val)
+
+                _ok = nm.allclose(vals[0], vals[1], rtol=1e-14, atol=1e-14)
+                self.report('%s %s: %s' % (name, dw_mode, _ok))
+                ok = ok and _ok
+
+        # Check that both the compact and per-QP data were used.
+        n_qp = {}
+        for region_name in ['Omega', 'Circle', 'Rest']:
+            key = mat.get_keys(region_name=region_name)[0]
+            n_qp[region_name] = mat.get_data(key, 'a').shape[0]
+        self.report('material data lengths:', n_qp)
+        _ok = (n_qp['Omega'] > 1) and (n_qp['Circle'] == n_qp['Rest'] == 1)
+        ok = ok and _ok
+
+        return ok
+
     def test_ebc_functions(self):
         import os.path as op
         problem = self.problem
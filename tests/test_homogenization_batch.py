@@ -0,0 +1,45 @@
+from __future__ import absolute_import
+import numpy as nm
+
+input_name = '../examples/homogenization/linear_homogenization.py'
+
+from sfepy.base.testing import TestCommon
+
+class Test(TestCommon):
+
+    @staticmethod
+    def from_conf(conf, options):
+        return Test(conf=conf, options=options)
+
+    def test_batch_solve(self):
+        import os.path as op
+        from sfepy.base.base import Struct
+        from sfepy.base.conf import ProblemConf, get_standard_keywords
+        from sfepy.homogenization.homogen_app import HomogenizationApp
+
+        required, other = get_standard_keywords()
+        required.remove('equations')
+        full_name = op.join(op.dirname(__file__), input_name)
+
+        options = Struct(output_filename_trunk=None,
+                         save_ebc=False,
+                         save_ebc_nodes=False,
+                         save_regions=False,
+                         save_field_meshes=False,
+                         save_regions_as_groups=False,
+                         solve_not=False)
+
+        all_coefs = []
+        for batch_solve in [True, False]:
+            conf = ProblemConf.from_file(full_name, required, other)
+            conf.options['output_dir'] = './output-tests'
+            conf.requirements['corrs_rs']['batch_solve'] = batch_solve
+
+            app = HomogenizationApp(conf, options, 'homogen:')
+            all_coefs.append(app())
+
+        d0, d1 = all_coefs[0].D, all_coefs[1].D
+        err = nm.abs(d0 - d1).max() / nm.abs(d1).max()
+        self.report('relative error of batched D: %e' % err)
+
+        return err < 1e-12
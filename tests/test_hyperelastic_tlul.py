@@ -74,3 +74,61 @@ class Test(TestCommon):
                                          allowed_error=rerr)
 
         return ok
+
+    def test_fused_terms(self):
+        """
+        Check that the fused evaluation of the hyperelastic terms gives the
+        same residual and tangent matrix as the individual terms.
+        """
+        from sfepy.base.conf import ProblemConf, get_standard_keywords
+        from sfepy.discrete import Problem
+        import numpy as nm
+        import os.path as op
+
+        ok = True
+        for hp in ['TL', 'UL']:
+            required, other = get_standard_keywords()
+            input_name = op.join(op.dirname(__file__), input_names[hp])
+            conf = ProblemConf.from_file(input_name, required, other)
+
+            pb = Problem.from_conf(conf, init_solvers=False)
+            pb.time_update()
+            pb.update_materials()
+
+            variables = pb.set_default_state()
+            coors = variables['u'].field.get_coor()
+            vals = 0.05 * nm.sin(coors[:, [1, 2, 0]])
+            variables.set_state_parts({'u' : vals.ravel()})
+            variables.apply_ebc()
+            vec = variables()
+
+            eqs = pb.equations
+            eq = eqs['balance']
+            groups = eq.get_term_groups()
+            _ok = (len(groups) == 1) and (len(groups[0]) == len(eq.terms))
+            self.report('%s: one term group:' % hp, _ok)
+            ok = ok and _ok
+
+            vec_r0 = eqs.eval_residuals(vec)
+            mtx0 = eqs.eval_tangent_matrices(vec, pb.mtx_a.copy())
+
+            vec_r1 = eqs.create_reduced_vec()
+            mtx1 = pb.mtx_a.copy()
+            mtx1.data[:] = 0.0
+            for term in eq.terms:
+                val, iels = term.evaluate(mode='weak', standalone=False)
+                term.assemble_to(vec_r1, val, iels, mode='vector')
+
+                val, iels = term.evaluate(mode='weak', diff_var='u',
+                                          standalone=False)
+                term.assemble_to(mtx1, val, iels, mode='matrix',
+                                 diff_var=term.get_args_by_name(['u'])[0])
+
+            _ok = (nm.allclose(vec_r0, vec_r1, rtol=1e-12,
+                               atol=1e-12 * nm.abs(vec_r0).max())
+                   and (nm.abs(mtx0 - mtx1).max()
+                        < 1e-12 * nm.abs(mtx0).max()))
+            self.report('%s: same residual and tangent matrix:' % hp, _ok)
+            ok = ok and _ok
+
+        return ok
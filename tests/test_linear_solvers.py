@@ -302,3 +302,59 @@ class Test(TestCommon):
             self.report('sol0 == 2 * sol2:', _ok); ok = ok and _ok
 
         return ok
+
+    def test_mtx_digest(self):
+        import scipy.sparse as sps
+        from sfepy.solvers.ls import _is_new_matrix, _is_new_pattern
+
+        mtx = sps.random(20, 20, density=0.2, format='csr', random_state=0)
+        is_new0, digest0 = _is_new_matrix(mtx, (0, '', ''))
+        is_new1, digest1 = _is_new_matrix(mtx, digest0)
+
+        mtx.data *= 2.0
+        is_new2, digest2 = _is_new_matrix(mtx, digest1)
+
+        mtx2 = mtx + sps.eye(20, format='csr')
+        is_new3, digest3 = _is_new_matrix(mtx2, digest2)
+
+        ok = is_new0 and (not is_new1) and is_new2 and is_new3
+        self.report('new matrix detection:', ok)
+
+        _ok = ((not _is_new_pattern(digest1, digest2))
+               and _is_new_pattern(digest2, digest3)
+               and _is_new_pattern((0, '', ''), digest0))
+        self.report('new pattern detection:', _ok)
+        ok = ok and _ok
+
+        # Non-CSR matrices have unknown patterns.
+        is_new4, digest4 = _is_new_matrix(mtx.tocsc(), digest3)
+        _ok = (is_new4 and _is_new_pattern(digest3, digest4)
+               and _is_new_pattern(digest4, digest4)
+               and _is_new_pattern((0, '', ''), (0, '', '')))
+        self.report('unknown pattern detection:', _ok)
+
+        return ok and _ok
+
+    def test_block_diagonal_inverse(self):
+        import numpy as nm
+        import scipy.sparse as sps
+        import scipy.sparse.linalg as spla
+        from sfepy.solvers.ts_dg_solvers import get_block_diagonal_inverse
+
+        rng = nm.random.RandomState(0)
+        blocks = [rng.rand(size, size) + size * nm.eye(size)
+                  for size in [3, 3, 1, 6, 3, 1]]
+        mtx = sps.block_diag(blocks, format='csr')
+        perm = rng.permutation(mtx.shape[0])
+        mtx = mtx[perm][:, perm]
+
+        apply_inverse = get_block_diagonal_inverse(mtx)
+        vec = rng.rand(mtx.shape[0])
+        sol = spla.spsolve(mtx.tocsc(), vec)
+        ok = nm.allclose(apply_inverse(vec), sol, rtol=1e-12, atol=1e-12)
+        self.report('block-diagonal inverse:', ok)
+
+        _ok = get_block_diagonal_inverse(mtx, max_block_size=5) is None
+        self.report('too large blocks detected:', _ok)
+
+        return ok and _ok
@@ -0,0 +1,115 @@
+from __future__ import absolute_import
+import os.path as op
+
+import numpy as nm
+
+from sfepy.base.testing import TestCommon
+
+filename_conf = 'examples/linear_elasticity/elastodynamic.py'
+
+class Test(TestCommon):
+
+    @staticmethod
+    def from_conf(conf, options):
+        return Test(conf=conf, options=options)
+
+    def _solve(self, ts_name, lumping, is_linear=True, n_step=5):
+        from sfepy.base.conf import ProblemConf, get_standard_keywords
+        from sfepy.discrete import Problem
+        from sfepy.base.timing import Timer
+
+        required, other = get_standard_keywords()
+        conf = ProblemConf.from_file(op.join(op.dirname(__file__), '..',
+                                             filename_conf),
+                                     required, other)
+        conf.materials['material_solid__0'].values['.lumping'] = lumping
+        conf.equations['balance_of_forces'] = """
+             dw_mass.i.Omega(solid.rho, solid.lumping, ddv, ddu)
+           + dw_zero.i.Omega(dv, du)
+           + dw_lin_elastic.i.Omega(solid.D, v, u) = 0"""
+        for solver_conf in conf.solvers.values():
+            if solver_conf.name == ts_name:
+                solver_conf.t1 = n_step * solver_conf.dt
+                solver_conf.is_linear = is_linear
+        conf.options.ts = ts_name
+
+        pb = Problem.from_conf(conf)
+        pb.conf.options.output_dir = self.options.out_dir
+
+        timer = Timer(start=True)
+        variables = pb.solve(save_results=False, verbose=False)
+        time = timer.stop()
+
+        return variables(), time
+
+    def test_lumped_mass(self):
+        """
+        Check that the explicit solution with the lumped mass matrix by the
+        vector division is the same as the one by the nonlinear solver.
+        """
+        ok = True
+        for lumping in ['row_sum', 'hrz']:
+            vec0, time0 = self._solve('tsvv', lumping, is_linear=False)
+            vec1, time1 = self._solve('tsvv', lumping, is_linear=True)
+            self.report('%s: nonlinear solver: %.2f s, division: %.2f s'
+                        % (lumping, time0, time1))
+
+            _ok = nm.allclose(vec0, vec1, rtol=1e-10,
+                              atol=1e-10 * nm.abs(vec0).max())
+            self.report('%s: same solutions:' % lumping, _ok)
+            ok = ok and _ok
+
+        return ok
+
+    def test_consistent_mass(self):
+        """
+        Check that the consistent mass matrix gives the same results as
+        dw_dot.
+        """
+        from sfepy.discrete import FieldVariable, Integral, Material
+        from sfepy.discrete.fem import Mesh, FEDomain, Field
+        from sfepy.terms import Term
+        from sfepy import data_dir
+
+        mesh = Mesh.from_file(data_dir + '/meshes/3d/cylinder.mesh')
+        domain = FEDomain('domain', mesh)
+        omega = domain.create_region('Omega', 'all')
+        integral = Integral('i', order=4)
+
+        ok = True
+        for n_c in [1, 3]:
+            field = Field.from_args('f', nm.float64, n_c, omega,
+                                    approx_order=2)
+            u = FieldVariable('u', 'unknown', field)
+            u.set_data(nm.linspace(0, 1, u.n_dof))
+            v = FieldVariable('v', 'test', field, primary_var_name='u')
+
+            mat = Material('m', rho=2.0, values={'.lumping' : 'consistent'})
+            vals = []
+            for expr in ['dw_dot(m.rho, v, u)',
+                         'dw_mass(m.rho, m.lumping, v, u)']:
+                term = Term.new(expr, integral, omega, m=mat, v=v, u=u)
+                term.setup()
+                vals.append((term.evaluate(mode='weak')[0],
+                             term.evaluate(mode='weak', diff_var='u')[0]))
+
+            _ok = all(nm.allclose(val0, val1, rtol=1e-12, atol=1e-16)
+                      for val0, val1 in zip(*vals))
+            self.report('%d components: same as dw_dot:' % n_c, _ok)
+            ok = ok and _ok
+
+            for lumping in ['row_sum', 'hrz']:
+                mat = Material('m', rho=2.0, values={'.lumping' : lumping})
+                term = Term.new('dw_mass(m.rho, m.lumping, v, u)', integral,
+                                omega, m=mat, v=v, u=u)
+                term.setup()
+                mtx = term.evaluate(mode='weak', diff_var='u')[0][:, 0]
+                off = mtx * (1 - nm.eye(mtx.shape[1]))
+
+                _ok = (nm.allclose(mtx.sum(), vals[0][1].sum(), rtol=1e-12)
+                       and not off.any())
+                self.report('%d components, %s: diagonal, same mass:'
+                            % (n_c, lumping), _ok)
+                ok = ok and _ok
+
+        return ok
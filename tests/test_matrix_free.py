@@ -0,0 +1,122 @@
+from __future__ import absolute_import
+import os.path as op
+
+import numpy as nm
+
+from sfepy.base.testing import TestCommon
+
+filename_confs = {
+    'linear' : 'examples/diffusion/poisson_short_syntax.py',
+    'nonlinear' : 'examples/large_deformation/hyperelastic.py',
+}
+
+class Test(TestCommon):
+
+    @staticmethod
+    def from_conf(conf, options):
+        return Test(conf=conf, options=options)
+
+    def _create_problem(self, kind, matrix_free=False, ls_conf=None):
+        from sfepy.base.conf import ProblemConf, get_standard_keywords
+        from sfepy.discrete import Problem
+
+        required, other = get_standard_keywords()
+        conf = ProblemConf.from_file(op.join(op.dirname(__file__), '..',
+                                             filename_confs[kind]),
+                                     required, other)
+        if kind == 'linear':
+            for field_conf in conf.fields.values():
+                field_conf.approx_order = 2
+
+        if ls_conf is not None:
+            for solver_conf in conf.solvers.values():
+                if solver_conf.name == 'ls':
+                    solver_conf.__dict__.update(ls_conf)
+
+                elif solver_conf.name == 'newton':
+                    solver_conf.is_linear = True
+
+        conf.options.matrix_free = matrix_free
+
+        pb = Problem.from_conf(conf)
+        pb.conf.options.output_dir = self.options.out_dir
+        pb.init_solvers()
+
+        return pb
+
+    def test_operator(self):
+        """
+        Check the matrix-free operator action and diagonal against the
+        assembled tangent matrix.
+        """
+        from sfepy.discrete.evaluate import MatrixFreeOperator
+
+        ok = True
+        for kind in ['linear', 'nonlinear']:
+            pb = self._create_problem(kind)
+            pb.set_default_state()
+            pb.time_update()
+            pb.update_materials()
+
+            variables = pb.get_variables()
+            ev = pb.get_evaluator(reuse=True)
+            rng = nm.random.RandomState(0)
+            if kind == 'linear':
+                vec0 = None
+                vec = variables.create_reduced_vec()
+                rtol = 1e-12
+
+            else:
+                coors = variables['u'].field.get_coor()
+                vals = 0.05 * nm.sin(coors[:, [1, 2, 0]])
+                variables.set_state_parts({'u' : vals.ravel()})
+                vec = variables.reduce_vec(variables())
+                vec0 = ev.make_full_vec(vec)
+                rtol = 1e-5
+
+            mtx = ev.eval_tangent_matrix(vec, pb.mtx_a.copy())
+
+            mop = MatrixFreeOperator(pb, vec0=vec0)
+            dvec = rng.rand(mtx.shape[1])
+            val0 = mtx * dvec
+            val1 = mop * dvec
+            _ok = nm.allclose(val0, val1, rtol=0,
+                              atol=rtol * nm.abs(val0).max())
+            self.report('%s: matrix-vector product:' % kind, _ok)
+            ok = ok and _ok
+
+            diag0 = mtx.diagonal()
+            diag1 = mop.diagonal()
+            _ok = nm.allclose(diag0, diag1, rtol=1e-12,
+                              atol=1e-12 * nm.abs(diag0).max())
+            self.report('%s: diagonal:' % kind, _ok)
+            ok = ok and _ok
+
+        return ok
+
+    def test_solve(self):
+        """
+        Check that the solution with the matrix-free operator and the
+        Jacobi-preconditioned CG is the same as the direct solution.
+        """
+        ls_conf = {'kind' : 'ls.scipy_iterative',
+                   'method' : 'cg',
+                   'precond' : 'jacobi',
+                   'i_max' : 1000,
+                   'eps_a' : 1e-14,
+                   'eps_r' : 1e-14}
+        vecs = []
+        for matrix_free, _ls_conf in [(False, None), (True, ls_conf)]:
+            pb = self._create_problem('linear', matrix_free=matrix_free,
+                                      ls_conf=_ls_conf)
+            variables = pb.solve(save_results=False)
+            vecs.append(variables())
+
+            _ok = (pb.mtx_a is None) == matrix_free
+            self.report('matrix-free: %s, no matrix:' % matrix_free, _ok)
+
+        ok = _ok and nm.allclose(vecs[0], vecs[1], rtol=1e-8,
+                                 atol=1e-8 * nm.abs(vecs[0]).max())
+        self.report('same solutions:', ok)
+
+        return ok
@@ -369,3 +369,43 @@ class Test(TestCommon):
             ok = ok and _ok
 
         return ok
+
+    def test_get_potential_cells(self):
+        from sfepy import data_dir
+        from sfepy.discrete.fem import Mesh
+        from sfepy.discrete.common.global_interp import get_potential_cells
+
+        ok = True
+        for name in ['/meshes/3d/block.mesh', '/meshes/2d/square_quad.mesh']:
+            mesh = Mesh.from_file(data_dir + name)
+            cmesh = mesh.cmesh
+
+            bbox = mesh.get_bounding_box()
+            coors = (bbox[0] - 0.1 * (bbox[1] - bbox[0])
+                     + 1.2 * (bbox[1] - bbox[0])
+                     * nm.random.rand(500, mesh.dim))
+            coors[:10] = mesh.coors[:10]
+
+            # Brute force reference.
+            centroids = cmesh.get_centroids(cmesh.tdim)
+            cc = cmesh.get_cell_conn().indices.reshape(cmesh.n_el, -1)
+            radii = nm.abs(mesh.coors[cc]
+                           - centroids[:, None]).max(axis=2).max(axis=1)
+            dist = nm.abs(coors[:, None] - centroids[None]).max(axis=2)
+
+            pcs, offsets = get_potential_cells(coors, cmesh,
+                                               extrapolate=False)
+            _ok = len(offsets) == (len(coors) + 1)
+            for ip in range(len(coors)):
+                ics = nm.where(dist[ip] <= radii)[0]
+                _ok = _ok and nm.array_equal(pcs[offsets[ip]:offsets[ip+1]],
+                                             ics)
+
+            pcs, offsets = get_potential_cells(coors, cmesh,
+                                               extrapolate=True)
+            _ok = _ok and (nm.diff(offsets) > 0).all()
+
+            self.report('%s: %s' % (name, _ok))
+            ok = ok and _ok
+
+        return ok
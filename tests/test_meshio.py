@@ -54,7 +54,8 @@ class Test(TestCommon):
     """Write test names explicitely to impose a given order of evaluation."""
     tests = ['test_read_meshes', 'test_compare_same_meshes',
              'test_read_dimension', 'test_write_read_meshes',
-             'test_hdf5_meshio']
+             'test_hdf5_meshio', 'test_hdf5_stream_writer',
+             'test_extract_time_history', 'test_time_history_chunks']
 
     @staticmethod
     def from_conf(conf, options):
@@ -411,3 +412,202 @@ class Test(TestCommon):
             self.assert_equal(val, data[key])
 
         return True
+
+    def test_hdf5_stream_writer(self):
+        import numpy as nm
+        from sfepy.base.base import Struct
+        from sfepy.discrete.fem import Mesh
+        from sfepy.discrete.fem.meshio import HDF5MeshIO, HDF5StreamWriter
+        from sfepy.solvers.ts import TimeStepper
+
+        conf_dir = op.dirname(__file__)
+        mesh = Mesh.from_file(data_dir
+                              + '/meshes/various_formats/small3d.mesh',
+                              prefix_dir=conf_dir)
+        n_nod, n_el = mesh.n_nod, mesh.n_el
+
+        ts = TimeStepper(0, 1, n_step=4)
+        vals = []
+        filename = op.join(self.options.out_dir, 'test_stream.h5')
+        for async_flush in [False, True]:
+            writer = HDF5StreamWriter(filename, mesh, ts=ts, complevel=1,
+                                      chunk_steps=2, async_flush=async_flush)
+            for step, time in ts:
+                out = {
+                    'u' : Struct(name='output_data', mode='vertex',
+                                 data=nm.full((n_nod, 3), time),
+                                 var_name='u', dofs=None),
+                    'p' : Struct(name='output_data', mode='cell',
+                                 data=nm.full((n_el, 1, 1, 1), step),
+                                 var_name='p', dofs=None),
+                }
+                writer.write(out, ts=ts)
+                if step == 1:
+                    writer.flush()
+
+            writer.close()
+
+            io = HDF5MeshIO(filename)
+            steps, times, _ = io.read_times()
+            ok = (steps == nm.arange(4)).all() and nm.allclose(times,
+                                                               ts.times)
+            self.report('steps and times ok:', ok)
+
+            data = io.read_data(2)
+            ok = ok and nm.allclose(data['u'].data, ts.times[2])
+            ok = ok and (data['p'].data == 2).all()
+            self.report('step data ok:', ok)
+
+            th = io.read_time_history('__u', [0, n_nod - 1])
+            ok = ok and (th[0].shape == (4, 3))
+            ok = ok and nm.allclose(th[n_nod - 1][:, 0], ts.times)
+            self.report('time history ok:', ok)
+
+            vals.append(ok)
+
+        return all(vals)
+
+    def test_extract_time_history(self):
+        import numpy as nm
+        from sfepy.base.base import Struct
+        from sfepy.discrete.fem import Mesh
+        from sfepy.discrete.fem.meshio import HDF5MeshIO, HDF5StreamWriter
+        from sfepy.postprocess.time_history import (extract_time_history,
+                                                    convert_to_series)
+        from sfepy.solvers.ts import TimeStepper
+
+        conf_dir = op.dirname(__file__)
+        mesh = Mesh.from_file(data_dir
+                              + '/meshes/various_formats/small3d.mesh',
+                              prefix_dir=conf_dir)
+        n_nod, n_el = mesh.n_nod, mesh.n_el
+        conn = mesh.get_conn(mesh.descs[0])
+
+        def get_out(step, time):
+            u = nm.arange(3 * n_nod, dtype=nm.float64).reshape((n_nod, 3))
+            p = nm.arange(n_el, dtype=nm.float64).reshape((n_el, 1, 1, 1))
+            return {
+                'u' : Struct(name='output_data', mode='vertex',
+                             data=u * (time + 1), var_name='u', dofs=None),
+                'p' : Struct(name='output_data', mode='cell',
+                             data=p + step, var_name='p', dofs=None),
+            }
+
+        ts = TimeStepper(0, 1, n_step=3)
+        legacy = op.join(self.options.out_dir, 'test_th_legacy.h5')
+        stream = op.join(self.options.out_dir, 'test_th_stream.h5')
+        io = HDF5MeshIO(legacy)
+        writer = HDF5StreamWriter(stream, mesh, ts=ts)
+        for step, time in ts:
+            out = get_out(step, time)
+            io.write(legacy, mesh, out, ts=ts)
+            writer.write(out, ts=ts)
+        writer.close()
+
+        converted = op.join(self.options.out_dir, 'test_th_converted.h5')
+        convert_to_series(legacy, converted, verbose=False)
+
+        ok = True
+        for filename in [legacy, stream, converted]:
+            extract = 'u n 0 %d, p e 0 %d' % (n_nod - 1, n_el - 1)
+            ths, _ = extract_time_history(filename, extract, verbose=False)
+            _ok = nm.allclose(ths['u'][n_nod - 1][:, 2],
+                              (3 * n_nod - 1) * (ts.times + 1))
+            _ok = _ok and nm.allclose(ths['p'][n_el - 1][:, 0],
+                                      n_el - 1 + nm.arange(ts.n_step))
+
+            ths, _ = extract_time_history(filename, 'u e 1', verbose=False)
+            _ok = _ok and (sorted(ths['u'][1].keys()) == sorted(conn[1]))
+            for ip in conn[1]:
+                _ok = _ok and nm.allclose(ths['u'][1][ip][:, 0],
+                                          3 * ip * (ts.times + 1))
+            self.report('%s: %s' % (op.basename(filename), _ok))
+            ok = ok and _ok
+
+        return ok
+
+    def test_time_history_chunks(self):
+        import numpy as nm
+        from sfepy.base.base import Struct
+        from sfepy.discrete.fem import Mesh
+        from sfepy.discrete.fem.meshio import HDF5MeshIO, HDF5StreamWriter
+        from sfepy.solvers.ts import TimeStepper
+
+        conf_dir = op.dirname(__file__)
+        mesh = Mesh.from_file(data_dir + '/meshes/3d/cylinder.mesh',
+                              prefix_dir=conf_dir)
+        n_nod = mesh.n_nod
+
+        ts = TimeStepper(0, 1, n_step=5)
+        filename = op.join(self.options.out_dir, 'test_th_chunks.h5')
+        writer = HDF5StreamWriter(filename, mesh, ts=ts, complevel=4,
+                                  chunk_steps=4, chunk_size=2**10)
+        u = nm.arange(3 * n_nod, dtype=nm.float64).reshape((n_nod, 3))
+        for step, time in ts:
+            out = {'u' : Struct(name='output_data', mode='vertex',
+                                data=u * (time + 1), var_name='u',
+                                dofs=None)}
+            writer.write(out, ts=ts)
+        chunkshape = writer.arrays['u'].chunkshape
+        writer.close()
+
+        # The chunks hold 4 * 3 * 8 bytes per vertex -> 10 vertices.
+        self.report('chunk shape:', chunkshape)
+        ok = chunkshape == (4, 10, 3)
+
+        # Record the selections of the partial read.
+        import tables as pt
+        selections = []
+        getitem = pt.Array.__getitem__
+        def _getitem(self, key):
+            selections.append((self.chunkshape, key))
+            return getitem(self, key)
+
+        indx = nm.array([0, 1, n_nod // 2, n_nod - 1])
+        io = HDF5MeshIO(filename)
+        pt.Array.__getitem__ = _getitem
+        try:
+            th = io.read_time_history('__u', indx)
+
+        finally:
+            pt.Array.__getitem__ = getitem
+
+        touched = set()
+        for cshape, (steps, rows) in selections:
+            steps = nm.arange(ts.n_step)[steps]
+            for ichunk in nm.unique(steps // cshape[0]):
+                for irow in nm.unique(nm.asarray(rows) // cshape[1]):
+                    touched.add((ichunk, irow))
+
+        n_chunk_row = -(-n_nod // chunkshape[1])
+        n_chunk_step = -(-ts.n_step // chunkshape[0])
+        self.report('selections: %d, chunks touched by partial read: %d of %d'
+                    % (len(selections), len(touched),
+                       n_chunk_row * n_chunk_step))
+        _ok = ((len(selections) == 1) and (n_chunk_row > 10)
+               and (len(touched) == 3 * n_chunk_step))
+        ok = ok and _ok
+
+        for ii in indx:
+            _ok = nm.allclose(th[ii], u[ii] * (ts.times[:, None] + 1),
+                              rtol=0, atol=1e-12)
+            ok = ok and _ok
+        self.report('partial read values ok:', ok)
+
+        # A file without any time steps.
+        filename = op.join(self.options.out_dir, 'test_th_empty.h5')
+        io = HDF5MeshIO(filename)
+        io.write(filename, mesh)
+        try:
+            io.read_time_history('__u', indx)
+
+        except ValueError:
+            _ok = True
+
+        else:
+            _ok = False
+
+        self.report('no time steps detected:', _ok)
+        ok = ok and _ok
+
+        return ok
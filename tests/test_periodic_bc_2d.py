@@ -130,3 +130,36 @@ class Test( TestCommon ):
         state = variables.create_vec()
         variables.apply_ebc(state)
         return variables.has_ebc(state)
+
+    def test_match_by_projection(self):
+        import numpy as nm
+        import sfepy.discrete.fem.periodic as per
+
+        # Shifted and shuffled nodes of a skewed periodic pair of planes.
+        rng = nm.random.RandomState(0)
+        coors1 = nm.c_[nm.zeros(1000), rng.rand(1000, 2)]
+        direction = nm.array([1.0, 0.5, 0.0])
+        perm = rng.permutation(1000)
+        coors2 = coors1[perm] + 2.0 * direction
+
+        i1, i2 = per.match_plane_by_dir(coors1, coors2, direction,
+                                        get_saved=False)
+        ok = (nm.array_equal(i1, nm.arange(1000))
+              and nm.array_equal(perm[i2], i1))
+        self.report('projected nodes matched:', ok)
+
+        coors2[[3, 7]] += [0.0, 1e-3, 0.0]
+        try:
+            per.match_plane_by_dir(coors1, coors2, direction,
+                                   get_saved=False)
+
+        except ValueError as exc:
+            self.report('unmatched nodes reported:', exc)
+            _ok = '(2 and 2 unmatched nodes)' in str(exc)
+
+        else:
+            _ok = False
+
+        ok = ok and _ok
+
+        return ok
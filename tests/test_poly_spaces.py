@@ -396,3 +396,55 @@ class Test(TestCommon):
             ok = ok and _ok
 
         return ok
+
+    def test_sum_factorization(self):
+        """
+        Test the sum-factorized evaluation of tensor product bases against
+        the full basis tables.
+        """
+        from sfepy.linalg import combine
+        from sfepy.discrete import Integral, PolySpace
+        from sfepy.discrete.fem.poly_spaces import SumFactorization
+
+        ok = True
+        bases = ([ii for ii in combine([['2_4', '3_8'],
+                                        ['lagrange', 'lobatto']])])
+
+        rng = nm.random.RandomState(0)
+        for geom, poly_space_base in bases:
+            for order in [1, 2, 4]:
+                self.report('geometry: %s, base: %s, order: %d'
+                            % (geom, poly_space_base, order))
+
+                integral = Integral('i', order=2 * order + 7)
+                coors, _ = integral.get_qp(geom)
+                coors1d = SumFactorization.get_coors_1d(coors)
+                if coors1d is None:
+                    self.report('not a tensor product quadrature!')
+                    ok = False
+                    continue
+
+                ps = PolySpace.any_from_args('ps', self.gels[geom], order,
+                                             base=poly_space_base)
+                sf = SumFactorization(ps, coors1d)
+
+                bf = ps.eval_base(coors)[:, 0, :]
+                bfg = ps.eval_base(coors, diff=True)
+
+                dofs = rng.rand(3, 2, ps.n_nod)
+                vals = rng.rand(3, 2, coors.shape[0])
+                gvals = rng.rand(3, 2, coors.shape[1], coors.shape[0])
+                errs = [
+                    sf.eval_base(dofs) - nm.einsum('qn,cin->ciq', bf, dofs),
+                    sf.eval_grad(dofs) - nm.einsum('qdn,cin->cidq',
+                                                   bfg, dofs),
+                    sf.integrate(vals) - nm.einsum('qn,ciq->cin', bf, vals),
+                    sf.integrate_grad(gvals) - nm.einsum('qdn,cidq->cin',
+                                                         bfg, gvals),
+                ]
+                err = max(nm.abs(val).max() for val in errs)
+                _ok = err < 1e-12
+                self.report('max. error: %.2e ok: %s' % (err, _ok))
+                ok = ok and _ok
+
+        return ok
@@ -162,3 +162,55 @@ class Test(TestCommon):
         ok = ok and _ok
 
         return ok
+
+    def test_create_regions(self):
+        """
+        Test that the shared sub-expressions of region selectors are evaluated
+        only once and give the same regions as the separate evaluation.
+        """
+        import sfepy.discrete.common.domain as dm
+        from sfepy.base.conf import transform_regions
+
+        domain = self.domain
+        regions = {
+            'Omega' : 'all',
+            'A' : ('vertices in (z < 0.1) & (x < 0.1)', 'facet'),
+            'B' : ('vertices in (z < 0.1)  &  (x < 0.1) +v vertex 0, 1',
+                   'vertex'),
+            'C' : ('(vertices in (z < 0.1) & (x < 0.1) +v vertex 0, 1)'
+                   ' *v vertices of group 0', 'vertex'),
+            'D' : ('r.Omega -c cell 1, 4, 5', 'cell'),
+            'E' : ('(r.Omega -c cell 1, 4, 5) +c cells by get_cells', 'cell'),
+            'F' : ('vertices by get_vertices +v vertex 0, 1', 'vertex'),
+        }
+        region_defs = transform_regions(regions)
+
+        region_op = dm.region_op
+        calls = []
+        def _region_op(level, op_code, item1, item2):
+            calls.append(op_code['token'])
+            return region_op(level, op_code, item1, item2)
+
+        try:
+            dm.region_op = _region_op
+            domain.create_regions(region_defs, functions=self.functions)
+
+        finally:
+            dm.region_op = region_op
+
+        self.report('evaluated operations:', calls)
+        ok = sorted(calls) == sorted(['OA_AddV', 'OA_IntersectV', 'OA_SubC',
+                                      'OA_AddC', 'OA_AddV'])
+
+        # Evaluate the selectors separately, without the shared results.
+        for region in list(domain.regions):
+            reg = domain.create_region(region.name + '_', region.definition,
+                                       kind=region.kind,
+                                       functions=self.functions)
+            _ok = nm.array_equal(region.vertices, reg.vertices)
+            if region.kind != 'vertex':
+                _ok = _ok and nm.array_equal(region.cells, reg.cells)
+            self.report('region %s:' % region.name, _ok)
+            ok = ok and _ok
+
+        return ok
@@ -0,0 +1,95 @@
+from __future__ import absolute_import
+import os.path as op
+
+import numpy as nm
+
+from sfepy.base.testing import TestCommon
+
+filename_conf = 'examples/diffusion/poisson_periodic_boundary_condition.py'
+
+class Test(TestCommon):
+
+    @staticmethod
+    def from_conf(conf, options):
+        return Test(conf=conf, options=options)
+
+    def _setup_problem(self):
+        from sfepy.base.conf import ProblemConf, get_standard_keywords
+        from sfepy.discrete import Problem
+        import sfepy.discrete.fem.periodic as per
+
+        # Clear the in-memory periodic matches.
+        per.periodic_cache.clear()
+
+        required, other = get_standard_keywords()
+        conf = ProblemConf.from_file(op.join(op.dirname(__file__), '..',
+                                             filename_conf),
+                                     required, other)
+        pb = Problem.from_conf(conf, init_solvers=False)
+        pb.time_update()
+        mtx = pb.equations.create_matrix_graph()
+
+        return pb, mtx
+
+    def test_setup_cache(self):
+        from sfepy.base.goptions import goptions
+        from sfepy.discrete.setup_cache import get_setup_cache
+
+        dirname = op.join(self.options.out_dir, 'setup_cache')
+        goptions['setup_cache_dir'] = dirname
+        try:
+            cache = get_setup_cache()
+            cache.clear()
+            cache.n_hit = cache.n_miss = 0
+
+            pb0, mtx0 = self._setup_problem()
+            n_miss = cache.n_miss
+            pb1, mtx1 = self._setup_problem()
+            n_hit = cache.n_hit
+
+        finally:
+            goptions['setup_cache_dir'] = None
+
+        self.report('cache misses: %d, hits: %d' % (n_miss, n_hit))
+        ok = (n_miss > 0) and (n_hit == n_miss)
+
+        for region0 in pb0.domain.regions:
+            region1 = pb1.domain.regions[region0.name]
+            _ok = ((region0.kind == region1.kind)
+                   and all(nm.array_equal(ents0, ents1)
+                           for ents0, ents1 in zip(region0.entities,
+                                                   region1.entities)))
+            self.report('region %s: %s' % (region0.name, _ok))
+            ok = ok and _ok
+
+        eq_map0 = pb0.get_variables()['T'].eq_map
+        eq_map1 = pb1.get_variables()['T'].eq_map
+        _ok = (nm.array_equal(eq_map0.master, eq_map1.master)
+               and nm.array_equal(eq_map0.slave, eq_map1.slave))
+        self.report('periodic DOFs:', _ok)
+        ok = ok and _ok
+
+        _ok = ((mtx0.shape == mtx1.shape)
+               and nm.array_equal(mtx0.indptr, mtx1.indptr)
+               and nm.array_equal(mtx0.indices, mtx1.indices))
+        self.report('matrix graph:', _ok)
+        ok = ok and _ok
+
+        return ok
+
+    def test_periodic_cache_keys(self):
+        import sfepy.discrete.fem.periodic as per
+
+        coors1 = nm.array([[0.0, 0.0], [0.0, 1.0], [0.0, 2.0]])
+        coors2 = coors1 + [1.0, 0.0]
+        i1, i2 = per.match_x_plane(coors1, coors2)
+
+        # The same shape, but a different order of coordinates.
+        coors2 = coors2[::-1]
+        j1, j2 = per.match_x_plane(coors1, coors2)
+
+        ok = (nm.allclose(coors1[i1, 1], coors2[::-1][i2, 1])
+              and nm.allclose(coors1[j1, 1], coors2[j2, 1]))
+        self.report('matches keyed by coordinates:', ok)
+
+        return ok
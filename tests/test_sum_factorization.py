@@ -0,0 +1,82 @@
+from __future__ import absolute_import
+
+import numpy as nm
+
+from sfepy.base.testing import TestCommon
+
+class Test(TestCommon):
+
+    @staticmethod
+    def from_conf(conf, options):
+        from sfepy.discrete.fem import Mesh, FEDomain
+        from sfepy.mesh.mesh_generators import gen_block_mesh
+
+        mesh = gen_block_mesh([1, 1, 1], [4, 4, 4], [0, 0, 0], name='block',
+                              verbose=False)
+        # Distort the mesh to have non-constant jacobians.
+        coors = mesh.coors.copy()
+        coors[:, 0] += 0.1 * coors[:, 1] * coors[:, 2]
+        mesh = Mesh.from_data('block', coors, None, [mesh.get_conn('3_8')],
+                              [mesh.cmesh.cell_groups], ['3_8'])
+        domain = FEDomain('domain', mesh)
+
+        return Test(conf=conf, options=options, domain=domain)
+
+    def test_weak_residuals(self):
+        """
+        Compare the sum-factorized weak residuals with the default
+        quadrature-based evaluation.
+        """
+        from sfepy.base.base import goptions
+        from sfepy.discrete import FieldVariable, Integral, Material
+        from sfepy.discrete.fem import Field
+        from sfepy.terms import Term
+        from sfepy.mechanics.matcoefs import stiffness_from_lame
+
+        omega = self.domain.create_region('Omega', 'all')
+        mat = Material('m', c=2.0,
+                       K=nm.array([[2.0, 0.3, 0.1],
+                                   [0.3, 1.0, 0.2],
+                                   [0.1, 0.2, 3.0]]),
+                       D=stiffness_from_lame(3, 1.0, 2.0), lam=1.0, mu=2.0)
+
+        exprs = {
+            1 : ['dw_laplace(m.c, v, u)', 'dw_diffusion(m.K, v, u)',
+                 'dw_dot(m.c, v, u)', 'dw_dot(v, u)'],
+            3 : ['dw_lin_elastic(m.D, v, u)',
+                 'dw_lin_elastic_iso(m.lam, m.mu, v, u)',
+                 'dw_dot(m.c, v, u)', 'dw_dot(v, u)'],
+        }
+
+        rng = nm.random.RandomState(0)
+        sf0 = goptions['sum_factorization']
+        ok = True
+        try:
+            for order in [1, 3]:
+                integral = Integral('i', order=2 * order + 1)
+                for n_c in [1, 3]:
+                    field = Field.from_args('f', nm.float64, n_c, omega,
+                                            approx_order=order)
+                    u = FieldVariable('u', 'unknown', field)
+                    v = FieldVariable('v', 'test', field, primary_var_name='u')
+                    u.set_data(rng.rand(u.n_dof))
+
+                    for expr in exprs[n_c]:
+                        term = Term.new(expr, integral, omega, m=mat, v=v, u=u)
+                        term.setup()
+
+                        vals = []
+                        for sf in [False, True]:
+                            goptions['sum_factorization'] = sf
+                            vals.append(term.evaluate(mode='weak')[0])
+
+                        err = nm.abs(vals[0] - vals[1]).max()
+                        _ok = err < 1e-12 * nm.abs(vals[0]).max()
+                        self.report('order %d, %s: max. error: %.2e'
+                                    % (order, expr, err))
+                        ok = ok and _ok
+
+        finally:
+            goptions['sum_factorization'] = sf0
+
+        return ok
@@ -10,8 +10,14 @@ from sfepy import data_dir
 filename_meshes = [data_dir + '/meshes/elements/%s_2.mesh' % geom
                    for geom in ['1_2', '2_3', '2_4', '3_4', '3_8', '3_2_4']]
 
+# The values of string material arguments.
+str_values = {
+    'dw_mass' : 'hrz',
+}
+
 def make_term_args(arg_shapes, arg_kinds, arg_types, ats_mode, domain,
-                   material_value=None, poly_space_base=None):
+                   material_value=None, poly_space_base=None,
+                   str_value=None):
     from sfepy.base.base import basestr
     from sfepy.discrete import FieldVariable, Material, Variables, Materials
     from sfepy.discrete.fem import Field
@@ -114,8 +120,13 @@ def make_term_args(arg_shapes, arg_kinds, arg_types, ats_mode, domain,
             if material_value is None:
                 material_value = 1.0
 
-            shape = _parse_tuple_shape(sh)
-            if (len(shape) > 1) or (shape[0] > 1):
+            is_str = isinstance(sh, basestr) and (sh.strip() == 'str')
+            shape = None if is_str else _parse_tuple_shape(sh)
+            if is_str:
+                # String as a special value.
+                values = {'.c%d' % ii : str_value}
+
+            elif (len(shape) > 1) or (shape[0] > 1):
                 if ((len(shape) == 2) and (shape[0] ==  shape[1])
                     and (material_value != 0.0)):
                     # Identity matrix.
@@ -281,7 +292,8 @@ class Test(TestCommon):
                     material_value = 1.0
                 aux = make_term_args(arg_shapes, arg_kinds, ats, mode, domain,
                                      material_value=material_value,
-                                     poly_space_base=poly_space_base)
+                                     poly_space_base=poly_space_base,
+                                     str_value=str_values.get(term_cls.name))
                 args, str_args, materials, variables = aux
 
                 self.report('args:', str_args)